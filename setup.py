@@ -37,6 +37,11 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "async": ["aiohttp>=3.9.0,<4.0.0"],
+        "speedups": ["orjson>=3.9.0,<4.0.0"],
+        "analytics": ["numpy>=1.21.0"],
+    },
     entry_points={
         "console_scripts": [
             "villages-events=src.villages_events:main",
@@ -22,18 +22,112 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+import logging
+import re
+import threading
 import requests
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterator, List, Optional, TypeVar, cast
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from .exceptions import APIError
+from . import json_backend
+from .exceptions import APIError, AuthenticationError
 from .config import Config
+from .circuit_breaker import CircuitBreaker
+from .json_stream import EventStreamParser, compile_projection, project
+from .retry import RetryPolicy
+from .timing import Deadline, Timeout
+
+
+logger = logging.getLogger(__name__)
+
+_START_ROW_PATTERN = re.compile(r'([?&])startRow=\d+')
+_END_ROW_PATTERN = re.compile(r'([?&])endRow=\d+')
+
+# Bytes read from the socket at a time by stream_events
+STREAM_CHUNK_SIZE = 16 * 1024
+
+T = TypeVar('T')
+
+
+class _Call:
+    """An in-flight SingleFlight call and its outcome."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+    
+    The first caller for a key runs the function; callers arriving while
+    it runs wait for it and receive the same result (the same object, so
+    it must not be mutated) or the same exception. Once the call finishes,
+    the next caller for the key starts a new execution.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+    
+    def do(self, key: str, func: Callable[[], T]) -> T:
+        """Runs func, or waits for the in-flight call with the same key.
+        
+        Args:
+            key: Key identifying equivalent calls
+            func: Function to run if no call with the key is in flight
+            
+        Returns:
+            Result of the shared call
+            
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return cast(T, call.result)
+        
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.followers:
+                logger.debug(f"Shared one request for {key} with {call.followers} callers")
+        return cast(T, call.result)
+
+
+# Concurrent fetch_all_events calls for the same query share one request
+_EVENTS_FLIGHT = SingleFlight()
 
 
 def fetch_events(
     session: requests.Session,
     api_url: str,
     auth_token: str,
-    timeout: int = Config.DEFAULT_TIMEOUT
+    timeout: Timeout = Config.DEFAULT_TIMEOUT,
+    refresh_token: Optional[Callable[[], str]] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
     """Fetches events from The Villages API.
     
@@ -41,39 +135,104 @@ def fetch_events(
         session: Active requests session with cookies
         api_url: Full API endpoint URL with query parameters
         auth_token: Authorization token in format "Basic <base64>"
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds, or (connect, read) tuple
+        refresh_token: Optional callable returning a fresh authorization
+                       token; when given, a 401/403 answer is retried once
+                       with the refreshed token
+        retry_policy: Optional policy retrying timeouts, connection errors
+                      and 5xx answers of this request
+        circuit_breaker: Optional breaker failing the request immediately
+                         while the API keeps failing; every attempt counts
+        deadline: Optional run deadline; the timeout is shortened to the
+                  time left, the body is read in chunks and abandoned at
+                  the deadline, and retries that cannot finish are skipped
         
     Returns:
         Parsed JSON response as dictionary
         
     Raises:
+        AuthenticationError: If the API rejects the authorization token
+        CircuitOpenError: If the circuit breaker is open
+        DeadlineExceededError: If the deadline passes before the response is read
         APIError: If request fails or response is invalid
     """
+    request = _fetch_events_once
+    if circuit_breaker is not None:
+        request = circuit_breaker.wrap(request)
+    if retry_policy is not None:
+        request = retry_policy.wrap("api", request, deadline=deadline)
+    
     try:
-        # Prepare headers with authorization
-        # Extract date range from API URL to use in Referer
-        # For simplicity, use a generic calendar URL as referer
-        headers = {
-            'Authorization': auth_token,
-            'Accept': 'application/json, text/plain, */*',
-            'User-Agent': Config.USER_AGENT,
-            'Origin': 'https://www.thevillages.com',
-            'Referer': 'https://www.thevillages.com/calendar/',
-        }
+        return request(session, api_url, auth_token, timeout, deadline)
+    except AuthenticationError:
+        if refresh_token is None:
+            raise
+    
+    return request(session, api_url, refresh_token(), timeout, deadline)
+
+
+def _api_headers(auth_token: str) -> Dict[str, str]:
+    """Builds the headers of an authenticated API request."""
+    # For simplicity, use a generic calendar URL as referer
+    return {
+        'Authorization': auth_token,
+        'Accept': 'application/json, text/plain, */*',
+        'User-Agent': Config.USER_AGENT,
+        'Origin': 'https://www.thevillages.com',
+        'Referer': 'https://www.thevillages.com/calendar/',
+    }
+
+
+def _check_status(response: requests.Response) -> None:
+    """Raises the error matching a non-200 API response."""
+    if response.status_code in (401, 403):
+        raise AuthenticationError(
+            f"API rejected the authorization token with status code "
+            f"{response.status_code}",
+            status_code=response.status_code
+        )
+    if response.status_code != 200:
+        raise APIError(
+            f"API request failed with status code {response.status_code}: "
+            f"{response.text[:200]}",
+            status_code=response.status_code
+        )
+
+
+def _fetch_events_once(
+    session: requests.Session,
+    api_url: str,
+    auth_token: str,
+    timeout: Timeout,
+    deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    """Performs a single authenticated API request for fetch_events."""
+    try:
+        headers = _api_headers(auth_token)
         
         # Make authenticated GET request
-        response = session.get(api_url, headers=headers, timeout=timeout)
-        
-        # Validate HTTP response status code
-        if response.status_code != 200:
-            raise APIError(
-                f"API request failed with status code {response.status_code}: "
-                f"{response.text[:200]}"
+        if deadline is not None:
+            response = session.get(
+                api_url, headers=headers, timeout=deadline.timeout(timeout, "api"), stream=True
             )
+        else:
+            response = session.get(api_url, headers=headers, timeout=timeout)
+        
+        # Validate HTTP response status code, releasing a streamed
+        # connection before the caller retries
+        try:
+            _check_status(response)
+        except APIError:
+            response.close()
+            raise
         
         # Parse JSON response
         try:
-            data = response.json()
+            # Decode straight from the body bytes, skipping the text decode
+            if deadline is not None:
+                data = json_backend.loads(deadline.read(response, "api"))
+            else:
+                data = json_backend.loads(response.content)
         except ValueError as e:
             raise APIError(f"Failed to parse JSON response: {e}")
         
@@ -86,6 +245,395 @@ def fetch_events(
         return data
         
     except requests.exceptions.Timeout as e:
-        raise APIError(f"API request timed out after {timeout} seconds: {e}")
+        raise APIError(f"API request timed out after {timeout} seconds: {e}") from e
+    except requests.exceptions.RequestException as e:
+        raise APIError(f"API request failed: {e}") from e
+
+
+def _open_events_stream(
+    session: requests.Session,
+    api_url: str,
+    auth_token: str,
+    timeout: Timeout,
+    deadline: Optional[Deadline] = None
+) -> requests.Response:
+    """Sends an API request for stream_events and checks its status."""
+    if deadline is not None:
+        timeout = deadline.timeout(timeout, "api")
+    try:
+        response = session.get(
+            api_url, headers=_api_headers(auth_token), timeout=timeout, stream=True
+        )
+    except requests.exceptions.Timeout as e:
+        raise APIError(f"API request timed out after {timeout} seconds: {e}") from e
     except requests.exceptions.RequestException as e:
-        raise APIError(f"API request failed: {e}")
+        raise APIError(f"API request failed: {e}") from e
+    
+    try:
+        _check_status(response)
+    except APIError:
+        response.close()
+        raise
+    return response
+
+
+def stream_events(
+    session: requests.Session,
+    api_url: str,
+    auth_token: str,
+    timeout: Timeout = Config.DEFAULT_TIMEOUT,
+    refresh_token: Optional[Callable[[], str]] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[Deadline] = None,
+    fields: Optional[Dict[str, Any]] = None,
+    output_fields: Optional[List[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the events of one API response while it is being received.
+    
+    The ``events`` array is parsed incrementally, so each event is yielded
+    as soon as its bytes arrive and only one event is buffered at a time.
+    Retries and the circuit breaker apply to sending the request; once
+    events have been yielded, a failure ends the stream with an error.
+    
+    Args:
+        session: Active requests session with cookies
+        api_url: Full API endpoint URL with query parameters
+        auth_token: Authorization token in format "Basic <base64>"
+        timeout: Request timeout in seconds, or (connect, read) tuple
+        refresh_token: Optional callable returning a fresh authorization
+                       token, used once if the API rejects auth_token
+        retry_policy: Optional policy retrying transient request failures
+        circuit_breaker: Optional breaker failing fast while the API is down
+        deadline: Optional run deadline bounding the request and the download
+        fields: Optional dictionary receiving the response's other
+                top-level members (such as ``count``) once it is complete
+        output_fields: Optional field paths; each event is reduced to
+                       these members as soon as it is decoded
+        
+    Yields:
+        Event dictionaries in response order
+        
+    Raises:
+        APIError: If the request fails or the response is invalid
+        AuthenticationError: If the API rejects the token(s)
+        DeadlineExceededError: If the deadline passes during the download
+    """
+    request = _open_events_stream
+    if circuit_breaker is not None:
+        request = circuit_breaker.wrap(request)
+    if retry_policy is not None:
+        request = retry_policy.wrap("api", request, deadline=deadline)
+    
+    try:
+        response = request(session, api_url, auth_token, timeout, deadline)
+    except AuthenticationError:
+        if refresh_token is None:
+            raise
+        response = request(session, api_url, refresh_token(), timeout, deadline)
+    
+    parser = EventStreamParser(output_fields=output_fields)
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if deadline is not None:
+                deadline.check("api")
+            yield from parser.feed(chunk)
+        yield from parser.close()
+    except ValueError as e:
+        raise APIError(f"Failed to parse JSON response: {e}") from e
+    except requests.exceptions.Timeout as e:
+        raise APIError(f"API response timed out after {timeout} seconds: {e}") from e
+    except requests.exceptions.RequestException as e:
+        raise APIError(f"API response failed: {e}") from e
+    finally:
+        response.close()
+    
+    if not parser.found_array:
+        raise APIError(f"Invalid API response structure: 'events' missing from {api_url}")
+    if fields is not None:
+        fields.update(parser.fields)
+
+
+def get_page_url(api_url: str, start_row: int, end_row: int) -> str:
+    """Rewrites the row window of an API URL.
+    
+    Args:
+        api_url: API endpoint URL, with or without startRow/endRow parameters
+        start_row: Index of the first row to request (0-based)
+        end_row: Index of the last row to request (inclusive)
+        
+    Returns:
+        API URL requesting the given row window
+    """
+    if _START_ROW_PATTERN.search(api_url):
+        api_url = _START_ROW_PATTERN.sub(rf'\g<1>startRow={start_row}', api_url)
+    else:
+        api_url += f"{'&' if '?' in api_url else '?'}startRow={start_row}"
+    
+    if _END_ROW_PATTERN.search(api_url):
+        api_url = _END_ROW_PATTERN.sub(rf'\g<1>endRow={end_row}', api_url)
+    else:
+        api_url += f"&endRow={end_row}"
+    
+    return api_url
+
+
+def normalize_api_url(api_url: str) -> str:
+    """Normalizes an API URL into a key identifying its query.
+    
+    The scheme and host are lower-cased, query parameters are sorted and
+    re-encoded consistently, and the startRow/endRow window is dropped,
+    so URLs requesting the same events produce the same key.
+    
+    Args:
+        api_url: API endpoint URL with query parameters
+        
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(api_url)
+    params = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in ("startRow", "endRow")
+    )
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urlencode(params),
+        ""
+    ))
+
+
+def get_total_count(data: Dict[str, Any]) -> int:
+    """Reads the total row count from an API response, or -1 if absent."""
+    try:
+        return int(data.get("count", -1))
+    except (TypeError, ValueError):
+        return -1
+
+
+def fetch_all_events(
+    session: requests.Session,
+    api_url: str,
+    auth_token: str,
+    timeout: Timeout = Config.DEFAULT_TIMEOUT,
+    page_size: int = Config.DEFAULT_PAGE_SIZE,
+    max_workers: int = Config.DEFAULT_MAX_WORKERS,
+    refresh_token: Optional[Callable[[], str]] = None,
+    coalesce: bool = True,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[Deadline] = None,
+    output_fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Fetches every event matching an API query, following pagination.
+    
+    The first window is fetched on its own to learn the total ``count``;
+    the remaining windows are then fetched concurrently over the shared
+    session and merged back in row order.
+    
+    Concurrent calls for the same normalized URL are coalesced: only the
+    first performs the requests and all of them receive its result, which
+    is the same dictionary and must not be mutated.
+    
+    Args:
+        session: Active requests session with cookies
+        api_url: Full API endpoint URL with query parameters
+        auth_token: Authorization token in format "Basic <base64>"
+        timeout: Request timeout in seconds, or (connect, read) tuple
+        page_size: Number of rows requested per window
+        max_workers: Maximum number of windows fetched concurrently
+        refresh_token: Optional callable returning a fresh authorization
+                       token, used if the first window is rejected
+        coalesce: Share in-flight requests with concurrent identical calls
+        retry_policy: Optional policy retrying transient failures of each
+                      window on its own
+        circuit_breaker: Optional breaker guarding every window request
+        deadline: Optional run deadline bounding every window request
+        output_fields: Optional field paths; the events of each window are
+                       reduced to these members as soon as it is decoded,
+                       so only they are kept for the whole query
+        
+    Returns:
+        Parsed JSON response of the first window with ``events`` extended
+        by the events of all following windows
+        
+    Raises:
+        APIError: If any window request fails or its response is invalid
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    
+    if coalesce:
+        key = normalize_api_url(api_url)
+        if output_fields is not None:
+            # Projected results only serve callers wanting the same fields
+            key += "#" + ",".join(output_fields)
+        return _EVENTS_FLIGHT.do(
+            key,
+            lambda: fetch_all_events(
+                session,
+                api_url,
+                auth_token,
+                timeout=timeout,
+                page_size=page_size,
+                max_workers=max_workers,
+                refresh_token=refresh_token,
+                coalesce=False,
+                retry_policy=retry_policy,
+                circuit_breaker=circuit_breaker,
+                deadline=deadline,
+                output_fields=output_fields
+            )
+        )
+    
+    projection = compile_projection(output_fields) if output_fields is not None else None
+    
+    def refresh() -> str:
+        # Remember the refreshed token so the remaining windows use it too
+        nonlocal auth_token
+        # Only passed on when refresh_token is given
+        assert refresh_token is not None
+        auth_token = refresh_token()
+        return auth_token
+    
+    first_page = fetch_events(
+        session,
+        get_page_url(api_url, 0, page_size - 1),
+        auth_token,
+        timeout=timeout,
+        refresh_token=refresh if refresh_token is not None else None,
+        retry_policy=retry_policy,
+        circuit_breaker=circuit_breaker,
+        deadline=deadline
+    )
+    
+    events = first_page.get("events")
+    if projection is not None and isinstance(events, list):
+        events = first_page["events"] = [project(event, projection) for event in events]
+    total = get_total_count(first_page)
+    if not isinstance(events, list) or not events or total <= len(events):
+        return first_page
+    
+    # The server may cap windows below the requested size; follow its lead
+    # so that no rows fall between windows
+    page_size = min(page_size, len(events))
+    
+    page_urls = [
+        get_page_url(api_url, start_row, start_row + page_size - 1)
+        for start_row in range(page_size, total, page_size)
+    ]
+    
+    def fetch_page(page_url: str) -> List[Any]:
+        page = fetch_events(
+            session,
+            page_url,
+            auth_token,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            deadline=deadline
+        )
+        page_events = page.get("events")
+        if not isinstance(page_events, list):
+            raise APIError(f"Invalid API response structure: 'events' missing from {page_url}")
+        if projection is not None:
+            return [project(event, projection) for event in page_events]
+        return page_events
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(page_urls)))) as executor:
+        # executor.map preserves submission order, so windows merge in row order
+        for page_events in executor.map(fetch_page, page_urls):
+            events.extend(page_events)
+    
+    return first_page
+
+
+def stream_all_events(
+    session: requests.Session,
+    api_url: str,
+    auth_token: str,
+    timeout: Timeout = Config.DEFAULT_TIMEOUT,
+    page_size: int = Config.DEFAULT_PAGE_SIZE,
+    refresh_token: Optional[Callable[[], str]] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[Deadline] = None,
+    output_fields: Optional[List[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yields every event matching an API query while it is being received.
+    
+    The streaming counterpart of fetch_all_events. The total ``count``
+    follows the events in a response, so the windows are streamed one
+    after the other rather than concurrently, and identical concurrent
+    calls are not coalesced.
+    
+    Args:
+        session: Active requests session with cookies
+        api_url: Full API endpoint URL with query parameters
+        auth_token: Authorization token in format "Basic <base64>"
+        timeout: Request timeout in seconds, or (connect, read) tuple
+        page_size: Number of rows requested per window
+        refresh_token: Optional callable returning a fresh authorization
+                       token, used if the first window is rejected
+        retry_policy: Optional policy retrying transient failures of each
+                      window request
+        circuit_breaker: Optional breaker guarding every window request
+        deadline: Optional run deadline bounding every window
+        output_fields: Optional field paths each event is reduced to
+        
+    Yields:
+        Event dictionaries in row order
+        
+    Raises:
+        APIError: If any window request fails or its response is invalid
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    
+    def refresh() -> str:
+        # Remember the refreshed token so the remaining windows use it too
+        nonlocal auth_token
+        # Only passed on when refresh_token is given
+        assert refresh_token is not None
+        auth_token = refresh_token()
+        return auth_token
+    
+    fields: Dict[str, Any] = {}
+    received = 0
+    for event in stream_events(
+        session,
+        get_page_url(api_url, 0, page_size - 1),
+        auth_token,
+        timeout=timeout,
+        refresh_token=refresh if refresh_token is not None else None,
+        retry_policy=retry_policy,
+        circuit_breaker=circuit_breaker,
+        deadline=deadline,
+        fields=fields,
+        output_fields=output_fields
+    ):
+        received += 1
+        yield event
+    
+    total = get_total_count(fields)
+    if not received or total <= received:
+        return
+    
+    # The server may cap windows below the requested size; follow its lead
+    page_size = min(page_size, received)
+    
+    for start_row in range(page_size, total, page_size):
+        yield from stream_events(
+            session,
+            get_page_url(api_url, start_row, start_row + page_size - 1),
+            auth_token,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            deadline=deadline,
+            output_fields=output_fields
+        )
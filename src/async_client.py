@@ -0,0 +1,439 @@
+"""Asyncio client module for Villages Event Scraper.
+
+This module provides asyncio-native counterparts of the token fetcher,
+session manager and API client built on aiohttp, so the scraper can be
+embedded in an event loop and issue many queries concurrently without a
+thread per request. They raise the same exceptions as their blocking
+counterparts.
+
+Requires the optional aiohttp dependency:
+    pip install villages-event-scraper[async]
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError as e:  # pragma: no cover - depends on installed extras
+    raise ImportError(
+        "Async support requires aiohttp. "
+        "Install it with: pip install villages-event-scraper[async]"
+    ) from e
+
+from . import json_backend
+from .api_client import get_page_url, get_total_count
+from .config import Config
+from .exceptions import APIError, AuthenticationError, SessionError, TokenFetchError
+from .token_cache import TokenCache
+from .token_fetcher import extract_auth_token
+
+
+_DEFAULT_HEADERS = {
+    'User-Agent': Config.USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+class AsyncSessionManager:
+    """Manages an aiohttp session and cookies for API requests."""
+
+    def __init__(self):
+        """Initialize state; the aiohttp session is created lazily inside the event loop."""
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._closed = False
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Returns the active session object, creating it on first use.
+
+        Returns:
+            Active aiohttp.ClientSession instance
+
+        Raises:
+            SessionError: If session has been closed
+        """
+        if self._closed:
+            raise SessionError("Session has been closed")
+        if self._session is None:
+            self._session = aiohttp.ClientSession(headers=_DEFAULT_HEADERS)
+        return self._session
+
+    async def establish_session(
+        self,
+        calendar_url: str,
+        timeout: int = Config.DEFAULT_TIMEOUT
+    ) -> None:
+        """Visit calendar page to establish session and capture cookies.
+
+        Args:
+            calendar_url: URL to the calendar page
+            timeout: Request timeout in seconds
+
+        Raises:
+            SessionError: If session establishment fails
+        """
+        session = self.get_session()
+
+        try:
+            async with session.get(
+                calendar_url, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                response.raise_for_status()
+                await response.read()
+        except asyncio.TimeoutError as e:
+            raise SessionError(f"Timeout while establishing session: {e}") from e
+        except aiohttp.ClientError as e:
+            raise SessionError(f"Failed to establish session: {e}") from e
+
+        # Update headers with Origin and Referer for subsequent API requests
+        session.headers.update({
+            'Origin': 'https://www.thevillages.com',
+            'Referer': calendar_url,
+        })
+
+    async def close(self) -> None:
+        """Closes the session and cleans up resources."""
+        self._closed = True
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - ensures cleanup."""
+        await self.close()
+        return False
+
+
+async def fetch_auth_token(
+    session: aiohttp.ClientSession,
+    js_url: str,
+    timeout: int = Config.DEFAULT_TIMEOUT,
+    cache: Optional[TokenCache] = None,
+    force_refresh: bool = False
+) -> str:
+    """
+    Fetches main.js and extracts the dp_AUTH_TOKEN.
+
+    Honours the token cache and conditional revalidation exactly like
+    the blocking token_fetcher.fetch_auth_token.
+
+    Args:
+        session: aiohttp session used for the request
+        js_url: URL to the JavaScript file
+        timeout: Request timeout in seconds
+        cache: Optional token cache consulted before fetching and
+               updated after a successful extraction
+        force_refresh: Ignore and replace any cached token
+
+    Returns:
+        Extracted token in format "Basic <base64_string>"
+
+    Raises:
+        TokenFetchError: If fetching or extraction fails
+    """
+    entry = None
+    headers: Dict[str, str] = {}
+    if cache is not None:
+        if force_refresh:
+            cache.invalidate(js_url)
+        else:
+            entry = cache.load(js_url)
+            if entry is not None:
+                if cache.is_fresh(entry):
+                    return str(entry["token"])
+                headers = cache.conditional_headers(entry)
+
+    try:
+        async with session.get(
+            js_url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            if cache is not None and entry is not None and response.status == 304:
+                # Bundle unchanged, so the cached token is still current
+                cache.set(
+                    js_url,
+                    entry["token"],
+                    etag=response.headers.get("ETag") or entry.get("etag"),
+                    last_modified=(
+                        response.headers.get("Last-Modified") or entry.get("last_modified")
+                    )
+                )
+                return str(entry["token"])
+
+            response.raise_for_status()
+            js_content = await response.text()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+    except asyncio.TimeoutError as e:
+        raise TokenFetchError(f"Timeout while fetching JavaScript file from {js_url}") from e
+    except aiohttp.ClientError as e:
+        raise TokenFetchError(f"Failed to fetch JavaScript file from {js_url}: {e}") from e
+
+    auth_token = extract_auth_token(js_content)
+
+    if cache is not None:
+        cache.set(js_url, auth_token, etag=etag, last_modified=last_modified)
+
+    return auth_token
+
+
+async def start_session(
+    session_manager: AsyncSessionManager,
+    calendar_url: str,
+    js_url: str = Config.JS_URL,
+    timeout: int = Config.DEFAULT_TIMEOUT,
+    token_cache: Optional[TokenCache] = None
+) -> str:
+    """
+    Fetches the authentication token and establishes the session concurrently.
+
+    Args:
+        session_manager: Session manager to establish
+        calendar_url: URL to the calendar page
+        js_url: URL to the JavaScript file holding the token
+        timeout: Request timeout in seconds
+        token_cache: Optional token cache passed to fetch_auth_token
+
+    Returns:
+        Authentication token
+
+    Raises:
+        TokenFetchError: If fetching the token fails
+        SessionError: If session establishment fails
+    """
+    auth_token, _ = await asyncio.gather(
+        fetch_auth_token(
+            session_manager.get_session(), js_url, timeout=timeout, cache=token_cache
+        ),
+        session_manager.establish_session(calendar_url, timeout=timeout),
+    )
+    return auth_token
+
+
+async def fetch_events(
+    session: aiohttp.ClientSession,
+    api_url: str,
+    auth_token: str,
+    timeout: int = Config.DEFAULT_TIMEOUT,
+    refresh_token: Optional[Callable[[], Awaitable[str]]] = None
+) -> Dict[str, Any]:
+    """Fetches events from The Villages API.
+
+    Args:
+        session: Active aiohttp session with cookies
+        api_url: Full API endpoint URL with query parameters
+        auth_token: Authorization token in format "Basic <base64>"
+        timeout: Request timeout in seconds
+        refresh_token: Optional coroutine function returning a fresh
+                       authorization token; when given, a 401/403 answer
+                       is retried once with the refreshed token
+
+    Returns:
+        Parsed JSON response as dictionary
+
+    Raises:
+        AuthenticationError: If the API rejects the authorization token
+        APIError: If request fails or response is invalid
+    """
+    try:
+        return await _fetch_events_once(session, api_url, auth_token, timeout)
+    except AuthenticationError:
+        if refresh_token is None:
+            raise
+
+    return await _fetch_events_once(session, api_url, await refresh_token(), timeout)
+
+
+async def _fetch_events_once(
+    session: aiohttp.ClientSession,
+    api_url: str,
+    auth_token: str,
+    timeout: int
+) -> Dict[str, Any]:
+    """Performs a single authenticated API request for fetch_events."""
+    headers = {
+        'Authorization': auth_token,
+        'Accept': 'application/json, text/plain, */*',
+        'User-Agent': Config.USER_AGENT,
+        'Origin': 'https://www.thevillages.com',
+        'Referer': 'https://www.thevillages.com/calendar/',
+    }
+
+    try:
+        async with session.get(
+            api_url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            body = await response.read()
+            status = response.status
+    except asyncio.TimeoutError as e:
+        raise APIError(f"API request timed out after {timeout} seconds: {e}") from e
+    except aiohttp.ClientError as e:
+        raise APIError(f"API request failed: {e}") from e
+
+    # Validate HTTP response status code
+    if status in (401, 403):
+        raise AuthenticationError(
+            f"API rejected the authorization token with status code {status}",
+            status_code=status
+        )
+    if status != 200:
+        raise APIError(
+            f"API request failed with status code {status}: "
+            f"{body[:200].decode('utf-8', errors='replace')}",
+            status_code=status
+        )
+
+    # Parse JSON response
+    try:
+        data = json_backend.loads(body)
+    except ValueError as e:
+        raise APIError(f"Failed to parse JSON response: {e}") from e
+
+    # Validate response structure - ensure it's a dictionary
+    if not isinstance(data, dict):
+        raise APIError(
+            f"Invalid API response structure: expected dict, got {type(data).__name__}"
+        )
+
+    return data
+
+
+async def fetch_all_events(
+    session: aiohttp.ClientSession,
+    api_url: str,
+    auth_token: str,
+    timeout: int = Config.DEFAULT_TIMEOUT,
+    page_size: int = Config.DEFAULT_PAGE_SIZE,
+    max_workers: int = Config.DEFAULT_MAX_WORKERS,
+    refresh_token: Optional[Callable[[], Awaitable[str]]] = None
+) -> Dict[str, Any]:
+    """Fetches every event matching an API query, following pagination.
+
+    Async counterpart of api_client.fetch_all_events; the remaining
+    windows are fetched concurrently, at most max_workers at a time.
+
+    Args:
+        session: Active aiohttp session with cookies
+        api_url: Full API endpoint URL with query parameters
+        auth_token: Authorization token in format "Basic <base64>"
+        timeout: Request timeout in seconds
+        page_size: Number of rows requested per window
+        max_workers: Maximum number of windows in flight at once
+        refresh_token: Optional coroutine function returning a fresh
+                       authorization token, used if the first window is rejected
+
+    Returns:
+        Parsed JSON response of the first window with ``events`` extended
+        by the events of all following windows
+
+    Raises:
+        APIError: If any window request fails or its response is invalid
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+
+    async def refresh() -> str:
+        # Remember the refreshed token so the remaining windows use it too
+        nonlocal auth_token
+        # Only passed on when refresh_token is given
+        assert refresh_token is not None
+        auth_token = await refresh_token()
+        return auth_token
+
+    first_page = await fetch_events(
+        session,
+        get_page_url(api_url, 0, page_size - 1),
+        auth_token,
+        timeout=timeout,
+        refresh_token=refresh if refresh_token is not None else None
+    )
+
+    events = first_page.get("events")
+    total = get_total_count(first_page)
+    if not isinstance(events, list) or not events or total <= len(events):
+        return first_page
+
+    # The server may cap windows below the requested size; follow its lead
+    page_size = min(page_size, len(events))
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def fetch_page(page_url: str) -> List[Any]:
+        async with semaphore:
+            page = await fetch_events(session, page_url, auth_token, timeout=timeout)
+        page_events = page.get("events")
+        if not isinstance(page_events, list):
+            raise APIError(f"Invalid API response structure: 'events' missing from {page_url}")
+        return page_events
+
+    # gather preserves argument order, so windows merge in row order
+    pages = await asyncio.gather(*(
+        fetch_page(get_page_url(api_url, start_row, start_row + page_size - 1))
+        for start_row in range(page_size, total, page_size)
+    ))
+    for page_events in pages:
+        events.extend(page_events)
+
+    return first_page
+
+
+async def fetch_many(
+    session: aiohttp.ClientSession,
+    api_urls: List[str],
+    auth_token: str,
+    timeout: int = Config.DEFAULT_TIMEOUT,
+    page_size: int = Config.DEFAULT_PAGE_SIZE,
+    max_workers: int = Config.DEFAULT_MAX_WORKERS
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Fetches several API queries concurrently over one session.
+
+    Args:
+        session: Active aiohttp session with cookies
+        api_urls: API endpoint URLs to fetch
+        auth_token: Authorization token in format "Basic <base64>"
+        timeout: Request timeout in seconds
+        page_size: Number of rows requested per window
+        max_workers: Maximum number of windows in flight per query
+
+    Returns:
+        List of (api_url, response) pairs in the order of api_urls
+
+    Raises:
+        APIError: If any query fails
+    """
+    responses = await asyncio.gather(*(
+        fetch_all_events(
+            session,
+            api_url,
+            auth_token,
+            timeout=timeout,
+            page_size=page_size,
+            max_workers=max_workers
+        )
+        for api_url in api_urls
+    ))
+    return list(zip(api_urls, responses))
@@ -0,0 +1,404 @@
+"""Batch module for Villages Event Scraper.
+
+This module runs many (date range, category, location) queries in one
+invocation, sharing a single authentication token and HTTP session and
+fetching the queries concurrently with a bounded worker pool. Each
+query's formatted output is written to its own target.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, TextIO
+
+import requests
+
+from .api_client import fetch_all_events
+from .circuit_breaker import CircuitBreaker
+from .config import Config
+from .event_processor import EventProcessor
+from .exceptions import VillagesEventError
+from .files import atomic_write
+from .output_formatter import OutputFormatter
+from .query_planner import QueryKey, QueryPlanner
+from .response_cache import ResponseCache
+from .retry import RetryPolicy
+from .timing import Deadline, Timeout
+
+
+logger = logging.getLogger(__name__)
+
+
+class Query(NamedTuple):
+    """A single event query and where its output goes."""
+
+    date_range: str = Config.DEFAULT_DATE_RANGE
+    category: str = Config.DEFAULT_CATEGORY
+    location: str = Config.DEFAULT_LOCATION
+    format: str = Config.DEFAULT_FORMAT
+    fields: Optional[List[str]] = None
+    output: Optional[str] = None
+    preamble: str = Config.DEFAULT_PREAMBLE
+    interval: Optional[float] = None
+
+    @property
+    def api_url(self) -> str:
+        """Returns the API URL for this query's filters."""
+        return Config.get_api_url(self.date_range, self.category, self.location)
+
+    @property
+    def calendar_url(self) -> str:
+        """Returns the calendar URL for this query's filters."""
+        return Config.get_calendar_url(self.date_range, self.category, self.location)
+
+    @property
+    def key(self) -> QueryKey:
+        """Returns the API filters of this query."""
+        return QueryKey(self.date_range, self.category, self.location)
+
+    def describe(self) -> str:
+        """Returns a short human-readable description of the filters."""
+        return f"{self.date_range}:{self.category}:{self.location}"
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one query in a batch."""
+
+    query: Query
+    output: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+def validate_query(query: Query) -> Query:
+    """
+    Validates a query's filters, format and fields.
+
+    Args:
+        query: Query to validate
+
+    Returns:
+        The query, unchanged
+
+    Raises:
+        ValueError: If any value is not one of the valid options
+    """
+    checks = [
+        ("date range", query.date_range, Config.VALID_DATE_RANGES),
+        ("category", query.category, Config.VALID_CATEGORIES),
+        ("location", query.location, Config.VALID_LOCATIONS),
+        ("format", query.format, Config.VALID_FORMATS),
+    ]
+    for name, value, valid_values in checks:
+        if value not in valid_values:
+            raise ValueError(
+                f"Invalid {name} '{value}' in query {query.describe()}. "
+                f"Valid options are: {', '.join(valid_values)}"
+            )
+
+    if query.interval is not None and (
+        isinstance(query.interval, bool)
+        or not isinstance(query.interval, (int, float))
+        or query.interval <= 0
+    ):
+        raise ValueError(
+            f"Invalid interval '{query.interval}' in query {query.describe()}: "
+            f"expected a positive number of seconds"
+        )
+
+    if query.fields is not None:
+        invalid_fields = [f for f in query.fields if f not in Config.AVAILABLE_FIELDS]
+        if invalid_fields or not query.fields:
+            raise ValueError(
+                f"Invalid fields in query {query.describe()}: {', '.join(invalid_fields)}. "
+                f"Valid fields are: {', '.join(Config.AVAILABLE_FIELDS)}"
+            )
+
+    return query
+
+
+def parse_query_spec(spec: str, defaults: Query = Query()) -> Query:
+    """
+    Parses a command-line query specification.
+
+    The format is DATE_RANGE:CATEGORY:LOCATION[:OUTPUT]. Empty parts fall
+    back to the defaults, so "this-week::all" keeps the default category.
+
+    Args:
+        spec: Query specification string
+        defaults: Query supplying format, fields and missing filters
+
+    Returns:
+        Validated query
+
+    Raises:
+        ValueError: If the specification is malformed or invalid
+    """
+    parts = spec.split(":", 3)
+    if len(parts) < 3:
+        raise ValueError(
+            f"Invalid query '{spec}'. Expected DATE_RANGE:CATEGORY:LOCATION[:OUTPUT]"
+        )
+
+    date_range, category, location = parts[:3]
+    output = parts[3] if len(parts) == 4 else None
+    return validate_query(defaults._replace(
+        date_range=date_range or defaults.date_range,
+        category=category or defaults.category,
+        location=location or defaults.location,
+        output=output or defaults.output,
+    ))
+
+
+def load_queries(config: Dict[str, Any], defaults: Query = Query()) -> List[Query]:
+    """
+    Loads the ``queries`` section of the configuration file.
+
+    Each entry is a mapping with any of the keys date_range, category,
+    location, format, fields, output, preamble and interval (used by the
+    daemon); missing keys fall back to the defaults. Invalid entries are skipped with a warning.
+
+    Args:
+        config: Configuration dictionary
+        defaults: Query supplying values for missing keys
+
+    Returns:
+        List of valid queries in configuration order
+    """
+    entries = config.get("queries") or []
+    if not isinstance(entries, list):
+        logger.warning("queries in config must be a list, ignoring it")
+        return []
+
+    queries = []
+    for idx, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            logger.warning(f"Query #{idx + 1} in config must be a mapping, skipping")
+            continue
+
+        unknown_keys = set(entry) - set(Query._fields)
+        if unknown_keys:
+            logger.warning(
+                f"Unknown keys in query #{idx + 1} will be ignored: "
+                f"{', '.join(sorted(unknown_keys))}"
+            )
+
+        values = {key: entry[key] for key in Query._fields if key in entry}
+        if isinstance(values.get("fields"), str):
+            values["fields"] = [f.strip() for f in values["fields"].split(",") if f.strip()]
+        try:
+            queries.append(validate_query(defaults._replace(**values)))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Skipping query #{idx + 1}: {e}")
+
+    return queries
+
+
+def write_output(output: str, target: Optional[str], stream: Optional[TextIO] = None) -> None:
+    """
+    Writes formatted output to a file, or to a stream if no file is given.
+
+    Files are replaced atomically so that readers never see partial output.
+
+    Args:
+        output: Formatted output string
+        target: File path, or None/"-" for the stream
+        stream: Stream used when no file is given (defaults to stdout)
+    """
+    if target is None or target == "-":
+        stream = stream if stream is not None else sys.stdout
+        stream.write(output)
+        if output and not output.endswith("\n"):
+            stream.write("\n")
+        return
+
+    atomic_write(os.path.expanduser(target), output)
+
+
+def render_query(
+    query: Query,
+    api_response: Dict[str, Any],
+    venue_mappings: Dict[str, str],
+    default_fields: List[str]
+) -> str:
+    """
+    Processes and formats an API response for a query.
+
+    Args:
+        query: Query the response belongs to
+        api_response: Parsed API response
+        venue_mappings: Venue abbreviation mappings
+        default_fields: Output fields used when the query has none
+
+    Returns:
+        Formatted output including the query's preamble
+
+    Raises:
+        ProcessingError: If the response cannot be processed
+    """
+    fields = query.fields or default_fields
+    processor = EventProcessor(venue_mappings, output_fields=fields)
+    return format_query(query, processor.process_events(api_response), default_fields)
+
+
+def format_query(query: Query, processed_events: List[Any], default_fields: List[str]) -> str:
+    """
+    Formats processed events for a query.
+
+    Args:
+        query: Query the events belong to
+        processed_events: Events returned by EventProcessor.process_events
+        default_fields: Output fields used when the query has none
+
+    Returns:
+        Formatted output including the query's preamble
+    """
+    fields = query.fields or default_fields
+    formatted_output = OutputFormatter.format_events(
+        processed_events, format_type=query.format, field_names=fields
+    )
+    return OutputFormatter.add_preamble(formatted_output, query.preamble, query.format)
+
+
+def run_batch(
+    queries: List[Query],
+    session: requests.Session,
+    auth_token: str,
+    venue_mappings: Dict[str, str],
+    default_fields: List[str] = Config.DEFAULT_OUTPUT_FIELDS,
+    timeout: Timeout = Config.DEFAULT_TIMEOUT,
+    page_size: int = Config.DEFAULT_PAGE_SIZE,
+    max_workers: int = Config.DEFAULT_MAX_WORKERS,
+    batch_workers: int = Config.DEFAULT_BATCH_WORKERS,
+    refresh_token: Optional[Callable[[], str]] = None,
+    stream: Optional[TextIO] = None,
+    planner: Optional[QueryPlanner] = None,
+    response_cache: Optional[ResponseCache] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[Deadline] = None,
+    unavailable: Optional[VillagesEventError] = None
+) -> List[BatchResult]:
+    """
+    Fetches, formats and writes every query over one shared session.
+
+    Queries are fetched concurrently, at most batch_workers at a time, and
+    queries with identical filters are fetched once. With a planner, only
+    queries not covered by a wider query in the batch are fetched and the
+    rest are derived from those responses. A failing query is reported in
+    its result and does not stop the others. Outputs are written in query
+    order once all queries have finished.
+
+    Args:
+        queries: Queries to run
+        session: Established requests session shared by all queries
+        auth_token: Authorization token shared by all queries
+        venue_mappings: Venue abbreviation mappings
+        default_fields: Output fields used by queries without their own
+        timeout: Request timeout in seconds, or (connect, read) tuple
+        page_size: Number of rows requested per window
+        max_workers: Maximum number of windows fetched concurrently per query
+        batch_workers: Maximum number of queries fetched concurrently
+        refresh_token: Optional callable returning a fresh authorization token
+        stream: Stream for queries without an output file (defaults to stdout)
+        planner: Optional QueryPlanner deriving narrow queries from wide ones
+        response_cache: Optional ResponseCache consulted before each fetch
+        retry_policy: Optional policy retrying transient request failures
+        circuit_breaker: Optional breaker failing requests fast while the
+            API keeps failing; cached responses are still served
+        deadline: Optional run deadline bounding every request
+        unavailable: Error that prevented fetching the token or establishing
+            the session; no request is made and each query is answered from
+            a usable cached response, or fails with this error
+
+    Returns:
+        One BatchResult per query, in query order
+    """
+    def fetch_query(key: QueryKey) -> Any:
+        api_url = Config.get_api_url(*key)
+
+        def fetch_response() -> Dict[str, Any]:
+            logger.debug(f"Fetching events for query {':'.join(key)}...")
+            return fetch_all_events(
+                session,
+                api_url,
+                auth_token,
+                timeout=timeout,
+                page_size=page_size,
+                max_workers=max_workers,
+                refresh_token=refresh_token,
+                retry_policy=retry_policy,
+                circuit_breaker=circuit_breaker,
+                deadline=deadline
+            )
+
+        if unavailable is not None:
+            stale = response_cache.get_stale(api_url) if response_cache is not None else None
+            if stale is None:
+                return unavailable
+            logger.warning(f"{unavailable}; serving cached response for query {':'.join(key)}")
+            return stale
+
+        try:
+            if response_cache is not None:
+                return response_cache.fetch(api_url, fetch_response)
+            return fetch_response()
+        except VillagesEventError as e:
+            return e
+
+    def fetch(keys: List[QueryKey]) -> Dict[QueryKey, Any]:
+        with ThreadPoolExecutor(max_workers=max(1, min(batch_workers, len(keys)))) as executor:
+            return dict(zip(keys, executor.map(fetch_query, keys)))
+
+    if not queries:
+        return []
+
+    keys = [query.key for query in queries]
+    if planner is not None:
+        responses = planner.execute(keys, fetch)
+    else:
+        responses = fetch(list(dict.fromkeys(keys)))
+
+    results = []
+    for query in queries:
+        api_response = responses[query.key]
+        if isinstance(api_response, Exception):
+            results.append(BatchResult(query, error=api_response))
+            continue
+        try:
+            output = render_query(query, api_response, venue_mappings, default_fields)
+            results.append(BatchResult(query, output=output))
+        except VillagesEventError as e:
+            results.append(BatchResult(query, error=e))
+
+    for idx, result in enumerate(results):
+        if result.error is not None:
+            logger.error(f"Query {result.query.describe()} failed: {result.error}")
+            continue
+        # Results without an error hold their output
+        assert result.output is not None
+        try:
+            write_output(result.output, result.query.output, stream=stream)
+        except OSError as e:
+            logger.error(f"Could not write output for query {result.query.describe()}: {e}")
+            results[idx] = result._replace(error=e)
+
+    return results
@@ -0,0 +1,272 @@
+"""Circuit breaker module for Villages Event Scraper.
+
+This module stops sending requests to the API while it keeps failing.
+After failure_threshold consecutive transient failures (timeouts,
+connection errors, 5xx/429 answers) the circuit opens and requests fail
+immediately with CircuitOpenError for a cool-down period. Afterwards the
+circuit is half-open: a single probe request is let through, and its
+outcome closes the circuit again or restarts the cool-down.
+
+The state is kept in memory, or in a JSON file so that consecutive runs
+share it.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+from .config import Config
+from .exceptions import CircuitOpenError, DeadlineExceededError, VillagesEventError
+from .files import atomic_write
+from .retry import is_transient
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = Config.DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = Config.DEFAULT_CIRCUIT_COOLDOWN,
+        state_file: Optional[str] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive transient failures that open the circuit
+            cooldown: Seconds the circuit stays open before a probe is allowed
+            state_file: Optional JSON file holding the state, shared by all
+                breakers (and processes) using the same file
+            clock: Function returning the current time in seconds
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = cooldown
+        self.state_file = os.path.expanduser(state_file) if state_file else None
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        """Reads the shared state file, if any, into this breaker."""
+        if self.state_file is None:
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            failures = int(state.get("failures", 0))
+            opened_at = state.get("opened_at")
+            probe_started_at = state.get("probe_started_at")
+            opened_at = float(opened_at) if opened_at is not None else None
+            probe_started_at = float(probe_started_at) if probe_started_at is not None else None
+        except FileNotFoundError:
+            failures, opened_at, probe_started_at = 0, None, None
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.debug(f"Ignoring unreadable circuit state {self.state_file}: {e}")
+            failures, opened_at, probe_started_at = 0, None, None
+
+        self._failures = failures
+        self._opened_at = opened_at
+        self._probe_started_at = probe_started_at
+
+    def _save(self) -> None:
+        """Writes this breaker's state to the shared state file, if any."""
+        if self.state_file is None:
+            return
+        state = {
+            "failures": self._failures,
+            "opened_at": self._opened_at,
+            "probe_started_at": self._probe_started_at,
+        }
+        try:
+            atomic_write(self.state_file, json.dumps(state))
+        except OSError as e:
+            logger.warning(f"Could not write circuit state {self.state_file}: {e}")
+
+    def _state_at(self, now: float) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at < self.cooldown:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def _probe_in_flight(self, now: float) -> bool:
+        # A probe that never reported back (e.g. its process died) expires
+        # after one cool-down period
+        return (
+            self._probe_started_at is not None
+            and now - self._probe_started_at < self.cooldown
+        )
+
+    def _open_error(self, now: float) -> CircuitOpenError:
+        # Raised while the circuit is open or its probe is in flight
+        if self._state_at(now) == self.OPEN:
+            started_at = self._opened_at
+        else:
+            started_at = self._probe_started_at
+        assert started_at is not None
+        retry_in = started_at + self.cooldown - now
+        return CircuitOpenError(
+            f"API circuit is open after {self._failures} consecutive failures, "
+            f"not sending requests for another {retry_in:.0f} seconds"
+        )
+
+    @property
+    def state(self) -> str:
+        """Returns "closed", "open" or "half-open"."""
+        with self._lock:
+            self._load()
+            return self._state_at(self._clock())
+
+    def check(self) -> None:
+        """
+        Checks that a request would currently be let through.
+
+        Unlike call(), this does not claim the half-open probe.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is in flight
+        """
+        with self._lock:
+            self._load()
+            now = self._clock()
+            state = self._state_at(now)
+            if state == self.OPEN or (state == self.HALF_OPEN and self._probe_in_flight(now)):
+                raise self._open_error(now)
+
+    def _before_call(self) -> bool:
+        """Rejects a request while open; returns True if it claimed the probe."""
+        with self._lock:
+            self._load()
+            now = self._clock()
+            state = self._state_at(now)
+            if state == self.CLOSED:
+                return False
+            if state == self.OPEN or self._probe_in_flight(now):
+                raise self._open_error(now)
+            logger.debug("API circuit is half-open, sending a probe request")
+            self._probe_started_at = now
+            self._save()
+            return True
+
+    def _release_probe(self) -> None:
+        """Lets another request probe after an inconclusive probe."""
+        with self._lock:
+            self._load()
+            self._probe_started_at = None
+            self._save()
+
+    def record_success(self) -> None:
+        """Closes the circuit and clears the failure count."""
+        with self._lock:
+            self._load()
+            if self._failures == 0 and self._opened_at is None:
+                return
+            if self._opened_at is not None:
+                logger.info("API circuit closed, requests are sent again")
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started_at = None
+            self._save()
+
+    def record_failure(self) -> None:
+        """Counts a transient failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._load()
+            self._failures += 1
+            # A failed probe reopens the circuit without waiting for the threshold
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"API circuit opened after {self._failures} consecutive failures, "
+                        f"failing fast for {self.cooldown} seconds"
+                    )
+                self._opened_at = self._clock()
+                self._probe_started_at = None
+            self._save()
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Calls a function unless the circuit is open.
+
+        Transient failures count towards opening the circuit. Any other
+        outcome, including a non-transient error such as a 404, shows that
+        the API is answering and closes it.
+
+        Args:
+            func: Function performing one API request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is in flight
+            VillagesEventError: Any failure raised by func
+        """
+        probe = self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except DeadlineExceededError:
+            # Running out of run time says nothing about the API
+            if probe:
+                self._release_probe()
+            raise
+        except VillagesEventError as e:
+            if is_transient(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def wrap(self, func: Callable[..., T]) -> Callable[..., T]:
+        """
+        Returns a version of a function guarded by this breaker.
+
+        Args:
+            func: Function to wrap
+
+        Returns:
+            Wrapped function with the same signature
+        """
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return self.call(func, *args, **kwargs)
+        return wrapper
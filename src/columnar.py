@@ -0,0 +1,331 @@
+"""Columnar event module for Villages Event Scraper.
+
+This module holds processed events column by column: one NumPy array per
+output field instead of one dictionary per event. Dates are parsed into
+``datetime64`` values and flags into booleans, so filtering, sorting and
+grouping many months of events run as vectorized array operations rather
+than as Python loops over events.
+
+Requires the optional NumPy dependency:
+    pip install villages-event-scraper[analytics]
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on installed extras
+    raise ImportError(
+        "Columnar batches require numpy. "
+        "Install it with: pip install villages-event-scraper[analytics]"
+    ) from e
+
+
+# Fields parsed into datetime64 values (UTC, millisecond precision)
+DATE_FIELDS = frozenset({"start.date", "end.date"})
+# Fields stored as booleans
+BOOLEAN_FIELDS = frozenset({"allDay", "cancelled", "featured"})
+
+_DATE_UNIT = "datetime64[ms]"
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    """Builds a one-dimensional object array, even of sequences."""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _hashable(value: Any) -> Any:
+    """Converts lists and dictionaries, e.g. subcategories, to tuples usable as keys."""
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _hashable(item)) for key, item in value.items())
+    return value
+
+
+def _parse_date(value: Any) -> np.datetime64:
+    """Parses one ISO 8601 timestamp into UTC, NaT if it is missing or invalid."""
+    if not isinstance(value, str):
+        return np.datetime64("NaT", "ms")
+    try:
+        parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        return np.datetime64("NaT", "ms")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(parsed, "ms")
+
+
+def date_column(values: Sequence[Any]) -> np.ndarray:
+    """
+    Builds a datetime64 column from API timestamps.
+
+    Args:
+        values: Timestamps such as "2025-11-15T02:00:00.000Z"
+
+    Returns:
+        Array of UTC datetime64[ms] values; missing or invalid
+        timestamps are NaT
+    """
+    # The API's UTC timestamps are parsed by NumPy in one call; anything
+    # else (offsets, missing or invalid values) falls back to one at a time
+    if all(isinstance(value, str) and value.endswith("Z") for value in values):
+        try:
+            return np.array([value[:-1] for value in values], dtype=_DATE_UNIT)
+        except ValueError:
+            pass
+    return np.array([_parse_date(value) for value in values], dtype=_DATE_UNIT)
+
+
+def column(field: str, values: Sequence[Any]) -> np.ndarray:
+    """
+    Builds the array of one field.
+
+    Args:
+        field: Field path, which selects date or boolean parsing
+        values: Value of the field for each event
+
+    Returns:
+        datetime64 array for DATE_FIELDS, bool array for BOOLEAN_FIELDS
+        (anything but True is False), a string array if every value is a
+        string or None (None becomes ""), an int64 or float64 array if
+        every value is a number, else an object array
+    """
+    if field in DATE_FIELDS:
+        return date_column(values)
+    if field in BOOLEAN_FIELDS:
+        return np.array([value is True for value in values], dtype=bool)
+    if values and all(isinstance(value, str) or value is None for value in values):
+        return np.array(["" if value is None else value for value in values], dtype=str)
+    if values and all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) for value in values
+    ):
+        return np.array(values, dtype=float if any(isinstance(v, float) for v in values) else int)
+    return _object_array(values)
+
+
+def _key_order(field: str, keys: np.ndarray) -> np.ndarray:
+    """Returns the indexes that sort distinct values, grouping mixed types by type name."""
+    try:
+        return np.argsort(keys, kind="stable")
+    except TypeError:
+        pass
+    # Values of different types, such as numbers and the "" of a missing
+    # value, cannot be compared with each other; numbers come first
+    values = keys.tolist()
+
+    def sort_key(i: int) -> Tuple[str, Any]:
+        value = values[i]
+        return ("" if isinstance(value, (int, float)) else type(value).__name__, value)
+
+    try:
+        return np.array(sorted(range(len(values)), key=sort_key), dtype=np.intp)
+    except TypeError as e:
+        raise ValueError(f"Cannot order the values of field {field!r}: {e}") from e
+
+
+class EventBatch:
+    """Processed events stored as one array per field."""
+
+    def __init__(self, columns: Mapping[str, np.ndarray]):
+        """
+        Initialize from field arrays.
+
+        Args:
+            columns: Dictionary mapping each field, in output order, to
+                     an array with one value per event
+
+        Raises:
+            ValueError: If the arrays differ in length
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns must have the same length, got lengths {sorted(lengths)}")
+        self.columns: Dict[str, np.ndarray] = dict(columns)
+        self._length = lengths.pop() if lengths else 0
+        self._factorized: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_events(
+        cls,
+        events: Iterable[Mapping[str, Any]],
+        fields: Sequence[str]
+    ) -> "EventBatch":
+        """
+        Builds a batch from processed events.
+
+        Args:
+            events: Dictionaries or rows returned by EventProcessor
+            fields: Fields to store, in output order
+
+        Returns:
+            EventBatch with one column per field; missing fields are None
+        """
+        events = list(events)
+        return cls({
+            field: column(field, [event.get(field) for event in events])
+            for field in dict.fromkeys(fields)
+        })
+
+    @property
+    def fields(self) -> List[str]:
+        """Field names in output order."""
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def __repr__(self) -> str:
+        return f"EventBatch({self._length} events, fields={self.fields!r})"
+
+    def filter(self, selection: Union[np.ndarray, Sequence[Any]]) -> "EventBatch":
+        """
+        Selects events.
+
+        Args:
+            selection: Boolean mask with one entry per event (e.g.
+                       ``batch["cancelled"] == False``), or event indexes
+
+        Returns:
+            New EventBatch with the selected events, in selection order
+        """
+        selection = np.asarray(selection)
+        if selection.dtype != bool:
+            selection = selection.astype(np.intp)
+        return EventBatch({field: values[selection] for field, values in self.columns.items()})
+
+    def sort(self, by: Union[str, Sequence[str]], descending: bool = False) -> "EventBatch":
+        """
+        Sorts events by one or more fields.
+
+        Args:
+            by: Field, or fields from the primary to the last tie-breaker
+            descending: Sort from largest to smallest
+
+        Returns:
+            New sorted EventBatch; events with equal keys keep their order
+            and NaT dates come last when ascending
+
+        Raises:
+            ValueError: If the values of a field cannot be ordered
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        order = np.arange(self._length)
+        # Stable sorts from the last key to the first order by all keys
+        for field in reversed(keys):
+            values = self.columns[field]
+            if values.dtype.kind == "O":
+                # Sort object values by their rank, which also orders
+                # lists and values of mixed types
+                values = self._factorize(field)[1]
+            values = values[order]
+            if descending:
+                # Sorting the reversed array and reversing the result keeps
+                # equal keys in their original order
+                order = order[::-1][np.argsort(values[::-1], kind="stable")][::-1]
+            else:
+                order = order[np.argsort(values, kind="stable")]
+        return self.filter(order)
+
+    def group_by(self, field: str) -> Dict[Any, "EventBatch"]:
+        """
+        Splits events by the value of a field.
+
+        Args:
+            field: Field to group on
+
+        Returns:
+            Dictionary mapping each distinct value, in sorted order, to
+            the batch of its events in their original order; list values
+            are keyed as tuples
+
+        Raises:
+            ValueError: If the values of the field cannot be ordered
+        """
+        keys, codes = self._factorize(field)
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(keys))
+        groups = np.split(order, np.cumsum(counts)[:-1])
+        return {key: self.filter(indexes) for key, indexes in zip(keys.tolist(), groups)}
+
+    def count_by(self, field: str) -> Dict[Any, int]:
+        """
+        Counts events by the value of a field.
+
+        Args:
+            field: Field to count on
+
+        Returns:
+            Dictionary mapping each distinct value, in sorted order, to
+            its number of events; list values are keyed as tuples
+
+        Raises:
+            ValueError: If the values of the field cannot be ordered
+        """
+        keys, codes = self._factorize(field)
+        counts = np.bincount(codes, minlength=len(keys))
+        return dict(zip(keys.tolist(), counts.tolist()))
+
+    def _factorize(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the sorted distinct values of a field and each event's index among them."""
+        factorized = self._factorized.get(field)
+        if factorized is not None:
+            return factorized
+
+        values = self.columns[field]
+        if values.dtype.kind in "UO":
+            # Hashing the strings is faster than sorting them all, and only
+            # the distinct values need to be sorted
+            items = values.tolist()
+            if values.dtype.kind == "O":
+                items = [_hashable(value) for value in items]
+            index: Dict[Any, int] = {}
+            codes = np.array(
+                [index.setdefault(value, len(index)) for value in items], dtype=np.intp
+            )
+            keys = _object_array(list(index)).astype(values.dtype)
+            order = _key_order(field, keys)
+            rank = np.empty(len(order), dtype=np.intp)
+            rank[order] = np.arange(len(order))
+            factorized = (keys[order], rank[codes])
+        else:
+            keys, inverse = np.unique(values, return_inverse=True)
+            factorized = (keys, inverse.ravel())
+        self._factorized[field] = factorized
+        return factorized
+
+    def to_events(self) -> List[Dict[str, Any]]:
+        """
+        Converts the batch back to one dictionary per event.
+
+        Returns:
+            List of dictionaries of Python values; dates are naive UTC
+            datetime objects (None for NaT)
+        """
+        fields = self.fields
+        columns = [values.tolist() for values in self.columns.values()]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
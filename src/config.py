@@ -82,10 +82,105 @@ class Config:
         "Spanish Springs": "Spanish Springs",
         "Lake Sumter": "Lake Sumter"
     }
+    # Number of distinct venue names whose abbreviation is remembered
+    DEFAULT_VENUE_CACHE_SIZE = 1024
+    # Processed events are dictionaries unless compact rows are enabled
+    DEFAULT_COMPACT_ROWS = False
     
     # HTTP settings
     DEFAULT_TIMEOUT = 10
     USER_AGENT = "Mozilla/5.0"
+    # Connect and read timeouts default to DEFAULT_TIMEOUT; the read timeout
+    # bounds each socket read, not the whole response
+    DEFAULT_CONNECT_TIMEOUT = None
+    DEFAULT_READ_TIMEOUT = None
+    # Optional total number of seconds a single (non-daemon) run may take
+    DEFAULT_DEADLINE = None
+    
+    # Retry settings (used only when config.yaml has a retry section)
+    # Transient failures are retried with exponential backoff and jitter;
+    # the budget caps the retries of a whole run
+    DEFAULT_RETRY_ATTEMPTS = 3
+    DEFAULT_RETRY_BASE_DELAY = 0.5
+    DEFAULT_RETRY_MAX_DELAY = 8.0
+    DEFAULT_RETRY_BUDGET = 6
+    
+    # Circuit breaker settings
+    # After this many consecutive transient API failures, requests fail
+    # immediately for the cool-down period (in seconds); 0 disables it
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+    DEFAULT_CIRCUIT_COOLDOWN = 60
+    
+    # Token extraction
+    # Streaming reads main.js in chunks and stops at the first token match
+    DEFAULT_STREAM_TOKEN = False
+    
+    # Event streaming
+    # Streaming parses the events array as it arrives and prints each event
+    # as soon as it is processed, instead of after the whole response
+    DEFAULT_STREAM = False
+    
+    # Cache settings
+    # Caching is disabled unless a cache directory is configured
+    DEFAULT_CACHE_DIR = None
+    DEFAULT_TOKEN_TTL = 24 * 60 * 60
+    DEFAULT_COOKIE_TTL = 60 * 60
+    # Responses are cached only when response_ttl is positive; stale entries
+    # are still served for response_stale_ttl seconds after expiry while
+    # refreshing or when the API fails
+    DEFAULT_RESPONSE_TTL = 0
+    DEFAULT_RESPONSE_STALE_TTL = 24 * 60 * 60
+    
+    # Pagination settings
+    # The API returns at most one window of rows per request; the remaining
+    # windows are fetched concurrently once the total count is known
+    DEFAULT_PAGE_SIZE = 25
+    DEFAULT_MAX_WORKERS = 4
+    
+    # Batch settings
+    # Maximum number of queries fetched concurrently in batch mode
+    DEFAULT_BATCH_WORKERS = 4
+    
+    # Connection pool settings
+    # Connections are kept per host (CDN, website, API) and reused across
+    # requests; the default pool size covers every window of every batch
+    # query in flight at once. With token_session, the token is fetched
+    # over the same pooled session instead of a one-off connection.
+    DEFAULT_POOL_CONNECTIONS = 4
+    DEFAULT_POOL_MAXSIZE = DEFAULT_MAX_WORKERS * DEFAULT_BATCH_WORKERS
+    DEFAULT_KEEP_ALIVE = True
+    DEFAULT_TOKEN_SESSION = False
+    
+    # Daemon settings
+    # Seconds between refreshes of daemon queries without their own interval
+    DEFAULT_REFRESH_INTERVAL = 300
+    
+    # HTTP server settings (--serve)
+    DEFAULT_SERVE_HOST = "127.0.0.1"
+    DEFAULT_SERVE_PORT = 8080
+    
+    # Query planning
+    # Batch queries covered by a wider requested query are derived from its
+    # response instead of being fetched. Location groups list the location
+    # title values contained in each location category value.
+    DEFAULT_PLAN_QUERIES = True
+    TIMEZONE = "America/New_York"
+    LOCATION_GROUPS = {
+        "town-squares": [
+            "Lake+Sumter+Landing+Market+Square",
+            "Spanish+Springs+Town+Square",
+            "Brownwood+Paddock+Square",
+            "Sawgrass+Grove",
+            "The+Show+Kitchen+at+Sawgrass+Grove"
+        ],
+        "entertainment": [
+            "The+Sharon",
+            "The+Studio+Theatre+at+Tierra+Del+Sol"
+        ],
+        "sports-recreation": [
+            "Savannah+Recreation"
+        ]
+    }
     
     # Output formats
     VALID_FORMATS = ["meshtastic", "json", "csv", "plain"]
@@ -162,7 +257,9 @@ class Config:
     def get_api_url(
         date_range: str = DEFAULT_DATE_RANGE,
         category: str = DEFAULT_CATEGORY,
-        location: str = DEFAULT_LOCATION
+        location: str = DEFAULT_LOCATION,
+        start_row: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE
     ) -> str:
         """Generate API URL with specified filters.
         
@@ -170,12 +267,15 @@ class Config:
             date_range: Date range parameter (e.g., 'today', 'this-week')
             category: Category parameter (e.g., 'entertainment', 'sports')
             location: Location parameter (e.g., 'town-squares', 'Brownwood+Paddock+Square')
+            start_row: Index of the first row to request (0-based)
+            page_size: Number of rows to request in this window
             
         Returns:
             Complete API URL with filters
         """
         base = "https://api.v2.thevillages.com/events/?"
-        params = ["cancelled=false", "startRow=0", "endRow=24"]
+        end_row = start_row + page_size - 1
+        params = ["cancelled=false", f"startRow={start_row}", f"endRow={end_row}"]
         
         # Add date range parameter if not 'all'
         if date_range != "all":
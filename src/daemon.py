@@ -0,0 +1,494 @@
+"""Daemon module for Villages Event Scraper.
+
+This module keeps a long-running process warm: the authentication token,
+session cookies and HTTP connections are reused across refreshes, and a
+scheduler refreshes each query on its own interval. The latest API
+response and processed events of every query are held in memory, and
+each refresh rewrites the query's output target.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import functools
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import requests
+
+from .api_client import fetch_all_events
+from .batch import Query, format_query, write_output
+from .circuit_breaker import CircuitBreaker
+from .config import Config
+from .event_processor import EventProcessor
+from .exceptions import VillagesEventError
+from .pipeline import start_session
+from .query_planner import QueryKey, QueryPlanner
+from .response_cache import ResponseCache
+from .retry import RetryPolicy
+from .session_manager import SessionManager
+from .timing import Timeout
+from .token_cache import TokenCache
+from .token_fetcher import fetch_auth_token
+
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(NamedTuple):
+    """Latest refresh result of one query."""
+
+    query: Query
+    api_response: Dict[str, Any]
+    events: Sequence[Mapping[str, Any]]
+    output: str
+    updated_at: float
+
+
+class EventDaemon:
+    """Refreshes queries on their intervals over one warm session."""
+
+    def __init__(
+        self,
+        queries: List[Query],
+        venue_mappings: Dict[str, str],
+        default_fields: List[str] = Config.DEFAULT_OUTPUT_FIELDS,
+        refresh_interval: float = Config.DEFAULT_REFRESH_INTERVAL,
+        timeout: Timeout = Config.DEFAULT_TIMEOUT,
+        page_size: int = Config.DEFAULT_PAGE_SIZE,
+        max_workers: int = Config.DEFAULT_MAX_WORKERS,
+        batch_workers: int = Config.DEFAULT_BATCH_WORKERS,
+        js_url: str = Config.JS_URL,
+        token_cache: Optional[TokenCache] = None,
+        cookie_file: Optional[str] = None,
+        cookie_ttl: int = Config.DEFAULT_COOKIE_TTL,
+        pool_connections: int = Config.DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = Config.DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = Config.DEFAULT_KEEP_ALIVE,
+        token_session: bool = False,
+        stream_token: bool = False,
+        response_cache: Optional[ResponseCache] = None,
+        planner: Optional[QueryPlanner] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        compact_rows: bool = Config.DEFAULT_COMPACT_ROWS
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            queries: Queries to keep refreshed
+            venue_mappings: Venue abbreviation mappings
+            default_fields: Output fields used by queries without their own
+            refresh_interval: Seconds between refreshes of queries without
+                their own interval
+            timeout: Request timeout in seconds, or (connect, read) tuple
+            page_size: Number of rows requested per window
+            max_workers: Maximum number of windows fetched concurrently per query
+            batch_workers: Maximum number of queries fetched concurrently
+            js_url: URL to the JavaScript file holding the token
+            token_cache: Optional token cache
+            cookie_file: Optional path where the cookie jar is persisted
+            cookie_ttl: Number of seconds a saved cookie jar is reused
+            pool_connections: Number of hosts whose connection pools are kept
+            pool_maxsize: Maximum number of idle connections kept per host
+            keep_alive: Keep connections open for reuse by later requests
+            token_session: Fetch the token over the pooled session
+            stream_token: Use streaming token extraction
+            response_cache: Optional response cache consulted before each fetch
+            planner: Optional QueryPlanner for queries due at the same time
+            retry_policy: Optional policy retrying transient request failures;
+                its budget is renewed for every refresh
+            circuit_breaker: Optional breaker failing requests fast while
+                the API keeps failing; held responses are kept meanwhile
+            compact_rows: Hold the processed events of each query as compact
+                rows instead of dictionaries
+
+        Raises:
+            ValueError: If no queries are given or refresh_interval is not positive
+        """
+        if not queries:
+            raise ValueError("The daemon needs at least one query")
+        if refresh_interval <= 0:
+            raise ValueError(f"refresh_interval must be positive, got {refresh_interval}")
+
+        self.queries = list(queries)
+        self.venue_mappings = venue_mappings
+        self.default_fields = default_fields
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.batch_workers = batch_workers
+        self.js_url = js_url
+        self.token_cache = token_cache
+        self.stream_token = stream_token
+        self.response_cache = response_cache
+        self.planner = planner
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.compact_rows = compact_rows
+
+        self.token_session = token_session
+        self.session_manager = SessionManager(
+            cookie_file=cookie_file,
+            cookie_ttl=cookie_ttl,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive
+        )
+        self.calendar_url = self.queries[0].calendar_url
+        self.auth_token: Optional[str] = None
+
+        self._snapshots: Dict[int, Snapshot] = {}
+        self._responses: Dict[QueryKey, Tuple[Dict[str, Any], float]] = {}
+        self._scheduled_keys = {query.key for query in self.queries}
+        self._listeners: List[Callable[[QueryKey, Dict[str, Any], float], None]] = []
+        self._lock = threading.Lock()
+        self._credentials_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def interval(self, query: Query) -> float:
+        """Returns the refresh interval of a query in seconds."""
+        return float(query.interval or self.refresh_interval)
+
+    def snapshot(self, index: int) -> Optional[Snapshot]:
+        """
+        Returns the latest snapshot of a query.
+
+        Args:
+            index: Position of the query in the daemon's query list
+
+        Returns:
+            Latest snapshot, or None before the first successful refresh
+        """
+        with self._lock:
+            return self._snapshots.get(index)
+
+    def get_response(self, key: QueryKey) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Returns the latest API response held for a query's filters.
+
+        Args:
+            key: Query filters
+
+        Returns:
+            Tuple of (api_response, updated_at), or None if never fetched
+        """
+        with self._lock:
+            return self._responses.get(key)
+
+    def lookup(self, key: QueryKey) -> Tuple[Dict[str, Any], float]:
+        """
+        Returns an API response for any query's filters.
+
+        The held response for the filters is used if there is one. Otherwise
+        the response is derived from a held response covering the filters,
+        or fetched on demand and held for refresh_interval seconds.
+
+        Args:
+            key: Query filters
+
+        Returns:
+            Tuple of (api_response, updated_at)
+
+        Raises:
+            VillagesEventError: If an on-demand fetch fails
+        """
+        load, updated_at = self.resolve(key)
+        return load(), updated_at
+
+    def resolve(self, key: QueryKey) -> Tuple[Callable[[], Dict[str, Any]], float]:
+        """
+        Finds the response for any query's filters without deriving it yet.
+
+        Works like lookup(), but a response derived from a covering one is
+        only computed when the returned function is called, so callers
+        holding output rendered at updated_at can skip the derivation.
+
+        Args:
+            key: Query filters
+
+        Returns:
+            Tuple of (function returning the api_response, updated_at)
+
+        Raises:
+            VillagesEventError: If an on-demand fetch fails
+        """
+        with self._lock:
+            held = dict(self._responses)
+
+        entry = held.get(key)
+        if entry is not None and (
+            key in self._scheduled_keys or time.time() - entry[1] < self.refresh_interval
+        ):
+            held_response = entry[0]
+            return (lambda: held_response), entry[1]
+
+        if self.planner is not None:
+            for source in self._scheduled_keys:
+                if source in held and self.planner.covers(source, key):
+                    api_response, updated_at = held[source]
+                    return (
+                        functools.partial(self.planner.derive, api_response, source, key),
+                        updated_at
+                    )
+
+        api_response = self._fetch([key], background=True)[key]
+        if isinstance(api_response, Exception):
+            raise api_response
+        updated_at = time.time()
+        with self._lock:
+            self._responses[key] = (api_response, updated_at)
+        return (lambda: api_response), updated_at
+
+    def add_listener(self, listener: Callable[[QueryKey, Dict[str, Any], float], None]) -> None:
+        """
+        Registers a callback invoked after each successful query refresh.
+
+        Args:
+            listener: Callable taking (key, api_response, updated_at)
+        """
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """
+        Fetches the authentication token and establishes the session.
+
+        Raises:
+            TokenFetchError: If fetching the token fails
+            SessionError: If session establishment fails
+        """
+        self.auth_token, _ = start_session(
+            self.session_manager,
+            self.calendar_url,
+            js_url=self.js_url,
+            timeout=self.timeout,
+            token_cache=self.token_cache,
+            stream_token=self.stream_token,
+            retry_policy=self.retry_policy,
+            token_session=self.token_session
+        )
+
+    def _ensure_started(self) -> str:
+        """Starts the session once, even for lookups served before run() has."""
+        with self._credentials_lock:
+            if self.auth_token is None:
+                self.start()
+            auth_token = self.auth_token
+        # start() sets the token or raises
+        assert auth_token is not None
+        return auth_token
+
+    def _token_session(self) -> Optional[requests.Session]:
+        """Returns the session the token is fetched over, if it is shared."""
+        return self.session_manager.get_session() if self.token_session else None
+
+    def _refresh_credentials(self, rejected_token: str) -> str:
+        """Warms up a new session and refetches the token after a rejection."""
+        with self._credentials_lock:
+            # Another fetch already replaced the rejected credentials
+            if self.auth_token is not None and self.auth_token != rejected_token:
+                return self.auth_token
+            logger.debug("Credentials rejected, refreshing session and token...")
+            self.session_manager.invalidate_cookies()
+            self.session_manager.establish_session(self.calendar_url, timeout=self.timeout)
+            self.auth_token = fetch_auth_token(
+                self.js_url,
+                timeout=self.timeout,
+                cache=self.token_cache,
+                force_refresh=True,
+                stream=self.stream_token,
+                session=self._token_session()
+            )
+            return self.auth_token
+
+    def _keep_credentials_warm(self) -> None:
+        """Revalidates the cached token and saved cookies once they expire."""
+        if self.token_cache is not None and self.token_cache.get(self.js_url) is None:
+            self.auth_token = fetch_auth_token(
+                self.js_url,
+                timeout=self.timeout,
+                cache=self.token_cache,
+                stream=self.stream_token,
+                session=self._token_session()
+            )
+        if self.session_manager.cookie_file is not None:
+            self.session_manager.ensure_session(self.calendar_url, timeout=self.timeout)
+
+    def _fetch(self, keys: List[QueryKey], background: bool = False) -> Dict[QueryKey, Any]:
+        """
+        Fetches queries concurrently, mapping each to its response or error.
+
+        Scheduled refreshes must hold new data, so expired cache entries are
+        fetched before returning; on-demand lookups pass background=True to
+        answer from a stale entry while it is refreshed.
+        """
+        auth_token = self._ensure_started()
+        session = self.session_manager.get_session()
+
+        def fetch_query(key: QueryKey) -> Any:
+            api_url = Config.get_api_url(*key)
+
+            def fetch_response() -> Dict[str, Any]:
+                return fetch_all_events(
+                    session,
+                    api_url,
+                    auth_token,
+                    timeout=self.timeout,
+                    page_size=self.page_size,
+                    max_workers=self.max_workers,
+                    refresh_token=lambda: self._refresh_credentials(auth_token),
+                    retry_policy=self.retry_policy,
+                    circuit_breaker=self.circuit_breaker
+                )
+
+            try:
+                if self.response_cache is not None:
+                    return self.response_cache.fetch(
+                        api_url, fetch_response, background=background
+                    )
+                return fetch_response()
+            except VillagesEventError as e:
+                return e
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.batch_workers, len(keys)))
+        ) as executor:
+            return dict(zip(keys, executor.map(fetch_query, keys)))
+
+    def refresh(self, indexes: List[int]) -> Dict[int, Optional[Exception]]:
+        """
+        Refreshes queries, updating their snapshots and output targets.
+
+        A failing query keeps its previous snapshot.
+
+        Args:
+            indexes: Positions of the queries to refresh
+
+        Returns:
+            Mapping of each index to None on success or the error raised
+        """
+        if self.retry_policy is not None:
+            self.retry_policy.reset_budget()
+        try:
+            self._keep_credentials_warm()
+        except VillagesEventError as e:
+            logger.warning(f"Could not revalidate credentials: {e}")
+
+        keys = [self.queries[index].key for index in indexes]
+        if self.planner is not None:
+            responses = self.planner.execute(keys, self._fetch)
+        else:
+            responses = self._fetch(list(dict.fromkeys(keys)))
+
+        now = time.time()
+        errors: Dict[int, Optional[Exception]] = {}
+        for index in indexes:
+            query = self.queries[index]
+            api_response = responses[query.key]
+            try:
+                if isinstance(api_response, Exception):
+                    raise api_response
+                fields = query.fields or self.default_fields
+                events = EventProcessor(
+                    self.venue_mappings, output_fields=fields, compact=self.compact_rows
+                ).process_events(api_response)
+                output = format_query(query, events, self.default_fields)
+                write_output(output, query.output)
+            except (VillagesEventError, OSError) as e:
+                logger.error(f"Refreshing query {query.describe()} failed: {e}")
+                errors[index] = e
+                continue
+
+            with self._lock:
+                self._responses[query.key] = (api_response, now)
+                self._snapshots[index] = Snapshot(query, api_response, events, output, now)
+            errors[index] = None
+
+        refreshed_keys = dict.fromkeys(
+            self.queries[index].key for index, error in errors.items() if error is None
+        )
+        for key in refreshed_keys:
+            for listener in self._listeners:
+                try:
+                    listener(key, responses[key], now)
+                except Exception as e:
+                    logger.warning(f"Refresh listener failed for {':'.join(key)}: {e}")
+
+        return errors
+
+    def run(self) -> None:
+        """
+        Runs the scheduler until stop() is called.
+
+        Every query is refreshed immediately, then again whenever its
+        interval has elapsed. Queries that fall due together are refreshed
+        together.
+
+        Raises:
+            TokenFetchError: If the initial token fetch fails
+            SessionError: If the initial session establishment fails
+        """
+        self._ensure_started()
+
+        now = time.monotonic()
+        schedule = [(now, index) for index in range(len(self.queries))]
+        heapq.heapify(schedule)
+
+        while not self._stop.is_set():
+            due_at, _ = schedule[0]
+            delay = due_at - time.monotonic()
+            if delay > 0:
+                # Event.wait returns early when stop() is called
+                self._stop.wait(delay)
+                continue
+
+            due = []
+            now = time.monotonic()
+            while schedule and schedule[0][0] <= now:
+                due.append(heapq.heappop(schedule)[1])
+
+            logger.debug(f"Refreshing {len(due)} queries...")
+            self.refresh(due)
+
+            finished = time.monotonic()
+            for index in due:
+                heapq.heappush(schedule, (finished + self.interval(self.queries[index]), index))
+
+    def stop(self) -> None:
+        """Asks the scheduler to stop after the current refresh."""
+        self._stop.set()
+
+    def close(self) -> None:
+        """Stops the scheduler and closes the session."""
+        self.stop()
+        self.session_manager.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - ensures cleanup."""
+        self.close()
+        return False
@@ -19,19 +19,83 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
 import logging
-from typing import List, Tuple, Dict, Any, Optional
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING, Callable, Iterable, Iterator, List, Tuple, Dict, Any, Optional, Union
+)
 
 from .config import Config
 from .exceptions import ProcessingError
+from .rows import Row, row_type
+from .venue_matcher import VenueMatcher
+
+if TYPE_CHECKING:
+    from .columnar import EventBatch
 
 
 logger = logging.getLogger(__name__)
 
 
+def compile_accessor(field_path: str) -> Callable[[Any], Any]:
+    """
+    Compiles a dot-separated field path into a function extracting it.
+
+    The returned function behaves like EventProcessor.extract_field with
+    the path split once up front; paths of one or two parts, which cover
+    nearly all fields, get specialized functions without a loop.
+
+    Args:
+        field_path: Dot-separated path to field (e.g., "location.title", "start.date")
+
+    Returns:
+        Function returning the field value of an event, or empty string if not found
+    """
+    parts = tuple(field_path.split('.'))
+
+    if len(parts) == 1:
+        key = parts[0]
+
+        def get(event: Any) -> Any:
+            if isinstance(event, dict):
+                value = event.get(key)
+                if value is not None:
+                    return value
+            return ""
+
+    elif len(parts) == 2:
+        first, second = parts
+
+        def get(event: Any) -> Any:
+            if isinstance(event, dict):
+                parent = event.get(first)
+                if isinstance(parent, dict):
+                    value = parent.get(second)
+                    if value is not None:
+                        return value
+            return ""
+
+    else:
+        def get(event: Any) -> Any:
+            current = event
+            for part in parts:
+                if not isinstance(current, dict) or part not in current:
+                    return ""
+                current = current[part]
+            return current if current is not None else ""
+
+    return get
+
+
 class EventProcessor:
     """Processes event data and applies venue abbreviations."""
 
-    def __init__(self, venue_mappings: Dict[str, str], output_fields: Optional[List[str]] = None):
+    def __init__(
+        self,
+        venue_mappings: Dict[str, str],
+        output_fields: Optional[List[str]] = None,
+        venue_cache_size: int = Config.DEFAULT_VENUE_CACHE_SIZE,
+        compact: bool = Config.DEFAULT_COMPACT_ROWS
+    ):
         """
         Initialize with venue abbreviation mappings and output fields.
 
@@ -39,10 +103,56 @@ class EventProcessor:
             venue_mappings: Dictionary mapping keywords to abbreviations
             output_fields: List of field paths to extract (e.g., ["title", "location.title", "start.date"])
                           Defaults to DEFAULT_OUTPUT_FIELDS for backward compatibility
+            venue_cache_size: Number of distinct venue names whose abbreviation is remembered
+            compact: Return processed events as compact read-only Row
+                     mappings instead of dictionaries
         """
+        self.compact = compact
+        self.venue_cache_size = venue_cache_size
         self.venue_mappings = venue_mappings
         self.output_fields = output_fields if output_fields is not None else Config.DEFAULT_OUTPUT_FIELDS
 
+    @property
+    def venue_mappings(self) -> Dict[str, str]:
+        """Keyword to abbreviation mappings, in priority order."""
+        return self._venue_mappings
+
+    @venue_mappings.setter
+    def venue_mappings(self, venue_mappings: Dict[str, str]) -> None:
+        # Compile the keywords once and start a new memo for the new mappings
+        self._venue_mappings = venue_mappings
+        self._abbreviate_cached = lru_cache(maxsize=self.venue_cache_size)(
+            VenueMatcher(venue_mappings).abbreviate
+        )
+
+    @property
+    def output_fields(self) -> List[str]:
+        """Field paths extracted from each event."""
+        return self._output_fields
+
+    @output_fields.setter
+    def output_fields(self, output_fields: List[str]) -> None:
+        # Compile the accessor plan once instead of walking paths per event
+        self._output_fields = output_fields
+        self._plan = [(field_path, self._compile_field(field_path)) for field_path in output_fields]
+        # Repeated paths appear once in a row, like keys in a dictionary
+        unique_plan = dict(self._plan)
+        self._row_type = row_type(tuple(unique_plan))
+        self._row_plan = tuple(unique_plan.values())
+
+    def _compile_field(self, field_path: str) -> Callable[[Any], Any]:
+        """Compiles the accessor of an output field, including venue abbreviation."""
+        get = compile_accessor(field_path)
+        if field_path != "location.title":
+            return get
+
+        # Apply venue abbreviation only to "location.title" field
+        def get_venue(event: Any) -> Any:
+            value = get(event)
+            return self.abbreviate_venue(value) if value else value
+
+        return get_venue
+
     def abbreviate_venue(self, venue: str) -> str:
         """
         Abbreviates venue name based on keyword matching.
@@ -56,6 +166,11 @@ class EventProcessor:
         if not venue:
             return venue
 
+        # Venue names repeat across events, so matches are memoized
+        if isinstance(venue, str):
+            abbreviation: str = self._abbreviate_cached(venue)
+            return abbreviation
+
         # Check if venue contains any keyword from mappings
         for keyword, abbreviation in self.venue_mappings.items():
             if keyword in venue:
@@ -92,7 +207,10 @@ class EventProcessor:
         # Return the value, or empty string if None
         return current if current is not None else ""
 
-    def process_events(self, api_response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def process_events(
+        self,
+        api_response: Dict[str, Any]
+    ) -> List[Union[Dict[str, Any], Row]]:
         """
         Extracts and processes events from API response.
 
@@ -100,7 +218,55 @@ class EventProcessor:
             api_response: Parsed JSON response from API
 
         Returns:
-            List of dictionaries with extracted fields
+            List of dictionaries (or Rows if compact) with extracted fields
+
+        Raises:
+            ProcessingError: If events array is missing from response
+        """
+        return list(self.iter_process_events(self.get_events(api_response)))
+
+    def process_batch(self, api_response: Dict[str, Any]) -> "EventBatch":
+        """
+        Extracts and processes events from API response into columns.
+
+        Requires numpy (pip install villages-event-scraper[analytics]).
+
+        Args:
+            api_response: Parsed JSON response from API
+
+        Returns:
+            EventBatch with one array per output field
+
+        Raises:
+            ProcessingError: If events array is missing from response
+            ImportError: If numpy is not installed
+        """
+        # Imported here so that numpy stays optional for everything else
+        from .columnar import EventBatch, column
+
+        events = self.get_events(api_response)
+        fields = self._row_type.fields
+        try:
+            # Extract each field of all events at once, without a
+            # dictionary per event
+            values = [[get(event) for event in events] for get in self._row_plan]
+        except Exception:
+            # Some event cannot be processed; process one event at a time
+            # so that it is skipped and logged as in process_events
+            return EventBatch.from_events(self.iter_process_events(events), fields)
+
+        return EventBatch({field: column(field, vals) for field, vals in zip(fields, values)})
+
+    @staticmethod
+    def get_events(api_response: Dict[str, Any]) -> List[Any]:
+        """
+        Returns the events array of an API response.
+
+        Args:
+            api_response: Parsed JSON response from API
+
+        Returns:
+            The response's list of raw events
 
         Raises:
             ProcessingError: If events array is missing from response
@@ -113,29 +279,52 @@ class EventProcessor:
         if not isinstance(events, list):
             raise ProcessingError("'events' field is not a list")
 
-        processed_events = []
+        return events
+
+    def iter_process_events(
+        self,
+        events: Iterable[Any]
+    ) -> Iterator[Union[Dict[str, Any], Row]]:
+        """
+        Processes raw events lazily, one at a time.
+
+        Each event is processed only when the next row is requested, so
+        rows can be formatted and written without collecting them first.
+        Events that cannot be processed are skipped, as in process_events.
+
+        Args:
+            events: Iterable of event dictionaries from the API, e.g. the
+                    list from get_events() or a stream of events
 
+        Yields:
+            Dictionaries (or Rows if compact) with extracted fields
+        """
         for idx, event in enumerate(events):
-            try:
-                # Extract all specified fields for this event
-                event_data = {}
-                
-                for field_path in self.output_fields:
-                    # Extract the field value using dot notation
-                    value = self.extract_field(event, field_path)
-                    
-                    # Apply venue abbreviation only to "location.title" field
-                    if field_path == "location.title" and value:
-                        value = self.abbreviate_venue(value)
-                    
-                    # Store the extracted value
-                    event_data[field_path] = value
-
-                # Add to processed events list
-                processed_events.append(event_data)
-
-            except Exception as e:
-                logger.warning(f"Error processing event at index {idx}: {e}, skipping")
-                continue
-
-        return processed_events
+            event_data = self.process_event(event, idx)
+            if event_data is not None:
+                yield event_data
+
+    def process_event(
+        self,
+        event: Dict[str, Any],
+        index: Optional[int] = None
+    ) -> Optional[Union[Dict[str, Any], Row]]:
+        """
+        Extracts the output fields of a single event.
+
+        Args:
+            event: Event dictionary from API response
+            index: Position of the event in the response, used in log messages
+
+        Returns:
+            Dictionary (or Row if compact) with extracted fields, or None if the event is skipped
+        """
+        try:
+            # Extract all specified fields for this event
+            if self.compact:
+                return self._row_type(*[get(event) for get in self._row_plan])
+            return {field_path: get(event) for field_path, get in self._plan}
+
+        except Exception as e:
+            logger.warning(f"Error processing event at index {index}: {e}, skipping")
+            return None
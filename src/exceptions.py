@@ -22,6 +22,8 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+from typing import Optional
+
 
 class VillagesEventError(Exception):
     """Base exception for Villages Event Scraper."""
@@ -40,6 +42,30 @@ class SessionError(VillagesEventError):
 
 class APIError(VillagesEventError):
     """Raised when API request fails."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        """Initialize with the message and the HTTP status code, if any.
+        
+        Args:
+            message: Error description
+            status_code: HTTP status code of the failed response
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenError(APIError):
+    """Raised without a request while the API circuit breaker is open."""
+    pass
+
+
+class AuthenticationError(APIError):
+    """Raised when the API rejects the authorization token."""
+    pass
+
+
+class DeadlineExceededError(VillagesEventError):
+    """Raised when the run deadline passes before a stage completes."""
     pass
 
 
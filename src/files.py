@@ -0,0 +1,54 @@
+"""File module for Villages Event Scraper.
+
+This module writes the files shared between runs and their readers
+(caches, cookie jars, circuit state and batch outputs) atomically: the
+text goes to a temporary file in the target's directory, which then
+replaces the target, so a reader sees either the old or the new file and
+never a partial one.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import tempfile
+
+
+def atomic_write(path: str, text: str) -> None:
+    """
+    Replaces a file with the given text in one step.
+
+    Missing parent directories are created.
+
+    Args:
+        path: File to write
+        text: Content, written as UTF-8
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
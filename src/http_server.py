@@ -0,0 +1,240 @@
+"""HTTP server module for Villages Event Scraper.
+
+This module serves formatted events from a running EventDaemon over HTTP:
+
+    GET /events?date_range=today&category=all&location=all&format=json&fields=title
+
+Bodies are rendered once per response version, format and field list and
+then served from memory. Every body carries a strong ETag, and requests
+whose If-None-Match matches it are answered with 304 Not Modified.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import hashlib
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import Query, render_query, validate_query
+from .config import Config
+from .daemon import EventDaemon
+from .exceptions import VillagesEventError
+from .query_planner import QueryKey
+
+
+logger = logging.getLogger(__name__)
+
+
+CONTENT_TYPES = {
+    "meshtastic": "text/plain; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "plain": "text/plain; charset=utf-8",
+}
+
+
+class RenderedBody(NamedTuple):
+    """A formatted response body and its validator."""
+
+    updated_at: float
+    body: bytes
+    etag: str
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Checks an If-None-Match header against an entity tag.
+
+    Args:
+        if_none_match: Value of the If-None-Match request header
+        etag: Quoted entity tag of the current body
+
+    Returns:
+        True if the header lists the tag (compared weakly, as RFC 9110
+        requires for If-None-Match) or is "*"
+    """
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == etag
+        for candidate in candidates
+    )
+
+
+class EventServer(ThreadingHTTPServer):
+    """Threaded HTTP server rendering events held by an EventDaemon."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        event_daemon: EventDaemon,
+        prerender_formats: List[str] = Config.VALID_FORMATS
+    ):
+        """
+        Initialize the server and bind its socket.
+
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            event_daemon: Daemon holding the API responses
+            prerender_formats: Formats rendered with the default fields as
+                soon as the daemon refreshes a query
+        """
+        super().__init__(address, EventRequestHandler)
+        self.event_daemon = event_daemon
+        self.prerender_formats = prerender_formats
+        self._bodies: Dict[Tuple[QueryKey, str, Tuple[str, ...]], RenderedBody] = {}
+        self._lock = threading.Lock()
+        event_daemon.add_listener(self.prerender)
+
+    def render(self, query: Query) -> RenderedBody:
+        """
+        Returns the formatted body for a query, rendering it if outdated.
+
+        A body rendered from the current response is returned before that
+        response is derived, so repeated requests for filters served from
+        a covering response do not filter it again.
+
+        Args:
+            query: Validated query; its output and preamble are ignored
+
+        Returns:
+            Rendered body of the latest response for the query's filters
+
+        Raises:
+            VillagesEventError: If the response cannot be fetched or processed
+        """
+        load_response, updated_at = self.event_daemon.resolve(query.key)
+        fields = query.fields or self.event_daemon.default_fields
+        cache_key = (query.key, query.format, tuple(fields))
+
+        with self._lock:
+            rendered = self._bodies.get(cache_key)
+        if rendered is not None and rendered.updated_at >= updated_at:
+            return rendered
+
+        output = render_query(
+            query._replace(fields=fields, preamble=""),
+            load_response(),
+            self.event_daemon.venue_mappings,
+            fields
+        )
+        body = output.encode("utf-8")
+        rendered = RenderedBody(updated_at, body, f'"{hashlib.sha256(body).hexdigest()}"')
+
+        with self._lock:
+            current = self._bodies.get(cache_key)
+            if current is None or current.updated_at <= updated_at:
+                self._bodies[cache_key] = rendered
+        return rendered
+
+    def prerender(self, key: QueryKey, api_response: Dict[str, Any], updated_at: float) -> None:
+        """
+        Renders every pre-render format for freshly refreshed filters.
+
+        Args:
+            key: Refreshed query filters
+            api_response: New API response (unused; looked up again by render)
+            updated_at: Time of the refresh
+        """
+        for format_type in self.prerender_formats:
+            self.render(Query(*key, format=format_type))
+
+
+class EventRequestHandler(BaseHTTPRequestHandler):
+    """Handles GET and HEAD requests for /events."""
+
+    server: EventServer
+    server_version = "VillagesEvents"
+
+    def _parse_query(self) -> Query:
+        """Builds a validated Query from the request's query string."""
+        params = parse_qs(urlsplit(self.path).query)
+        values: Dict[str, Any] = {name: values[-1] for name, values in params.items()}
+
+        unknown = set(values) - {"date_range", "category", "location", "format", "fields"}
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+        if "location" in values:
+            # parse_qs decodes "+" to a space; location values spell spaces as "+"
+            values["location"] = values["location"].replace(" ", "+")
+        if "fields" in values:
+            values["fields"] = [f.strip() for f in values["fields"].split(",") if f.strip()]
+        return validate_query(Query(**values))
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD" and status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(body)
+
+    def _send_error_text(self, status: HTTPStatus, message: str) -> None:
+        self._send(
+            status, f"{message}\n".encode("utf-8"), {"Content-Type": "text/plain; charset=utf-8"}
+        )
+
+    def do_GET(self) -> None:
+        """Serves /events from the daemon's responses."""
+        if urlsplit(self.path).path.rstrip("/") != "/events":
+            self._send_error_text(HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        try:
+            query = self._parse_query()
+        except ValueError as e:
+            self._send_error_text(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        try:
+            rendered = self.server.render(query)
+        except VillagesEventError as e:
+            logger.error(f"Serving {query.describe()} failed: {e}")
+            self._send_error_text(HTTPStatus.BAD_GATEWAY, str(e))
+            return
+
+        headers = {"ETag": rendered.etag, "Cache-Control": "no-cache"}
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and etag_matches(if_none_match, rendered.etag):
+            self._send(HTTPStatus.NOT_MODIFIED, headers=headers)
+            return
+
+        headers["Content-Type"] = CONTENT_TYPES[query.format]
+        self._send(HTTPStatus.OK, rendered.body, headers)
+
+    do_HEAD = do_GET
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Routes access logs through the logging module."""
+        logger.debug(f"{self.address_string()} - {format % args}")
@@ -0,0 +1,112 @@
+"""JSON backend module for Villages Event Scraper.
+
+This module encodes and decodes JSON with orjson when it is installed
+and with the standard library otherwise. API responses are decoded
+straight from the response bytes, without building a text string first.
+Pretty-printed output is identical with either backend.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import json
+import re
+from types import ModuleType
+from typing import Any, Optional, Union
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+
+# Name of the backend in use, "orjson" or "json"
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Characters json.dumps escapes with ensure_ascii that orjson writes as is:
+# DEL and everything beyond ASCII. Outside of strings, JSON text is
+# printable ASCII, so every match is in a string
+_UNESCAPED = re.compile(r"[^\x00-\x7e]")
+_EXPONENT = re.compile(r"[0-9][eE][-+]?[0-9]")
+
+
+def _escape_character(match: "re.Match[str]") -> str:
+    """Escapes a character as json.dumps does with ensure_ascii."""
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+    return f"\\u{code:04x}"
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    Decodes a JSON document.
+
+    Args:
+        data: UTF-8 encoded bytes (preferred) or text
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """
+    Encodes an object as JSON.
+
+    Args:
+        obj: Object made of dicts, lists, strings, numbers, booleans and None
+        indent: None for compact UTF-8 output, or a number of spaces for
+            output identical to json.dumps(obj, indent=indent)
+
+    Returns:
+        JSON text
+
+    Raises:
+        TypeError: If the object cannot be encoded
+    """
+    if indent is None:
+        if orjson is not None:
+            try:
+                text: str = orjson.dumps(obj).decode("utf-8")
+            except TypeError:
+                # e.g. integers beyond 64 bits, which the stdlib handles
+                pass
+            else:
+                return text
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    if orjson is not None and indent == 2:
+        try:
+            text = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+        else:
+            # orjson writes float exponents unpadded ("1e-7" rather than
+            # "1e-07"); leave anything that may contain one to the stdlib
+            if not _EXPONENT.search(text):
+                return _UNESCAPED.sub(_escape_character, text)
+    return json.dumps(obj, indent=indent)
@@ -0,0 +1,287 @@
+"""Streaming JSON module for Villages Event Scraper.
+
+This module parses an API response incrementally as its bytes arrive and
+yields the elements of its ``events`` array one at a time, so that
+processing can start before the download finishes and memory use does
+not grow with the size of the response. Only the text of the element
+currently being received is buffered; every complete element is decoded
+on its own by the standard library's C scanner, which also finds where
+the element ends.
+
+The other top-level members of the response (such as ``count``) are
+decoded as well and collected in ``EventStreamParser.fields``.
+
+Given the output fields, each element is projected onto them as soon as
+it is decoded, so the unrequested members of an event (descriptions,
+images, addresses and so on) are never retained.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+# Longest escape sequence (\uXXXX); an error this close to the end of the
+# buffered text may be caused by a value that is cut off
+_MAX_TOKEN_TAIL = 6
+# Characters that can follow a complete number
+_NUMBER_DELIMITERS = frozenset(",]} \t\r\n")
+
+# Parser states
+_START, _KEY, _COLON, _VALUE, _ARRAY, _DONE = range(6)
+
+
+def compile_projection(paths: Iterable[str]) -> Dict[str, Any]:
+    """
+    Builds the projection tree of dot-separated field paths.
+
+    Args:
+        paths: Field paths to keep (e.g., ["location.title", "title"])
+
+    Returns:
+        Dictionary mapping each kept member to the tree of its kept
+        members, or to None if the whole member is kept
+    """
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        parts = path.split('.')
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                # An ancestor is kept whole already
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def project(value: Any, tree: Dict[str, Any]) -> Any:
+    """
+    Keeps only the members of a decoded value listed in a projection tree.
+
+    Args:
+        value: Decoded JSON value
+        tree: Projection tree from compile_projection()
+
+    Returns:
+        New dictionary with the kept members if value is a dictionary,
+        otherwise value itself
+    """
+    if not isinstance(value, dict):
+        return value
+    projected = {}
+    for key, subtree in tree.items():
+        if key in value:
+            member = value[key]
+            projected[key] = member if subtree is None else project(member, subtree)
+    return projected
+
+
+class EventStreamParser:
+    """Push parser yielding the elements of a response's top-level array."""
+
+    def __init__(self, array_key: str = "events", output_fields: Optional[List[str]] = None):
+        """
+        Initialize the parser.
+
+        Args:
+            array_key: Name of the top-level member whose elements are yielded
+            output_fields: Optional field paths each element is projected onto
+        """
+        self.array_key = array_key
+        self.fields: Dict[str, Any] = {}
+        self.found_array = False
+        self._projection = compile_projection(output_fields) if output_fields is not None else None
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._state = _START
+        self._key = ""
+
+    def _skip_whitespace(self) -> bool:
+        """Advances past whitespace; returns False if the buffer is exhausted."""
+        match = _WHITESPACE.match(self._buffer, self._position)
+        # The pattern matches the empty string, so it always matches
+        assert match is not None
+        self._position = match.end()
+        return self._position < len(self._buffer)
+
+    def _expect(self, char: str) -> None:
+        """Consumes the expected character, raising ValueError on any other."""
+        if self._buffer[self._position] != char:
+            raise ValueError(
+                f"Expected {char!r} at offset {self._position} of the buffered "
+                f"response, found {self._buffer[self._position]!r}"
+            )
+        self._position += 1
+
+    def _decode_value(self, final: bool) -> Tuple[bool, Any]:
+        """
+        Decodes the JSON value at the current position.
+
+        Args:
+            final: True if no more text will arrive
+
+        Returns:
+            (True, value) if the value is complete, else (False, None)
+
+        Raises:
+            ValueError: If the value is invalid
+        """
+        text = self._buffer
+        try:
+            value, end = _DECODER.raw_decode(text, self._position)
+        except json.JSONDecodeError as e:
+            if not final and (
+                e.msg.startswith("Unterminated string") or e.pos >= len(text) - _MAX_TOKEN_TAIL
+            ):
+                return False, None
+            raise
+        if not final:
+            if end == len(text):
+                # A number or literal may continue in the next chunk
+                incomplete = text[end - 1] not in '"]}'
+            else:
+                # A chunk may end inside a number, e.g. after the "0" of
+                # "0.25", so a number is complete only once a delimiter follows
+                incomplete = isinstance(value, (int, float)) and text[end] not in _NUMBER_DELIMITERS
+            if incomplete:
+                return False, None
+        self._position = end
+        return True, value
+
+    def _parse(self, final: bool) -> List[Any]:
+        """Consumes as much of the buffer as possible, returning complete elements."""
+        elements = []
+        while self._state != _DONE and self._skip_whitespace():
+            char = self._buffer[self._position]
+            if self._state == _START:
+                self._expect("{")
+                self._state = _KEY
+            elif self._state == _KEY:
+                if char == ",":
+                    self._position += 1
+                    continue
+                if char == "}":
+                    self._position += 1
+                    self._state = _DONE
+                    continue
+                if char != '"':
+                    self._expect('"')
+                complete, self._key = self._decode_value(final)
+                if not complete:
+                    break
+                self._state = _COLON
+            elif self._state == _COLON:
+                self._expect(":")
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if self._key == self.array_key and char == "[":
+                    self._position += 1
+                    self.found_array = True
+                    self._state = _ARRAY
+                    continue
+                complete, value = self._decode_value(final)
+                if not complete:
+                    break
+                self.fields[self._key] = value
+                self._state = _KEY
+            else:
+                if char == ",":
+                    self._position += 1
+                    continue
+                if char == "]":
+                    self._position += 1
+                    self._state = _KEY
+                    continue
+                complete, value = self._decode_value(final)
+                if not complete:
+                    break
+                if self._projection is not None:
+                    value = project(value, self._projection)
+                elements.append(value)
+
+        # Drop consumed text so the buffer holds at most one partial value
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+        return elements
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Adds received bytes to the parser.
+
+        Args:
+            chunk: Next bytes of the response
+
+        Returns:
+            Array elements completed by this chunk, in order
+
+        Raises:
+            ValueError: If the response is not a valid JSON object
+        """
+        self._buffer += self._decoder.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signals the end of the response.
+
+        Returns:
+            Array elements completed by the end of the input
+
+        Raises:
+            ValueError: If the response is incomplete or not a JSON object
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        elements = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Response ended before the JSON object was complete")
+        if self._buffer.strip():
+            raise ValueError("Unexpected data after the JSON object")
+        return elements
+
+
+def iter_events(
+    chunks: Iterable[bytes],
+    parser: Optional[EventStreamParser] = None
+) -> Iterator[Any]:
+    """
+    Yields the events of a response as its chunks arrive.
+
+    Args:
+        chunks: Byte chunks of the response, e.g. response.iter_content()
+        parser: Optional parser to use, for access to its fields afterwards
+
+    Yields:
+        Elements of the events array, in order
+
+    Raises:
+        ValueError: If the response is not a valid JSON object
+    """
+    if parser is None:
+        parser = EventStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
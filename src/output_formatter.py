@@ -18,17 +18,34 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-import json
 import csv
 import io
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence, TextIO, Tuple
+
+from . import json_backend
+from .rows import Row
+
+
+def _iter_cells(events: Iterable[Any], fields: tuple[str, ...]) -> Iterator[Sequence[Any]]:
+    """Yields the values of fields for each event, "" for missing fields."""
+    row_class = None
+    get_cells: Optional[Callable[[Row], Tuple[Any, ...]]] = None
+    for event in events:
+        if isinstance(event, Row):
+            # Rows of one type share a compiled getter
+            if get_cells is None or type(event) is not row_class:
+                row_class = type(event)
+                get_cells = row_class.cell_getter(fields)
+            yield get_cells(event)
+        else:
+            yield [event.get(field, "") for field in fields]
 
 
 class OutputFormatter:
     """Formats event data for output in various formats."""
 
     @staticmethod
-    def format_meshtastic(events: list[dict[str, Any]], field_names: list[str]) -> str:
+    def format_meshtastic(events: Sequence[Mapping[str, Any]], field_names: list[str]) -> str:
         """
         Formats events in Meshtastic format using first two fields.
         
@@ -41,21 +58,35 @@ class OutputFormatter:
         Returns:
             Formatted string with # delimiters
         """
-        if not events:
-            return "#"
+        return "".join(OutputFormatter.iter_meshtastic(events, field_names))
+
+    @staticmethod
+    def iter_meshtastic(
+        events: Iterable[Mapping[str, Any]],
+        field_names: list[str]
+    ) -> Iterator[str]:
+        """
+        Formats events in Meshtastic format one at a time.
         
+        Args:
+            events: Iterable of event dictionaries with extracted fields
+            field_names: List of field names (uses first two fields)
+            
+        Yields:
+            "field1_value,field2_value#" for each event, or "#" if there are none
+        """
         # Use first two fields for meshtastic format
-        fields_to_use = field_names[:2] if len(field_names) >= 2 else field_names
+        fields_to_use = tuple(field_names[:2])
         
-        formatted_parts = []
-        for event in events:
-            values = [str(event.get(field, "")) for field in fields_to_use]
-            formatted_parts.append(",".join(values))
-        
-        return "#".join(formatted_parts) + "#"
+        empty = True
+        for cells in _iter_cells(events, fields_to_use):
+            empty = False
+            yield ",".join([str(cell) for cell in cells]) + "#"
+        if empty:
+            yield "#"
 
     @staticmethod
-    def format_json(events: list[dict[str, Any]]) -> str:
+    def format_json(events: Sequence[Mapping[str, Any]]) -> str:
         """
         Formats events as JSON array with all specified fields.
         
@@ -67,10 +98,33 @@ class OutputFormatter:
         Returns:
             JSON string
         """
-        return json.dumps(events, indent=2)
+        return json_backend.dumps(
+            [event.to_dict() if isinstance(event, Row) else event for event in events], indent=2
+        )
 
     @staticmethod
-    def format_csv(events: list[dict[str, Any]], field_names: list[str]) -> str:
+    def iter_json(events: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+        """
+        Formats events as a JSON array one at a time.
+        
+        Args:
+            events: Iterable of event dictionaries with extracted fields
+            
+        Yields:
+            Pieces of the same text format_json() returns for the events
+        """
+        separator = "[\n  "
+        for event in events:
+            if isinstance(event, Row):
+                event = event.to_dict()
+            # Encoded strings never contain raw newlines, so this only
+            # indents the event's own lines
+            yield separator + json_backend.dumps(event, indent=2).replace("\n", "\n  ")
+            separator = ",\n  "
+        yield "[]" if separator == "[\n  " else "\n]"
+
+    @staticmethod
+    def format_csv(events: Sequence[Mapping[str, Any]], field_names: list[str]) -> str:
         """
         Formats events as CSV with headers for all fields.
         
@@ -83,21 +137,36 @@ class OutputFormatter:
         Returns:
             CSV formatted string with headers
         """
+        return "".join(OutputFormatter.iter_csv(events, field_names))
+
+    @staticmethod
+    def iter_csv(events: Iterable[Mapping[str, Any]], field_names: list[str]) -> Iterator[str]:
+        """
+        Formats events as CSV one row at a time.
+        
+        Args:
+            events: Iterable of event dictionaries with extracted fields
+            field_names: List of field names for headers
+            
+        Yields:
+            The header row, then one row per event
+        """
         output = io.StringIO()
         writer = csv.writer(output)
         
         # Write header
         writer.writerow(field_names)
+        yield output.getvalue()
         
-        # Write event rows
-        for event in events:
-            row = [event.get(field, "") for field in field_names]
-            writer.writerow(row)
-        
-        return output.getvalue()
+        # Write event rows, reusing the buffer
+        for cells in _iter_cells(events, tuple(field_names)):
+            output.seek(0)
+            output.truncate()
+            writer.writerow(cells)
+            yield output.getvalue()
 
     @staticmethod
-    def format_plain(events: list[dict[str, Any]], field_names: list[str]) -> str:
+    def format_plain(events: Sequence[Mapping[str, Any]], field_names: list[str]) -> str:
         """
         Formats events as plain text with all fields.
         
@@ -110,21 +179,54 @@ class OutputFormatter:
         Returns:
             Plain text string with one event per line
         """
-        if not events:
-            return ""
+        return "".join(OutputFormatter.iter_plain(events, field_names))
+
+    @staticmethod
+    def iter_plain(events: Iterable[Mapping[str, Any]], field_names: list[str]) -> Iterator[str]:
+        """
+        Formats events as plain text one line at a time.
         
-        lines = []
-        for event in events:
-            field_parts = [f"{field}: {event.get(field, '')}" for field in field_names]
-            lines.append(", ".join(field_parts))
+        Args:
+            events: Iterable of event dictionaries with extracted fields
+            field_names: List of field names to display
+            
+        Yields:
+            One line per event, including its newline
+        """
+        fields = tuple(field_names)
+        for cells in _iter_cells(events, fields):
+            yield ", ".join([f"{field}: {cell}" for field, cell in zip(fields, cells)]) + "\n"
+
+    @staticmethod
+    def add_preamble(output: str, preamble: str, format_type: str = "meshtastic") -> str:
+        """
+        Prefixes formatted output with a preamble and a format-specific separator.
+        
+        Meshtastic output is separated from the preamble with "#", other
+        formats with a newline; no separator is added if the preamble
+        already ends with it.
+        
+        Args:
+            output: Formatted output string
+            preamble: Preamble string (empty for none)
+            format_type: Format of the output
+            
+        Returns:
+            Output with the preamble and separator prepended
+        """
+        if not preamble:
+            return output
         
-        return "\n".join(lines) + "\n"
+        separator = "#" if format_type == "meshtastic" else "\n"
+        if preamble.endswith(separator):
+            return preamble + output
+        return preamble + separator + output
 
     @staticmethod
     def format_events(
-        events: list[dict[str, Any]],
+        events: Sequence[Mapping[str, Any]],
         format_type: str = "meshtastic",
-        field_names: list[str] = None
+        field_names: Optional[list[str]] = None
     ) -> str:
         """
         Formats events according to specified format type.
@@ -156,3 +258,79 @@ class OutputFormatter:
                 f"Invalid format type: {format_type}. "
                 f"Valid options are: meshtastic, json, csv, plain"
             )
+
+    @staticmethod
+    def iter_format(
+        events: Iterable[Mapping[str, Any]],
+        format_type: str = "meshtastic",
+        field_names: Optional[list[str]] = None
+    ) -> Iterator[str]:
+        """
+        Formats events one at a time as they become available.
+        
+        The concatenated chunks equal format_events() of the same events,
+        but each event is written out as soon as it is consumed, so output
+        can start before all events have been received and no formatted
+        copy of all events is built.
+        
+        Args:
+            events: Iterable of event dictionaries with extracted fields
+            format_type: One of "meshtastic", "json", "csv", "plain"
+            field_names: List of field names for ordering (used for CSV headers and plain text)
+            
+        Returns:
+            Iterator over consecutive pieces of the formatted output
+            
+        Raises:
+            ValueError: If format_type is not recognized
+        """
+        if field_names is None:
+            field_names = ["location.title", "title"]
+        
+        if format_type == "meshtastic":
+            return OutputFormatter.iter_meshtastic(events, field_names)
+        elif format_type == "json":
+            return OutputFormatter.iter_json(events)
+        elif format_type == "csv":
+            return OutputFormatter.iter_csv(events, field_names)
+        elif format_type == "plain":
+            return OutputFormatter.iter_plain(events, field_names)
+        else:
+            raise ValueError(
+                f"Invalid format type: {format_type}. "
+                f"Valid options are: meshtastic, json, csv, plain"
+            )
+
+    @staticmethod
+    def write_events(
+        stream: TextIO,
+        events: Iterable[Mapping[str, Any]],
+        format_type: str = "meshtastic",
+        field_names: Optional[list[str]] = None,
+        preamble: str = "",
+        flush: bool = False
+    ) -> None:
+        """
+        Formats events one at a time and writes them straight to a stream.
+        
+        Writes the same text as add_preamble(format_events(...)), without
+        holding the events or their formatted output in memory.
+        
+        Args:
+            stream: Text stream to write to, e.g. sys.stdout
+            events: Iterable of event dictionaries with extracted fields
+            format_type: One of "meshtastic", "json", "csv", "plain"
+            field_names: List of field names for ordering (used for CSV headers and plain text)
+            preamble: Preamble string (empty for none)
+            flush: Flush the stream after every event, so that each one
+                   appears as soon as it is formatted
+            
+        Raises:
+            ValueError: If format_type is not recognized
+        """
+        chunks = OutputFormatter.iter_format(events, format_type, field_names)
+        stream.write(OutputFormatter.add_preamble("", preamble, format_type))
+        for chunk in chunks:
+            stream.write(chunk)
+            if flush:
+                stream.flush()
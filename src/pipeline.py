@@ -0,0 +1,113 @@
+"""Pipeline module for Villages Event Scraper.
+
+This module runs the start-up stages shared by every query: fetching
+the authentication token and establishing the HTTP session.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from .config import Config
+from .retry import RetryPolicy
+from .session_manager import SessionManager
+from .timing import Deadline, StageTimer, Timeout
+from .token_cache import TokenCache
+from .token_fetcher import fetch_auth_token
+
+
+logger = logging.getLogger(__name__)
+
+
+def start_session(
+    session_manager: SessionManager,
+    calendar_url: str,
+    js_url: str = Config.JS_URL,
+    timeout: Timeout = Config.DEFAULT_TIMEOUT,
+    token_cache: Optional[TokenCache] = None,
+    stream_token: bool = False,
+    timer: Optional[StageTimer] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    deadline: Optional[Deadline] = None,
+    token_session: bool = False
+) -> Tuple[str, bool]:
+    """
+    Fetches the authentication token and establishes the session concurrently.
+
+    The two stages are independent requests to different hosts (the CDN
+    and the website), so they are overlapped and joined before any API
+    request is made.
+
+    Args:
+        session_manager: Session manager to establish
+        calendar_url: URL to the calendar page
+        js_url: URL to the JavaScript file holding the token
+        timeout: Request timeout in seconds, or (connect, read) tuple
+        token_cache: Optional token cache passed to fetch_auth_token
+        stream_token: Use streaming token extraction
+        timer: Optional timer recording the "token" and "session" stages
+        retry_policy: Optional policy retrying transient failures of each
+            stage on its own, so a failed session visit does not refetch
+            the token and vice versa
+        deadline: Optional run deadline bounding both stages
+        token_session: Fetch the token over the session manager's pooled
+            session, reusing its connections
+
+    Returns:
+        Tuple of (auth_token, warmed_up) where warmed_up is False if the
+        calendar page visit was skipped thanks to persisted cookies
+
+    Raises:
+        TokenFetchError: If fetching the token fails
+        SessionError: If session establishment fails
+        DeadlineExceededError: If the deadline passes first
+    """
+    if timer is None:
+        timer = StageTimer()
+
+    fetch_token = fetch_auth_token
+    ensure_session = session_manager.ensure_session
+    if retry_policy is not None:
+        fetch_token = retry_policy.wrap("token", fetch_token, deadline=deadline)
+        ensure_session = retry_policy.wrap("session", ensure_session, deadline=deadline)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        logger.debug("Fetching authentication token and establishing session...")
+        token_future = executor.submit(
+            timer.timed("token", fetch_token),
+            js_url,
+            timeout=timeout,
+            cache=token_cache,
+            stream=stream_token,
+            deadline=deadline,
+            session=session_manager.get_session() if token_session else None
+        )
+        session_future = executor.submit(
+            timer.timed("session", ensure_session),
+            calendar_url,
+            timeout=timeout,
+            deadline=deadline
+        )
+        # Report a token failure first, matching the order of the stages
+        auth_token = token_future.result()
+        warmed_up = session_future.result()
+
+    return auth_token, warmed_up
@@ -0,0 +1,333 @@
+"""Query planner module for Villages Event Scraper.
+
+This module decides which API calls a batch of queries actually needs.
+When one requested query is a superset of another (for example
+"town-squares" and "Brownwood+Paddock+Square", "this-week" and "today",
+or "all" categories and "sports"), only the wider query is fetched and
+the narrower result is derived locally by filtering its events on
+``category``, ``location.category``, ``location.title`` and the event's
+start and end dates.
+
+Date ranges are interpreted as calendar periods in The Villages' local
+time zone: "this-week" is the Sunday-to-Saturday week containing today
+and "this-month" is the calendar month.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .config import Config
+
+zoneinfo: Optional[ModuleType]
+try:
+    import zoneinfo
+except ImportError:  # pragma: no cover - Python 3.8
+    zoneinfo = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryKey(NamedTuple):
+    """The filters of one API query."""
+
+    date_range: str
+    category: str
+    location: str
+
+
+class QueryPlan(NamedTuple):
+    """API calls to issue and where each requested query is served from."""
+
+    fetches: List[QueryKey]
+    sources: Dict[QueryKey, QueryKey]
+
+
+def _local_timezone(name: str) -> Optional[tzinfo]:
+    """Returns the tzinfo for a zone name, or None if zone data is unavailable."""
+    if zoneinfo is None:
+        return None
+    try:
+        zone: tzinfo = zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return None
+    return zone
+
+
+class QueryPlanner:
+    """Plans the minimal set of API calls for a batch of queries."""
+
+    def __init__(
+        self,
+        location_groups: Optional[Dict[str, List[str]]] = None,
+        today: Optional[date] = None,
+        time_zone: str = Config.TIMEZONE
+    ):
+        """
+        Initialize the planner.
+
+        Args:
+            location_groups: Mapping of location category values to the
+                location title values they contain (defaults to
+                Config.LOCATION_GROUPS)
+            today: Fixed local date date ranges are computed from (defaults
+                to the current date in time_zone, read on every use so that
+                long-running processes follow the calendar)
+            time_zone: IANA time zone name of The Villages
+        """
+        self.location_groups = (
+            location_groups if location_groups is not None else Config.LOCATION_GROUPS
+        )
+        self.tzinfo = _local_timezone(time_zone)
+        if self.tzinfo is None:
+            logger.debug(f"Time zone data for {time_zone} unavailable, not deriving date ranges")
+        self._today = today
+
+    @property
+    def today(self) -> date:
+        """Local date date ranges are computed from."""
+        if self._today is not None:
+            return self._today
+        return datetime.now(self.tzinfo or timezone.utc).date()
+
+    def date_bounds(self, date_range: str) -> Optional[Tuple[date, date]]:
+        """
+        Returns the half-open local date interval of a date range.
+
+        Args:
+            date_range: Date range value (e.g., "today", "this-week")
+
+        Returns:
+            Tuple of (first_day, day_after_last), or None for "all" and
+            unknown values
+        """
+        today = self.today
+        # Weeks run Sunday to Saturday; date.weekday() is 0 for Monday
+        week_start = today - timedelta(days=(today.weekday() + 1) % 7)
+        month_start = today.replace(day=1)
+        next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+
+        if date_range == "today":
+            return today, today + timedelta(days=1)
+        if date_range == "tomorrow":
+            return today + timedelta(days=1), today + timedelta(days=2)
+        if date_range == "this-week":
+            return week_start, week_start + timedelta(days=7)
+        if date_range == "next-week":
+            return week_start + timedelta(days=7), week_start + timedelta(days=14)
+        if date_range == "this-month":
+            return month_start, next_month_start
+        if date_range == "next-month":
+            return next_month_start, (next_month_start + timedelta(days=32)).replace(day=1)
+        return None
+
+    def _covers_date(self, wide: str, narrow: str) -> bool:
+        if wide == narrow:
+            return True
+        # Without the local zone, event dates cannot be compared with the
+        # local dates the API filters on
+        if self.tzinfo is None:
+            return False
+        if wide == "all":
+            return True
+        wide_bounds = self.date_bounds(wide)
+        narrow_bounds = self.date_bounds(narrow)
+        if wide_bounds is None or narrow_bounds is None:
+            return False
+        return wide_bounds[0] <= narrow_bounds[0] and narrow_bounds[1] <= wide_bounds[1]
+
+    def _covers_location(self, wide: str, narrow: str) -> bool:
+        if wide == narrow or wide == "all":
+            return True
+        return narrow in self.location_groups.get(wide, ())
+
+    def covers(self, wide: QueryKey, narrow: QueryKey) -> bool:
+        """
+        Checks whether every event of one query is also returned by another.
+
+        Args:
+            wide: Candidate superset query
+            narrow: Candidate subset query
+
+        Returns:
+            True if narrow's events can be derived from wide's response
+        """
+        return (
+            (wide.category == narrow.category or wide.category == "all")
+            and self._covers_location(wide.location, narrow.location)
+            and self._covers_date(wide.date_range, narrow.date_range)
+        )
+
+    def plan(self, keys: Iterable[QueryKey]) -> QueryPlan:
+        """
+        Chooses which queries to fetch and which to derive.
+
+        Only requested queries are ever fetched: each query that is not
+        covered by another requested query is fetched, and every other
+        query is served from one of those.
+
+        Args:
+            keys: Requested queries (duplicates allowed)
+
+        Returns:
+            QueryPlan listing the fetches in request order and the source
+            of every requested query
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        fetches = [
+            key for key in unique_keys
+            if not any(other != key and self.covers(other, key) for other in unique_keys)
+        ]
+
+        sources = {}
+        for key in unique_keys:
+            # covers() is transitive, so some fetched query always covers key
+            sources[key] = next(source for source in fetches if self.covers(source, key))
+
+        return QueryPlan(fetches=fetches, sources=sources)
+
+    def _event_dates(self, event: Dict[str, Any]) -> Optional[Tuple[date, date]]:
+        """Returns the local (start, end) dates of an event, or None if unparsable."""
+        dates: List[Optional[date]] = []
+        for field in ("start", "end"):
+            value = event.get(field)
+            value = value.get("date") if isinstance(value, dict) else None
+            if not isinstance(value, str) or not value:
+                dates.append(None)
+                continue
+            try:
+                if len(value) == 10:
+                    dates.append(date.fromisoformat(value))
+                    continue
+                parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+            if parsed.tzinfo is not None:
+                # Read dates in the zone that today is read in
+                parsed = parsed.astimezone(self.tzinfo or timezone.utc)
+            dates.append(parsed.date())
+
+        start, end = dates
+        if start is None:
+            return None
+        return start, end if end is not None and end >= start else start
+
+    def matches(self, event: Dict[str, Any], key: QueryKey) -> bool:
+        """
+        Checks whether an event satisfies a query's filters.
+
+        Args:
+            event: Event dictionary from an API response
+            key: Query whose filters are applied
+
+        Returns:
+            True if the event belongs in the query's result
+        """
+        if not isinstance(event, dict):
+            return False
+
+        if key.category != "all" and event.get("category") != key.category:
+            return False
+
+        if key.location != "all":
+            location = event.get("location")
+            location = location if isinstance(location, dict) else {}
+            if (
+                location.get("category") != key.location
+                and location.get("title") != key.location.replace("+", " ")
+            ):
+                return False
+
+        bounds = self.date_bounds(key.date_range)
+        if bounds is not None:
+            event_dates = self._event_dates(event)
+            if event_dates is None:
+                return False
+            # Keep events that overlap the range, including multi-day events
+            if event_dates[1] < bounds[0] or event_dates[0] >= bounds[1]:
+                return False
+
+        return True
+
+    def derive(
+        self,
+        api_response: Dict[str, Any],
+        source: QueryKey,
+        target: QueryKey
+    ) -> Dict[str, Any]:
+        """
+        Derives a query's response from the response of a covering query.
+
+        Args:
+            api_response: Parsed API response of the source query
+            source: Query the response was fetched for
+            target: Query to derive
+
+        Returns:
+            Response with only the target's events and a matching count
+        """
+        if source == target:
+            return api_response
+
+        events = api_response.get("events")
+        if not isinstance(events, list):
+            return api_response
+
+        derived = dict(api_response)
+        derived["events"] = [event for event in events if self.matches(event, target)]
+        derived["count"] = len(derived["events"])
+        return derived
+
+    def execute(
+        self,
+        keys: Iterable[QueryKey],
+        fetch: Callable[[List[QueryKey]], Dict[QueryKey, Any]]
+    ) -> Dict[QueryKey, Any]:
+        """
+        Plans a batch, fetches only the necessary queries and derives the rest.
+
+        Args:
+            keys: Requested queries
+            fetch: Callable taking the queries to fetch and returning a
+                mapping of each to its API response, or to the exception
+                that its fetch raised
+
+        Returns:
+            Mapping of every requested query to its response, or to the
+            exception of the fetch it depends on
+        """
+        plan = self.plan(keys)
+        if len(plan.fetches) < len(plan.sources):
+            logger.debug(
+                f"Serving {len(plan.sources)} queries from {len(plan.fetches)} API calls"
+            )
+
+        fetched = fetch(plan.fetches)
+        results: Dict[QueryKey, Any] = {}
+        for key, source in plan.sources.items():
+            response = fetched[source]
+            if isinstance(response, Exception):
+                results[key] = response
+            else:
+                results[key] = self.derive(response, source, key)
+        return results
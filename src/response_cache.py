@@ -0,0 +1,288 @@
+"""Response cache module for Villages Event Scraper.
+
+This module caches complete API responses on disk, keyed on the
+normalized API URL. Fresh entries are served without any request.
+Entries past their time-to-live but within the stale window are served
+while being refreshed (in the background when the caller keeps running,
+synchronously otherwise), and are used as a fallback when a refresh
+fails with an APIError.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+from . import json_backend
+from .api_client import normalize_api_url
+from .config import Config
+from .exceptions import APIError
+from .files import atomic_write
+
+
+logger = logging.getLogger(__name__)
+
+
+def _response(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the API response held by a cache entry."""
+    response: Dict[str, Any] = entry["response"]
+    return response
+
+
+class ResponseCache:
+    """File-backed cache of API responses keyed on the normalized API URL."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: int = Config.DEFAULT_RESPONSE_TTL,
+        stale_ttl: int = Config.DEFAULT_RESPONSE_STALE_TTL,
+        background_refresh: bool = False
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory in which cache files are stored
+            ttl: Number of seconds a cached response is considered fresh
+            stale_ttl: Number of seconds after expiry a stale response may
+                still be served while refreshing or when the API fails
+            background_refresh: Refresh stale entries in a background
+                thread and serve the stale response immediately; only
+                useful in long-running processes
+        """
+        self.cache_dir = os.path.join(os.path.expanduser(cache_dir), "responses")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.background_refresh = background_refresh
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        """Returns the cache file path for a normalized API URL."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def load(self, api_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Loads the cache entry for an API URL regardless of its age.
+
+        Args:
+            api_url: API endpoint URL with query parameters
+
+        Returns:
+            Cache entry dictionary, or None if missing or unreadable
+        """
+        key = normalize_api_url(api_url)
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = json_backend.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable response cache entry for {key}: {e}")
+            return None
+
+        if (
+            not isinstance(entry, dict)
+            or entry.get("key") != key
+            or not isinstance(entry.get("response"), dict)
+        ):
+            return None
+        return entry
+
+    def age(self, entry: Dict[str, Any]) -> float:
+        """
+        Returns the age of a cache entry in seconds.
+
+        Args:
+            entry: Cache entry returned by load()
+
+        Returns:
+            Seconds since the entry was stored, or infinity if unknown
+        """
+        try:
+            age = time.time() - float(entry.get("fetched_at", 0))
+        except (TypeError, ValueError):
+            return float("inf")
+        return age if age >= 0 else float("inf")
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """
+        Checks whether a cache entry is still within its time-to-live.
+
+        Args:
+            entry: Cache entry returned by load()
+
+        Returns:
+            True if the entry was stored less than ttl seconds ago
+        """
+        return self.age(entry) < self.ttl
+
+    def is_usable(self, entry: Dict[str, Any]) -> bool:
+        """
+        Checks whether a cache entry may still be served as stale.
+
+        Args:
+            entry: Cache entry returned by load()
+
+        Returns:
+            True if the entry expired less than stale_ttl seconds ago
+        """
+        return self.age(entry) < self.ttl + self.stale_ttl
+
+    def get(self, api_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached response for an API URL if it is still fresh.
+
+        Args:
+            api_url: API endpoint URL with query parameters
+
+        Returns:
+            Cached response, or None if missing or expired
+        """
+        entry = self.load(api_url)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return _response(entry)
+
+    def get_stale(self, api_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached response for an API URL while it is still usable.
+
+        Args:
+            api_url: API endpoint URL with query parameters
+
+        Returns:
+            Fresh or stale cached response, or None if missing or too old
+        """
+        entry = self.load(api_url)
+        if entry is None or not self.is_usable(entry):
+            return None
+        return _response(entry)
+
+    def set(self, api_url: str, response: Dict[str, Any]) -> None:
+        """
+        Stores the response for an API URL.
+
+        Write failures are logged and otherwise ignored, since the cache
+        is only an optimization.
+
+        Args:
+            api_url: API endpoint URL with query parameters
+            response: Parsed API response
+        """
+        key = normalize_api_url(api_url)
+        entry = {"key": key, "fetched_at": time.time(), "response": response}
+        try:
+            atomic_write(self._path(key), json_backend.dumps(entry))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write response cache in {self.cache_dir}: {e}")
+
+    def invalidate(self, api_url: str) -> None:
+        """
+        Removes the cached response for an API URL.
+
+        Args:
+            api_url: API endpoint URL with query parameters
+        """
+        key = normalize_api_url(api_url)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove response cache entry for {key}: {e}")
+
+    def _refresh(self, api_url: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetches a response and stores it."""
+        response = fetch()
+        self.set(api_url, response)
+        return response
+
+    def _refresh_in_background(self, api_url: str, fetch: Callable[[], Dict[str, Any]]) -> None:
+        """Starts a background refresh unless one is already running for the URL."""
+        key = normalize_api_url(api_url)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                self._refresh(api_url, fetch)
+            except APIError as e:
+                logger.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="response-cache-refresh", daemon=True).start()
+
+    def fetch(
+        self,
+        api_url: str,
+        fetch: Callable[[], Dict[str, Any]],
+        background: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Returns the response for an API URL, using the cache where possible.
+
+        Args:
+            api_url: API endpoint URL with query parameters
+            fetch: Callable performing the API request and returning the
+                parsed response
+            background: Whether a stale entry is served while it is refreshed
+                in the background; defaults to background_refresh
+
+        Returns:
+            Fresh cached response, stale cached response (while refreshing
+            in the background or when the refresh fails), or the newly
+            fetched response
+
+        Raises:
+            APIError: If the request fails and no usable cached response exists
+        """
+        entry = self.load(api_url)
+        if entry is not None and self.is_fresh(entry):
+            logger.debug(f"Using cached response for {api_url}")
+            return _response(entry)
+
+        stale = entry if entry is not None and self.is_usable(entry) else None
+        if background is None:
+            background = self.background_refresh
+        if stale is not None and background:
+            logger.debug(f"Serving stale response for {api_url} while refreshing")
+            self._refresh_in_background(api_url, fetch)
+            return _response(stale)
+
+        try:
+            return self._refresh(api_url, fetch)
+        except APIError as e:
+            if stale is None:
+                raise
+            logger.warning(
+                f"API request failed, serving cached response from "
+                f"{int(self.age(stale))} seconds ago: {e}"
+            )
+            return _response(stale)
@@ -0,0 +1,229 @@
+"""Retry module for Villages Event Scraper.
+
+This module retries transient failures (timeouts, connection errors and
+5xx/429 answers) of a single pipeline stage with exponential backoff and
+full jitter. A retry budget caps the total number of retries a run may
+spend across all stages, so a persistent outage fails quickly instead
+of multiplying every stage's latency.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import requests
+
+from .config import Config
+from .exceptions import VillagesEventError
+from .timing import Deadline
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Checks whether a failure is worth retrying.
+
+    Args:
+        error: Exception raised by a pipeline stage
+
+    Returns:
+        True for timeouts, connection errors and 5xx or 429 answers
+    """
+    cause = error.__cause__ if isinstance(error, VillagesEventError) else error
+    if isinstance(cause, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    if status_code is None and isinstance(cause, requests.exceptions.HTTPError):
+        if cause.response is not None:
+            status_code = cause.response.status_code
+    return status_code is not None and (status_code >= 500 or status_code == 429)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter and a shared retry budget."""
+
+    def __init__(
+        self,
+        max_attempts: int = Config.DEFAULT_RETRY_ATTEMPTS,
+        base_delay: float = Config.DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = Config.DEFAULT_RETRY_MAX_DELAY,
+        budget: int = Config.DEFAULT_RETRY_BUDGET,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Maximum attempts per call, including the first
+            base_delay: Backoff ceiling in seconds before the first retry;
+                it doubles with every further retry
+            max_delay: Upper bound of the backoff ceiling in seconds
+            budget: Maximum number of retries across all calls until
+                reset_budget() is called
+            sleep: Function used to wait between attempts
+        """
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._sleep = sleep
+        self._remaining = budget
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["RetryPolicy"]:
+        """
+        Builds a policy from the ``retry`` section of the configuration.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            RetryPolicy, or None if the section is missing or invalid
+        """
+        section = config.get("retry")
+        if section is None:
+            return None
+        if not isinstance(section, dict):
+            logger.warning("retry in config must be a mapping, retries are disabled")
+            return None
+
+        try:
+            return cls(
+                max_attempts=int(section.get("max_attempts", Config.DEFAULT_RETRY_ATTEMPTS)),
+                base_delay=float(section.get("base_delay", Config.DEFAULT_RETRY_BASE_DELAY)),
+                max_delay=float(section.get("max_delay", Config.DEFAULT_RETRY_MAX_DELAY)),
+                budget=int(section.get("budget", Config.DEFAULT_RETRY_BUDGET))
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid retry settings in config, retries are disabled: {e}")
+            return None
+
+    @property
+    def remaining_budget(self) -> int:
+        """Returns the number of retries left in the budget."""
+        with self._lock:
+            return self._remaining
+
+    def reset_budget(self) -> None:
+        """Restores the full retry budget, e.g. at the start of a new run."""
+        with self._lock:
+            self._remaining = self.budget
+
+    def _take_retry(self) -> bool:
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    def backoff(self, retry_number: int) -> float:
+        """
+        Returns a randomized delay before a retry.
+
+        Args:
+            retry_number: 1 for the first retry, 2 for the second, ...
+
+        Returns:
+            Delay in seconds, drawn uniformly between zero and the
+            exponentially growing ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry_number - 1))
+        return random.uniform(0, ceiling)
+
+    def call(self, stage: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Calls a function, retrying it on transient failures.
+
+        Args:
+            stage: Stage name used in log messages (e.g., "token")
+            func: Function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            Exception: The last failure, once it is not transient, attempts
+                are exhausted or the retry budget is spent
+        """
+        return self._call(stage, func, args, kwargs)
+
+    def _call(
+        self,
+        stage: str,
+        func: Callable[..., T],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        deadline: Optional[Deadline] = None
+    ) -> T:
+        attempt = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except VillagesEventError as e:
+                if not is_transient(e) or attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt)
+                if deadline is not None and delay >= deadline.remaining():
+                    logger.warning(f"Run deadline too close, not retrying {stage}: {e}")
+                    raise
+                if not self._take_retry():
+                    logger.warning(f"Retry budget exhausted, not retrying {stage}: {e}")
+                    raise
+                logger.warning(
+                    f"{stage} failed ({e}), retrying in {delay:.2f}s "
+                    f"(attempt {attempt + 1} of {self.max_attempts})"
+                )
+                self._sleep(delay)
+                attempt += 1
+
+    def wrap(
+        self,
+        stage: str,
+        func: Callable[..., T],
+        deadline: Optional[Deadline] = None
+    ) -> Callable[..., T]:
+        """
+        Returns a version of a function that retries through this policy.
+
+        Args:
+            stage: Stage name used in log messages
+            func: Function to wrap
+            deadline: Optional run deadline; a retry whose backoff would
+                reach it is not attempted
+
+        Returns:
+            Wrapped function with the same signature
+        """
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return self._call(stage, func, args, kwargs, deadline)
+        return wrapper
@@ -0,0 +1,156 @@
+"""Compact row module for Villages Event Scraper.
+
+This module provides a compact representation of processed events. A
+row type is generated once per set of output fields: its instances store
+one value per field in ``__slots__``, without a per-row dictionary or
+copies of the field names, which takes well under half the memory of the
+equivalent dict. Rows are read-only mappings from field name to value,
+so code written for processed-event dictionaries works with them too.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from collections.abc import Mapping
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, Tuple, Type, cast
+
+
+class Row(Mapping):
+    """Base class of the compact rows generated by row_type()."""
+
+    __slots__ = ()
+
+    # Set on each generated row type
+    fields: Tuple[str, ...] = ()
+    _slot_of: Dict[str, str] = {}
+    _cell_getters: Dict[Tuple[str, ...], Callable[["Row"], Tuple[Any, ...]]] = {}
+
+    def __getitem__(self, field: str) -> Any:
+        slot = self._slot_of.get(field)
+        if slot is None:
+            raise KeyError(field)
+        return getattr(self, slot)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Returns the value of a field, or default if the row has no such field."""
+        slot = self._slot_of.get(field)
+        return default if slot is None else getattr(self, slot)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (_make_row, (self.fields, self.cells(self.fields)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the row as a dictionary, as EventProcessor returns without compact rows."""
+        return dict(zip(self.fields, self.cells(self.fields)))
+
+    def cells(self, fields: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """
+        Returns the values of fields in the given order.
+
+        Args:
+            fields: Field names; fields the row does not have are ""
+
+        Returns:
+            Tuple of values
+        """
+        return self.cell_getter(fields)(self)
+
+    @classmethod
+    def cell_getter(cls, fields: Tuple[str, ...]) -> Callable[["Row"], Tuple[Any, ...]]:
+        """
+        Returns a function reading the values of fields from rows of this type.
+
+        Args:
+            fields: Field names; fields the rows do not have are ""
+
+        Returns:
+            Function returning a tuple of values, as cells() does
+        """
+        getter = cls._cell_getters.get(fields)
+        if getter is None:
+            getter = cls._cell_getters[fields] = _compile_cells(cls._slot_of, fields)
+        return getter
+
+
+def _compile_cells(
+    slot_of: Dict[str, str],
+    fields: Tuple[str, ...]
+) -> Callable[[Row], Tuple[Any, ...]]:
+    """Builds a function returning the values of fields from a row."""
+    if any(field not in slot_of for field in fields):
+        optional_slots = [slot_of.get(field) for field in fields]
+        return lambda row: tuple(
+            "" if slot is None else getattr(row, slot) for slot in optional_slots
+        )
+    slots = [slot_of[field] for field in fields]
+    if len(slots) == 1:
+        get = attrgetter(slots[0])
+        return lambda row: (get(row),)
+    if not slots:
+        return lambda row: ()
+    return attrgetter(*slots)
+
+
+@lru_cache(maxsize=128)
+def row_type(fields: Tuple[str, ...]) -> Type[Row]:
+    """
+    Returns the row type for a set of fields.
+
+    Args:
+        fields: Field names in output order, without duplicates
+
+    Returns:
+        Subclass of Row with one slot per field; the same class is
+        returned for the same fields
+    """
+    slots = tuple(f"_{index}" for index in range(len(fields)))
+
+    # Generate __init__ with one parameter per slot, as namedtuple does, so
+    # that building a row costs no loop
+    namespace: Dict[str, Any] = {}
+    exec(
+        f"def __init__(self, {', '.join(slots)}):\n"
+        + "".join(f"    self.{slot} = {slot}\n" for slot in slots)
+        + ("" if slots else "    pass\n"),
+        namespace
+    )
+    namespace["__init__"].__doc__ = f"Initialize a row with the values of {', '.join(fields)}."
+
+    return cast(Type[Row], type("Row", (Row,), {
+        "__slots__": slots,
+        "__init__": namespace["__init__"],
+        "fields": fields,
+        "_slot_of": dict(zip(fields, slots)),
+        "_cell_getters": {},
+    }))
+
+
+def _make_row(fields: Tuple[str, ...], values: Tuple[Any, ...]) -> Row:
+    """Recreates a row when unpickling."""
+    return row_type(fields)(*values)
@@ -1,7 +1,9 @@
 """Session manager module for Villages Event Scraper.
 
 This module handles HTTP session management and cookie handling
-for API requests to The Villages.
+for API requests to The Villages. The cookie jar can be persisted to
+disk so that later runs skip the calendar page warm-up while the
+saved cookies are still valid.
 """
 
 """
@@ -22,55 +24,233 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+import json
+import logging
+import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
 from .exceptions import SessionError
 from .config import Config
+from .files import atomic_write
+from .timing import Deadline, Timeout
+
+
+logger = logging.getLogger(__name__)
 
 
 class SessionManager:
     """Manages HTTP session and cookies for API requests."""
     
-    def __init__(self):
-        """Initialize session with requests.Session()."""
+    def __init__(
+        self,
+        cookie_file: Optional[str] = None,
+        cookie_ttl: int = Config.DEFAULT_COOKIE_TTL,
+        pool_connections: int = Config.DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = Config.DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = Config.DEFAULT_KEEP_ALIVE
+    ):
+        """Initialize session with requests.Session().
+        
+        Args:
+            cookie_file: Optional path where the cookie jar is persisted
+                between runs; saved cookies are loaded immediately
+            cookie_ttl: Number of seconds a saved cookie jar is reused
+                before the calendar page is visited again
+            pool_connections: Number of hosts whose connection pools are kept
+            pool_maxsize: Maximum number of idle connections kept per host;
+                should cover the number of concurrent requests to one host
+            keep_alive: Keep connections open for reuse by later requests;
+                when False, every request performs a new TLS handshake
+        """
         self._session: Optional[requests.Session] = requests.Session()
         self._session.headers.update({
             'User-Agent': Config.USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
+            'Connection': 'keep-alive' if keep_alive else 'close',
         })
+        # Concurrent requests beyond the default pool size of 10 would each
+        # open (and then discard) a connection of their own
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self.cookie_file = os.path.expanduser(cookie_file) if cookie_file else None
+        self.cookie_ttl = cookie_ttl
+        self._cookies_valid_until = 0.0
+        if self.cookie_file is not None:
+            self._load_cookies(self.cookie_file)
     
-    def establish_session(self, calendar_url: str, timeout: int = Config.DEFAULT_TIMEOUT) -> None:
+    def _load_cookies(self, cookie_file: str) -> None:
+        """Loads persisted cookies into the session if they are still valid."""
+        try:
+            with open(cookie_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            saved_at = float(saved['saved_at'])
+            cookies = [
+                requests.cookies.create_cookie(
+                    name=cookie['name'],
+                    value=cookie['value'],
+                    domain=cookie.get('domain', ''),
+                    path=cookie.get('path', '/'),
+                    expires=cookie.get('expires'),
+                    secure=cookie.get('secure', False),
+                )
+                for cookie in saved['cookies']
+            ]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable cookie file {cookie_file}: {e}")
+            return
+        
+        # The jar is only as valid as its earliest-expiring cookie
+        now = time.time()
+        valid_until = saved_at + self.cookie_ttl
+        for cookie in cookies:
+            if cookie.expires is not None:
+                valid_until = min(valid_until, cookie.expires)
+        if valid_until <= now:
+            return
+        
+        session = self.get_session()
+        for cookie in cookies:
+            session.cookies.set_cookie(cookie)
+        self._cookies_valid_until = valid_until
+    
+    def save_cookies(self) -> None:
+        """Persists the session's cookie jar to the cookie file.
+        
+        Write failures are logged and otherwise ignored, since the cookie
+        file is only an optimization.
+        """
+        if self.cookie_file is None or self._session is None:
+            return
+        
+        saved_at = time.time()
+        saved = {
+            'saved_at': saved_at,
+            'cookies': [
+                {
+                    'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain,
+                    'path': cookie.path,
+                    'expires': cookie.expires,
+                    'secure': cookie.secure,
+                }
+                for cookie in self._session.cookies
+            ],
+        }
+        try:
+            atomic_write(self.cookie_file, json.dumps(saved))
+        except OSError as e:
+            logger.warning(f"Could not save cookies to {self.cookie_file}: {e}")
+        else:
+            self._cookies_valid_until = saved_at + self.cookie_ttl
+    
+    def has_valid_cookies(self) -> bool:
+        """Checks whether the session holds persisted cookies that are still valid.
+        
+        Returns:
+            True if a saved cookie jar was loaded or saved and has not expired
+        """
+        return time.time() < self._cookies_valid_until
+    
+    def invalidate_cookies(self) -> None:
+        """Clears the cookie jar and removes the persisted cookie file."""
+        self._cookies_valid_until = 0.0
+        if self._session is not None:
+            self._session.cookies.clear()
+        if self.cookie_file is not None:
+            try:
+                os.remove(self.cookie_file)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove cookie file {self.cookie_file}: {e}")
+    
+    def ensure_session(
+        self,
+        calendar_url: str,
+        timeout: Timeout = Config.DEFAULT_TIMEOUT,
+        deadline: Optional[Deadline] = None
+    ) -> bool:
+        """Establishes the session unless valid persisted cookies are available.
+        
+        Args:
+            calendar_url: URL to the calendar page
+            timeout: Request timeout in seconds, or (connect, read) tuple
+            deadline: Optional run deadline passed to establish_session
+            
+        Returns:
+            True if the calendar page was visited, False if it was skipped
+            
+        Raises:
+            SessionError: If session establishment fails
+        """
+        if self._session is None:
+            raise SessionError("Session has been closed")
+        
+        if self.has_valid_cookies():
+            self._set_api_headers(calendar_url)
+            return False
+        
+        self.establish_session(calendar_url, timeout=timeout, deadline=deadline)
+        return True
+    
+    def _set_api_headers(self, calendar_url: str) -> None:
+        """Sets the Origin and Referer headers used by subsequent API requests."""
+        self.get_session().headers.update({
+            'Origin': 'https://www.thevillages.com',
+            'Referer': calendar_url,
+        })
+    
+    def establish_session(
+        self,
+        calendar_url: str,
+        timeout: Timeout = Config.DEFAULT_TIMEOUT,
+        deadline: Optional[Deadline] = None
+    ) -> None:
         """Visit calendar page to establish session and capture cookies.
         
         Args:
             calendar_url: URL to the calendar page
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds, or (connect, read) tuple
+            deadline: Optional run deadline; the timeout is shortened to the
+                      time left and the page body, which only the cookies
+                      in its headers are needed from, is not downloaded
             
         Raises:
             SessionError: If session establishment fails
+            DeadlineExceededError: If the deadline has passed
         """
         if self._session is None:
             raise SessionError("Session has been closed")
         
         try:
             # Visit the calendar page to establish session and capture cookies
-            response = self._session.get(calendar_url, timeout=timeout)
+            if deadline is not None:
+                response = self._session.get(
+                    calendar_url, timeout=deadline.timeout(timeout, "session"), stream=True
+                )
+                response.close()
+            else:
+                response = self._session.get(calendar_url, timeout=timeout)
             response.raise_for_status()
             
             # Update headers with Origin and Referer for subsequent API requests
-            self._session.headers.update({
-                'Origin': 'https://www.thevillages.com',
-                'Referer': calendar_url,
-            })
+            self._set_api_headers(calendar_url)
             
         except requests.exceptions.Timeout as e:
-            raise SessionError(f"Timeout while establishing session: {e}")
+            raise SessionError(f"Timeout while establishing session: {e}") from e
         except requests.exceptions.RequestException as e:
-            raise SessionError(f"Failed to establish session: {e}")
+            raise SessionError(f"Failed to establish session: {e}") from e
+        
+        self.save_cookies()
     
     def get_session(self) -> requests.Session:
         """Returns the active session object.
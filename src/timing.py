@@ -0,0 +1,190 @@
+"""Timing module for Villages Event Scraper.
+
+This module records how long each stage of a run takes so that
+slow stages can be identified from the command line, and bounds the
+total duration of a run with a deadline shared by all of its requests.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple, TypeVar, Union
+
+from .exceptions import DeadlineExceededError
+
+
+T = TypeVar("T")
+
+# A single timeout for both connecting and each read, or (connect, read)
+Timeout = Union[float, Tuple[float, float]]
+
+
+class StageTimer:
+    """Records wall-clock durations of named pipeline stages."""
+
+    def __init__(self):
+        """Initialize an empty, thread-safe set of timings."""
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Times the enclosed block as a named stage.
+
+        The duration is recorded even if the block raises. Repeated
+        stages with the same name accumulate.
+
+        Args:
+            name: Stage name (e.g., "token", "session", "api")
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._timings[name] = self._timings.get(name, 0.0) + elapsed
+
+    def timed(self, name: str, func: Callable[..., T]) -> Callable[..., T]:
+        """
+        Wraps a callable so that each call is timed as a named stage.
+
+        Args:
+            name: Stage name
+            func: Callable to wrap
+
+        Returns:
+            Wrapped callable with the same signature
+        """
+        def wrapper(*args, **kwargs) -> T:
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Returns a copy of the recorded stage durations in seconds."""
+        with self._lock:
+            return dict(self._timings)
+
+    def format_report(self) -> str:
+        """
+        Formats the recorded timings, one stage per line in recording order.
+
+        Returns:
+            Report such as "token: 0.123s\\nsession: 0.210s"
+        """
+        return "\n".join(f"{name}: {elapsed:.3f}s" for name, elapsed in self.timings.items())
+
+
+class Deadline:
+    """Total time budget of a run, shared by all of its requests."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Start the budget.
+
+        Args:
+            seconds: Seconds from now until the deadline
+            clock: Monotonic function returning the current time in seconds
+        """
+        self.seconds = seconds
+        self._clock = clock
+        self._expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        """Returns the seconds left until the deadline, never negative."""
+        return max(0.0, self._expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        """Returns True once the deadline has passed."""
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> float:
+        """
+        Checks that time is left for a stage.
+
+        Args:
+            stage: Stage name used in the error message (e.g., "api")
+
+        Returns:
+            Seconds left until the deadline
+
+        Raises:
+            DeadlineExceededError: If the deadline has passed
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                f"Run deadline of {self.seconds} seconds exceeded during {stage}"
+            )
+        return remaining
+
+    def timeout(self, timeout: Timeout, stage: str) -> Timeout:
+        """
+        Shortens a request timeout to the time left.
+
+        Args:
+            timeout: Timeout in seconds or (connect, read) tuple
+            stage: Stage name used in the error message
+
+        Returns:
+            Timeout of the same shape, no component exceeding the time left
+
+        Raises:
+            DeadlineExceededError: If the deadline has passed
+        """
+        remaining = self.check(stage)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return min(connect, remaining), min(read, remaining)
+        return min(timeout, remaining)
+
+    def read(self, response: Any, stage: str, chunk_size: int = 64 * 1024) -> bytes:
+        """
+        Reads a streamed response body, giving up once the deadline passes.
+
+        A read timeout only bounds each socket read, so a server trickling
+        bytes can stretch a request far beyond it; reading in chunks
+        bounds the overrun to a single (already shortened) read timeout.
+
+        Args:
+            response: Response opened with stream=True; it is closed afterwards
+            stage: Stage name used in the error message
+            chunk_size: Number of bytes read per iteration
+
+        Returns:
+            The complete body
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before the body is read
+            requests.exceptions.RequestException: If reading the body fails
+        """
+        chunks = []
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                self.check(stage)
+                chunks.append(chunk)
+        finally:
+            response.close()
+        return b"".join(chunks)
@@ -0,0 +1,176 @@
+"""Token cache module for Villages Event Scraper.
+
+This module persists extracted authentication tokens on disk so that
+repeated runs can skip downloading the main.js bundle while the cached
+token is still within its time-to-live. The HTTP validators of the
+bundle are stored alongside the token so that an expired entry can be
+revalidated with a conditional request.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+
+from .config import Config
+from .files import atomic_write
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCache:
+    """File-backed cache of authentication tokens keyed on the JavaScript URL."""
+
+    def __init__(self, cache_dir: str, ttl: int = Config.DEFAULT_TOKEN_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory in which cache files are stored
+            ttl: Number of seconds a cached token is considered fresh
+        """
+        self.cache_dir = os.path.join(os.path.expanduser(cache_dir), "tokens")
+        self.ttl = ttl
+
+    def _path(self, js_url: str) -> str:
+        """Returns the cache file path for a JavaScript URL."""
+        digest = hashlib.sha256(js_url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def load(self, js_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Loads the cache entry for a JavaScript URL regardless of its age.
+
+        Args:
+            js_url: URL of the JavaScript file the token was extracted from
+
+        Returns:
+            Cache entry dictionary, or None if missing or unreadable
+        """
+        try:
+            with open(self._path(js_url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable token cache entry for {js_url}: {e}")
+            return None
+
+        if not isinstance(entry, dict) or entry.get("js_url") != js_url or not entry.get("token"):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """
+        Checks whether a cache entry is still within its time-to-live.
+
+        Args:
+            entry: Cache entry returned by load()
+
+        Returns:
+            True if the entry was stored less than ttl seconds ago
+        """
+        try:
+            age = time.time() - float(entry.get("fetched_at", 0))
+        except (TypeError, ValueError):
+            return False
+        return 0 <= age < self.ttl
+
+    def get(self, js_url: str) -> Optional[str]:
+        """
+        Returns the cached token for a JavaScript URL if it is still fresh.
+
+        Args:
+            js_url: URL of the JavaScript file the token was extracted from
+
+        Returns:
+            Cached token, or None if missing or expired
+        """
+        entry = self.load(js_url)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return str(entry["token"])
+
+    def set(
+        self,
+        js_url: str,
+        token: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Stores a token for a JavaScript URL.
+
+        Write failures are logged and otherwise ignored, since the cache
+        is only an optimization.
+
+        Args:
+            js_url: URL of the JavaScript file the token was extracted from
+            token: Token in format "Basic <base64>"
+            etag: ETag header of the JavaScript response, if any
+            last_modified: Last-Modified header of the JavaScript response, if any
+        """
+        entry = {
+            "js_url": js_url,
+            "token": token,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        try:
+            atomic_write(self._path(js_url), json.dumps(entry))
+        except OSError as e:
+            logger.warning(f"Could not write token cache in {self.cache_dir}: {e}")
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Builds conditional request headers from a cache entry's validators.
+
+        Args:
+            entry: Cache entry returned by load()
+
+        Returns:
+            Dictionary with If-None-Match and/or If-Modified-Since headers
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def invalidate(self, js_url: str) -> None:
+        """
+        Removes the cached token for a JavaScript URL.
+
+        Args:
+            js_url: URL of the JavaScript file the token was extracted from
+        """
+        try:
+            os.remove(self._path(js_url))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove token cache entry for {js_url}: {e}")
@@ -24,47 +24,189 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import re
 import requests
+from typing import Any, Dict, Optional
+
 from src.exceptions import TokenFetchError
+from src.timing import Deadline, Timeout
+from src.token_cache import TokenCache
+
+
+# Pattern matches: dp_AUTH_TOKEN = "Basic <base64>" or dp_AUTH_TOKEN="Basic <base64>"
+TOKEN_PATTERN = re.compile(r'dp_AUTH_TOKEN\s*=\s*["\']Basic\s+([a-zA-Z0-9+/=]+)["\']')
+TOKEN_PATTERN_BYTES = re.compile(TOKEN_PATTERN.pattern.encode("ascii"))
+
+# Streaming extraction reads the bundle in chunks and keeps the tail of the
+# previous chunks so that a match split across chunk boundaries is still
+# found. The overlap must be longer than the longest expected match.
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_OVERLAP = 1024
+
+
+def _pattern_not_found() -> TokenFetchError:
+    """Builds the error raised when main.js holds no token."""
+    return TokenFetchError(
+        "Failed to extract dp_AUTH_TOKEN from JavaScript file. "
+        "Pattern not found in response."
+    )
+
+
+def extract_auth_token(js_content: str) -> str:
+    """
+    Extracts the dp_AUTH_TOKEN from JavaScript source.
+    
+    Args:
+        js_content: Contents of the JavaScript file
+        
+    Returns:
+        Extracted token in format "Basic <base64_string>"
+        
+    Raises:
+        TokenFetchError: If the token pattern is not found
+    """
+    match = TOKEN_PATTERN.search(js_content)
+    
+    if not match:
+        raise _pattern_not_found()
+    
+    # Reconstruct token in "Basic <base64>" format
+    base64_token = match.group(1)
+    return f"Basic {base64_token}"
+
 
+def extract_auth_token_streaming(
+    response: requests.Response,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    deadline: Optional[Deadline] = None
+) -> str:
+    """
+    Extracts the dp_AUTH_TOKEN from a streamed response, stopping at the first match.
+    
+    The response is closed as soon as the token is found, so the rest of
+    the bundle is never downloaded or decoded.
+    
+    Args:
+        response: Response opened with stream=True
+        chunk_size: Number of bytes read per iteration
+        deadline: Optional run deadline checked after every chunk
+        
+    Returns:
+        Extracted token in format "Basic <base64_string>"
+        
+    Raises:
+        TokenFetchError: If the token pattern is not found
+        DeadlineExceededError: If the deadline passes while reading
+        requests.exceptions.RequestException: If reading the body fails
+    """
+    window = b""
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if deadline is not None:
+                deadline.check("token")
+            if not chunk:
+                continue
+            window += chunk
+            match = TOKEN_PATTERN_BYTES.search(window)
+            if match:
+                return f"Basic {match.group(1).decode('ascii')}"
+            window = window[-STREAM_OVERLAP:]
+    finally:
+        response.close()
+    
+    raise _pattern_not_found()
 
-def fetch_auth_token(js_url: str, timeout: int = 10) -> str:
+
+def fetch_auth_token(
+    js_url: str,
+    timeout: Timeout = 10,
+    cache: Optional[TokenCache] = None,
+    force_refresh: bool = False,
+    stream: bool = False,
+    deadline: Optional[Deadline] = None,
+    session: Optional[requests.Session] = None
+) -> str:
     """
     Fetches main.js and extracts the dp_AUTH_TOKEN.
     
+    When a cache is given, a fresh cached token is returned without any
+    request. An expired entry is revalidated with If-None-Match and
+    If-Modified-Since, and its token is reused if the server answers
+    304 Not Modified.
+    
     Args:
         js_url: URL to the JavaScript file
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds, or (connect, read) tuple
+        cache: Optional token cache consulted before fetching and
+               updated after a successful extraction
+        force_refresh: Ignore and replace any cached token
+        stream: Read the bundle in chunks and stop as soon as the token
+                is found instead of downloading and decoding all of it
+        deadline: Optional run deadline; the timeout is shortened to the
+                  time left and the bundle is always streamed so that a
+                  slow download is abandoned at the deadline
+        session: Optional session whose pooled connections are reused;
+                 by default a one-off connection is opened
         
     Returns:
         Extracted token in format "Basic <base64_string>"
         
     Raises:
         TokenFetchError: If fetching or extraction fails
+        DeadlineExceededError: If the deadline passes before the token is read
     """
+    entry = None
+    headers = {}
+    if cache is not None:
+        if force_refresh:
+            cache.invalidate(js_url)
+        else:
+            entry = cache.load(js_url)
+            if entry is not None:
+                if cache.is_fresh(entry):
+                    return str(entry["token"])
+                headers = cache.conditional_headers(entry)
+    
+    if deadline is not None:
+        timeout = deadline.timeout(timeout, "token")
+        stream = True
+    
     try:
-        # Fetch the JavaScript file
-        response = requests.get(js_url, timeout=timeout)
+        # Fetch the JavaScript file, conditionally if validators are known
+        request_kwargs: Dict[str, Any] = {"timeout": timeout}
+        if headers:
+            request_kwargs["headers"] = headers
+        if stream:
+            request_kwargs["stream"] = True
+        get = session.get if session is not None else requests.get
+        response = get(js_url, **request_kwargs)
+        
+        if cache is not None and entry is not None and response.status_code == 304:
+            # Bundle unchanged, so the cached token is still current
+            response.close()
+            cache.set(
+                js_url,
+                entry["token"],
+                etag=response.headers.get("ETag") or entry.get("etag"),
+                last_modified=response.headers.get("Last-Modified") or entry.get("last_modified")
+            )
+            return str(entry["token"])
+        
         response.raise_for_status()
-        js_content = response.text
+        if stream:
+            auth_token = extract_auth_token_streaming(response, deadline=deadline)
+        else:
+            auth_token = extract_auth_token(response.text)
         
-    except requests.exceptions.Timeout:
-        raise TokenFetchError(f"Timeout while fetching JavaScript file from {js_url}")
+    except requests.exceptions.Timeout as e:
+        raise TokenFetchError(f"Timeout while fetching JavaScript file from {js_url}") from e
     except requests.exceptions.RequestException as e:
-        raise TokenFetchError(f"Failed to fetch JavaScript file from {js_url}: {e}")
+        raise TokenFetchError(f"Failed to fetch JavaScript file from {js_url}: {e}") from e
     
-    # Extract the dp_AUTH_TOKEN using regex
-    # Pattern matches: dp_AUTH_TOKEN = "Basic <base64>" or dp_AUTH_TOKEN="Basic <base64>"
-    pattern = r'dp_AUTH_TOKEN\s*=\s*["\']Basic\s+([a-zA-Z0-9+/=]+)["\']'
-    match = re.search(pattern, js_content)
-    
-    if not match:
-        raise TokenFetchError(
-            f"Failed to extract dp_AUTH_TOKEN from JavaScript file. "
-            f"Pattern not found in response."
+    if cache is not None:
+        cache.set(
+            js_url,
+            auth_token,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
         )
     
-    # Reconstruct token in "Basic <base64>" format
-    base64_token = match.group(1)
-    auth_token = f"Basic {base64_token}"
-    
     return auth_token
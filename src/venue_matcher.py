@@ -0,0 +1,104 @@
+"""Venue matcher module for Villages Event Scraper.
+
+This module finds which keyword of the venue mappings a venue name
+contains. All keywords are compiled once into an Aho-Corasick automaton,
+so a venue name is matched in a single pass over its characters however
+many mappings there are. When several keywords occur in a name, the one
+listed first in the mappings wins, as with a scan of the mappings in order.
+"""
+
+"""
+Copyright (C) 2025
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from collections import deque
+from typing import Any, Dict, List
+
+
+class VenueMatcher:
+    """Matches venue names against the keywords of a venue mapping."""
+
+    def __init__(self, venue_mappings: Dict[str, Any]):
+        """
+        Compile the keywords of a venue mapping.
+
+        Args:
+            venue_mappings: Dictionary mapping keywords to abbreviations, in
+                            priority order
+        """
+        self._abbreviations = list(venue_mappings.values())
+        no_match = len(self._abbreviations)
+
+        # Trie of the keywords; _first[node] is the priority of the first
+        # keyword ending at the node, or at any suffix of its path
+        self._goto: List[Dict[str, int]] = [{}]
+        self._first: List[int] = [no_match]
+        for priority, keyword in enumerate(venue_mappings):
+            node = 0
+            for char in keyword:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._first.append(no_match)
+                node = child
+            self._first[node] = min(self._first[node], priority)
+
+        # Failure links point to the node of the longest proper suffix of a
+        # node's path that is also in the trie; nodes are linked breadth-first
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._first[child] = min(self._first[child], self._first[self._fail[child]])
+
+    def abbreviate(self, venue: str) -> Any:
+        """
+        Abbreviates a venue name.
+
+        Args:
+            venue: Full venue name
+
+        Returns:
+            Abbreviation of the first keyword in mapping order that the
+            name contains, or the name itself if it contains none
+        """
+        goto = self._goto
+        fail = self._fail
+        first = self._first
+        node = 0
+        best = first[0]
+        for char in venue:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if first[node] < best:
+                best = first[node]
+                if not best:
+                    # No keyword takes precedence over the first one
+                    break
+
+        if best < len(self._abbreviations):
+            return self._abbreviations[best]
+        return venue
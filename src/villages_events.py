@@ -20,18 +20,32 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import os
 import sys
+import signal
+import threading
 import argparse
 import logging
 
 from .config import Config
 from .config_loader import ConfigLoader
 from .token_fetcher import fetch_auth_token
+from .pipeline import start_session
+from .timing import Deadline, StageTimer
+from .token_cache import TokenCache
+from .retry import RetryPolicy
+from .circuit_breaker import CircuitBreaker
+from .response_cache import ResponseCache
 from .session_manager import SessionManager
-from .api_client import fetch_events
+from .api_client import fetch_all_events, stream_all_events
+from .batch import Query, parse_query_spec, load_queries, run_batch
+from .query_planner import QueryPlanner
+from .daemon import EventDaemon
+from .http_server import EventServer
 from .event_processor import EventProcessor
 from .output_formatter import OutputFormatter
-from .exceptions import VillagesEventError
+from . import json_backend
+from .exceptions import CircuitOpenError, SessionError, TokenFetchError, VillagesEventError
 from .__version__ import __version__
 
 
@@ -106,6 +120,48 @@ def main() -> int:
         type=str,
         help='Comma-separated list of field names to include in output (e.g., "location.title,title,start.date")'
     )
+    parser.add_argument(
+        '--batch',
+        nargs='*',
+        metavar='QUERY',
+        help='Run several queries in one invocation, each given as '
+             'DATE_RANGE:CATEGORY:LOCATION[:OUTPUT_FILE]; without queries, '
+             'the "queries" section of the config file is used'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and refresh the batch queries (or the single query '
+             'given by the other options) on their intervals'
+    )
+    parser.add_argument(
+        '--serve',
+        nargs='?',
+        type=int,
+        const=-1,
+        metavar='PORT',
+        help='Run as a daemon and serve the events over HTTP at /events '
+             '(default port from config serve_port, else 8080)'
+    )
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        metavar='SECONDS',
+        help='Give up once the run has taken this many seconds, however the time '
+             'is spent (default from config deadline, else no deadline; ignored '
+             'in daemon mode)'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Print each event as soon as it is received instead of after the whole '
+             'response (default from config stream, else off; single queries only)'
+    )
+    parser.add_argument(
+        '--timings',
+        action='store_true',
+        help='Print the duration of each pipeline stage to stderr'
+    )
     parser.add_argument(
         '-p', '--preamble',
         type=str,
@@ -120,6 +176,8 @@ def main() -> int:
         # Return exit code 2 for invalid arguments, 0 for --help
         return 2 if e.code != 0 else 0
     
+    timer = StageTimer()
+    
     try:
         # Load venue mappings from config file or use defaults
         venue_mappings = ConfigLoader.get_default(
@@ -129,6 +187,107 @@ def main() -> int:
         # Get timeout from config file or use default
         timeout = ConfigLoader.get_default(yaml_config, 'timeout', Config.DEFAULT_TIMEOUT)
         
+        # Separate connect and read timeouts, each falling back to timeout
+        connect_timeout = ConfigLoader.get_default(
+            yaml_config, 'connect_timeout', Config.DEFAULT_CONNECT_TIMEOUT
+        )
+        read_timeout = ConfigLoader.get_default(
+            yaml_config, 'read_timeout', Config.DEFAULT_READ_TIMEOUT
+        )
+        if connect_timeout is not None or read_timeout is not None:
+            timeout = (
+                connect_timeout if connect_timeout is not None else timeout,
+                read_timeout if read_timeout is not None else timeout
+            )
+        
+        # The run deadline bounds the whole run, including retries and slow bodies
+        run_deadline = args.deadline
+        if run_deadline is None:
+            run_deadline = ConfigLoader.get_default(
+                yaml_config, 'deadline', Config.DEFAULT_DEADLINE
+            )
+        deadline = Deadline(run_deadline) if run_deadline else None
+        
+        # Token cache is only used when a cache directory is configured
+        cache_dir = ConfigLoader.get_default(yaml_config, 'cache_dir', Config.DEFAULT_CACHE_DIR)
+        token_cache = None
+        cookie_file = None
+        cookie_ttl = Config.DEFAULT_COOKIE_TTL
+        if cache_dir:
+            token_ttl = ConfigLoader.get_default(yaml_config, 'token_ttl', Config.DEFAULT_TOKEN_TTL)
+            token_cache = TokenCache(cache_dir, ttl=token_ttl)
+            cookie_file = os.path.join(os.path.expanduser(cache_dir), 'cookies.json')
+            cookie_ttl = ConfigLoader.get_default(
+                yaml_config, 'cookie_ttl', Config.DEFAULT_COOKIE_TTL
+            )
+        
+        # Response cache is additionally opt-in through a positive response_ttl
+        response_cache = None
+        response_ttl = ConfigLoader.get_default(
+            yaml_config, 'response_ttl', Config.DEFAULT_RESPONSE_TTL
+        )
+        if cache_dir and response_ttl > 0:
+            response_cache = ResponseCache(
+                cache_dir,
+                ttl=response_ttl,
+                stale_ttl=ConfigLoader.get_default(
+                    yaml_config, 'response_stale_ttl', Config.DEFAULT_RESPONSE_STALE_TTL
+                )
+            )
+        
+        # Transient failures are retried only when a retry section is configured
+        retry_policy = RetryPolicy.from_config(yaml_config)
+        
+        # The circuit state is shared between runs through the cache directory
+        circuit_breaker = None
+        failure_threshold = ConfigLoader.get_default(
+            yaml_config, 'circuit_failure_threshold', Config.DEFAULT_CIRCUIT_FAILURE_THRESHOLD
+        )
+        if failure_threshold > 0:
+            circuit_breaker = CircuitBreaker(
+                failure_threshold=failure_threshold,
+                cooldown=ConfigLoader.get_default(
+                    yaml_config, 'circuit_cooldown', Config.DEFAULT_CIRCUIT_COOLDOWN
+                ),
+                state_file=os.path.join(cache_dir, 'circuit.json') if cache_dir else None
+            )
+        
+        stream_token = ConfigLoader.get_default(
+            yaml_config, 'stream_token', Config.DEFAULT_STREAM_TOKEN
+        )
+        stream = args.stream or ConfigLoader.get_default(
+            yaml_config, 'stream', Config.DEFAULT_STREAM
+        )
+        compact_rows = ConfigLoader.get_default(
+            yaml_config, 'compact_rows', Config.DEFAULT_COMPACT_ROWS
+        )
+        
+        # Get pagination settings from config file or use defaults
+        page_size = ConfigLoader.get_default(yaml_config, 'page_size', Config.DEFAULT_PAGE_SIZE)
+        max_workers = ConfigLoader.get_default(
+            yaml_config, 'max_workers', Config.DEFAULT_MAX_WORKERS
+        )
+        batch_workers = ConfigLoader.get_default(
+            yaml_config, 'batch_workers', Config.DEFAULT_BATCH_WORKERS
+        )
+        
+        # Connection pool shared by the token fetch (optionally), the session
+        # warm-up and the API requests
+        pool_connections = ConfigLoader.get_default(
+            yaml_config, 'pool_connections', Config.DEFAULT_POOL_CONNECTIONS
+        )
+        pool_maxsize = ConfigLoader.get_default(
+            yaml_config, 'pool_maxsize', max(max_workers * batch_workers, 1)
+        )
+        keep_alive = ConfigLoader.get_default(yaml_config, 'keep_alive', Config.DEFAULT_KEEP_ALIVE)
+        token_session = ConfigLoader.get_default(
+            yaml_config, 'token_session', Config.DEFAULT_TOKEN_SESSION
+        )
+        
+        plan_queries = ConfigLoader.get_default(
+            yaml_config, 'plan_queries', Config.DEFAULT_PLAN_QUERIES
+        )
+        
         # Determine output fields with precedence: CLI > config file > defaults
         output_fields = Config.DEFAULT_OUTPUT_FIELDS
         
@@ -160,66 +319,310 @@ def main() -> int:
                     f"No valid fields specified, using defaults: {', '.join(Config.DEFAULT_OUTPUT_FIELDS)}"
                 )
         
+        # Resolve batch queries; command-line queries take precedence over the config file
+        # Serving over HTTP needs the daemon to keep the responses warm
+        daemon_mode = args.daemon or args.serve is not None
+        queries = None
+        if args.batch is not None or daemon_mode:
+            if args.raw:
+                logging.error("--raw cannot be combined with --batch, --daemon or --serve")
+                return 2
+            defaults = Query(
+                date_range=args.date_range,
+                category=args.category,
+                location=args.location,
+                format=args.format,
+                fields=output_fields,
+                preamble=args.preamble
+            )
+            try:
+                if args.batch:
+                    queries = [parse_query_spec(spec, defaults) for spec in args.batch]
+                else:
+                    queries = load_queries(yaml_config, defaults)
+            except ValueError as e:
+                logging.error(str(e))
+                return 2
+            if not queries and daemon_mode and args.batch is None:
+                # A daemon without batch queries keeps the single query warm
+                queries = [defaults]
+            if not queries:
+                logging.error("No queries given on the command line or in the config file")
+                return 2
+        
+        # Streaming applies to the formatted output of a single query; a
+        # streaming config setting is ignored in the other modes
+        if args.stream and (args.raw or queries is not None):
+            logging.error("--stream cannot be combined with --raw, --batch, --daemon or --serve")
+            return 2
+        stream = stream and not args.raw and queries is None
+        
         # Generate URLs with specified filters
-        calendar_url = Config.get_calendar_url(args.date_range, args.category, args.location)
+        if queries:
+            calendar_url = queries[0].calendar_url
+        else:
+            calendar_url = Config.get_calendar_url(args.date_range, args.category, args.location)
         api_url = Config.get_api_url(args.date_range, args.category, args.location)
         
-        # Step 1: Fetch authentication token
-        logging.debug("Fetching authentication token...")
-        auth_token = fetch_auth_token(Config.JS_URL, timeout=timeout)
+        planner = None
+        if plan_queries:
+            planner = QueryPlanner(
+                location_groups=ConfigLoader.get_default(
+                    yaml_config, 'location_groups', Config.LOCATION_GROUPS
+                )
+            )
         
-        # Step 2: Establish session with context manager for cleanup
-        with SessionManager() as session_manager:
-            logging.debug("Establishing session...")
-            session_manager.establish_session(calendar_url, timeout=timeout)
-            session = session_manager.get_session()
-            
-            # Step 3: Fetch events from API
-            logging.debug(
-                f"Fetching events from API (date range: {args.date_range}, "
-                f"category: {args.category}, location: {args.location})..."
+        # Daemon mode: refresh the queries until interrupted
+        if daemon_mode and queries:
+            daemon = EventDaemon(
+                queries,
+                venue_mappings,
+                default_fields=output_fields,
+                refresh_interval=ConfigLoader.get_default(
+                    yaml_config, 'refresh_interval', Config.DEFAULT_REFRESH_INTERVAL
+                ),
+                timeout=timeout,
+                page_size=page_size,
+                max_workers=max_workers,
+                batch_workers=batch_workers,
+                token_cache=token_cache,
+                cookie_file=cookie_file,
+                cookie_ttl=cookie_ttl,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                keep_alive=keep_alive,
+                token_session=token_session,
+                stream_token=stream_token,
+                response_cache=response_cache,
+                planner=planner,
+                retry_policy=retry_policy,
+                circuit_breaker=circuit_breaker,
+                compact_rows=compact_rows
             )
-            api_response = fetch_events(
-                session=session,
-                api_url=api_url,
-                auth_token=auth_token,
-                timeout=timeout
+            with daemon:
+                server = None
+                if args.serve is not None:
+                    serve_port = args.serve
+                    if serve_port < 0:
+                        serve_port = ConfigLoader.get_default(
+                            yaml_config, 'serve_port', Config.DEFAULT_SERVE_PORT
+                        )
+                    serve_host = ConfigLoader.get_default(
+                        yaml_config, 'serve_host', Config.DEFAULT_SERVE_HOST
+                    )
+                    server = EventServer((serve_host, serve_port), daemon)
+                    threading.Thread(
+                        target=server.serve_forever, name="event-server", daemon=True
+                    ).start()
+                    logging.info(f"Serving events on http://{serve_host}:{serve_port}/events")
+                signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+                try:
+                    daemon.run()
+                except KeyboardInterrupt:
+                    logging.debug("Interrupted, stopping daemon")
+                finally:
+                    if server is not None:
+                        server.shutdown()
+                        server.server_close()
+            return 0
+        
+        # A fresh cached response needs no token, session or API request;
+        # streamed responses are never cached
+        api_response = None
+        if response_cache is not None and not queries and not stream:
+            api_response = response_cache.get(api_url)
+            if api_response is not None:
+                logging.debug(f"Using cached response for {api_url}")
+        
+        # While the API circuit is open, fail without waiting on the token and
+        # session stages, falling back to a stale cached response
+        if api_response is None and circuit_breaker is not None and not queries:
+            try:
+                circuit_breaker.check()
+            except CircuitOpenError as e:
+                if response_cache is not None:
+                    api_response = response_cache.get_stale(api_url)
+                if api_response is None:
+                    raise
+                logging.warning(f"{e}; serving cached response")
+        
+        if api_response is None:
+            # Steps 1 and 2: Fetch authentication token and establish session
+            # concurrently, with context manager for cleanup
+            with SessionManager(
+                cookie_file=cookie_file,
+                cookie_ttl=cookie_ttl,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                keep_alive=keep_alive
+            ) as session_manager:
+                # Offline, the token and session stages fail before any API
+                # request; usable cached responses are served instead
+                session_error = None
+                try:
+                    auth_token, warmed_up = start_session(
+                        session_manager,
+                        calendar_url,
+                        js_url=Config.JS_URL,
+                        timeout=timeout,
+                        token_cache=token_cache,
+                        stream_token=stream_token,
+                        timer=timer,
+                        retry_policy=retry_policy,
+                        deadline=deadline,
+                        token_session=token_session
+                    )
+                except (TokenFetchError, SessionError) as e:
+                    if response_cache is None or stream:
+                        raise
+                    session_error = e
+                    auth_token, warmed_up = "", True
+                session = session_manager.get_session()
+                
+                # Cached credentials may have been rotated upstream; if the API
+                # rejects them, warm up a fresh session and refetch the token
+                refresh_token = None
+                if token_cache is not None or not warmed_up:
+                    def _refresh_credentials() -> str:
+                        logging.debug("Credentials rejected, refreshing session and token...")
+                        if not warmed_up:
+                            session_manager.invalidate_cookies()
+                            session_manager.establish_session(
+                                calendar_url, timeout=timeout, deadline=deadline
+                            )
+                        if token_cache is None:
+                            return auth_token
+                        return fetch_auth_token(
+                            Config.JS_URL,
+                            timeout=timeout,
+                            cache=token_cache,
+                            force_refresh=True,
+                            stream=stream_token,
+                            deadline=deadline,
+                            session=session if token_session else None
+                        )
+                    
+                    refresh_token = _refresh_credentials
+                
+                # Batch mode: fetch, format and write every query over this session
+                if queries:
+                    with timer.stage("batch"):
+                        results = run_batch(
+                            queries,
+                            session,
+                            auth_token,
+                            venue_mappings,
+                            default_fields=output_fields,
+                            timeout=timeout,
+                            page_size=page_size,
+                            max_workers=max_workers,
+                            batch_workers=batch_workers,
+                            refresh_token=refresh_token,
+                            planner=planner,
+                            response_cache=response_cache,
+                            retry_policy=retry_policy,
+                            circuit_breaker=circuit_breaker,
+                            deadline=deadline,
+                            unavailable=session_error
+                        )
+                    return 0 if all(result.error is None for result in results) else 1
+                
+                # Streaming: process, format and print each event as it arrives
+                if stream:
+                    processor = EventProcessor(
+                        venue_mappings, output_fields=output_fields, compact=compact_rows
+                    )
+                    events = stream_all_events(
+                        session=session,
+                        api_url=api_url,
+                        auth_token=auth_token,
+                        timeout=timeout,
+                        page_size=page_size,
+                        refresh_token=refresh_token,
+                        retry_policy=retry_policy,
+                        circuit_breaker=circuit_breaker,
+                        deadline=deadline,
+                        output_fields=output_fields
+                    )
+                    with timer.stage("stream"):
+                        OutputFormatter.write_events(
+                            sys.stdout,
+                            processor.iter_process_events(events),
+                            format_type=args.format,
+                            field_names=output_fields,
+                            preamble=args.preamble,
+                            flush=True
+                        )
+                    return 0
+                
+                # Step 3: Fetch events from API
+                logging.debug(
+                    f"Fetching events from API (date range: {args.date_range}, "
+                    f"category: {args.category}, location: {args.location})..."
+                )
+                
+                # Only the output fields are kept, unless the whole response is
+                # printed or cached for runs that may want other fields
+                projected_fields = None
+                if response_cache is None and not args.raw:
+                    projected_fields = output_fields
+                
+                def fetch_response():
+                    return fetch_all_events(
+                        session=session,
+                        api_url=api_url,
+                        auth_token=auth_token,
+                        timeout=timeout,
+                        page_size=page_size,
+                        max_workers=max_workers,
+                        refresh_token=refresh_token,
+                        retry_policy=retry_policy,
+                        circuit_breaker=circuit_breaker,
+                        deadline=deadline,
+                        output_fields=projected_fields
+                    )
+                
+                with timer.stage("api"):
+                    if session_error is not None:
+                        # Only kept when a response cache is configured
+                        stale = (
+                            response_cache.get_stale(api_url)
+                            if response_cache is not None else None
+                        )
+                        if stale is None:
+                            raise session_error
+                        logging.warning(f"{session_error}; serving cached response")
+                        api_response = stale
+                    elif response_cache is not None:
+                        api_response = response_cache.fetch(api_url, fetch_response)
+                    else:
+                        api_response = fetch_response()
+        
+        # If raw output requested, print API response and exit
+        if args.raw:
+            print(json_backend.dumps(api_response, indent=2))
+            return 0
+        
+        # Step 4: Validate the events of the response
+        logging.debug("Processing events...")
+        with timer.stage("process"):
+            processor = EventProcessor(
+                venue_mappings, output_fields=output_fields, compact=compact_rows
             )
-            
-            # If raw output requested, print API response and exit
-            if args.raw:
-                import json
-                print(json.dumps(api_response, indent=2))
-                return 0
-            
-            # Step 4: Process events
-            logging.debug("Processing events...")
-            processor = EventProcessor(venue_mappings, output_fields=output_fields)
-            processed_events = processor.process_events(api_response)
-            
-            # Step 5: Format output
-            logging.debug(f"Formatting output as {args.format}...")
-            formatted_output = OutputFormatter.format_events(
-                processed_events,
+            raw_events = processor.get_events(api_response)
+        
+        # Steps 5 and 6: Process, format and print the events one at a time,
+        # with preamble if provided, so no processed or formatted copy of
+        # all events is held in memory
+        logging.debug(f"Formatting output as {args.format}...")
+        with timer.stage("format"):
+            OutputFormatter.write_events(
+                sys.stdout,
+                processor.iter_process_events(raw_events),
                 format_type=args.format,
-                field_names=output_fields
+                field_names=output_fields,
+                preamble=args.preamble
             )
-            
-            # Step 6: Print formatted output to stdout
-            # Add preamble if provided
-            if args.preamble:
-                print(args.preamble, end='')
-                # Add separator based on format type
-                # Meshtastic uses # separator, other formats use newline
-                if args.format == 'meshtastic':
-                    # For meshtastic, add # separator if preamble doesn't end with it
-                    if not args.preamble.endswith('#'):
-                        print('#', end='')
-                else:
-                    # For other formats, add newline if preamble doesn't end with one
-                    if not args.preamble.endswith('\n'):
-                        print()
-            print(formatted_output, end='')
         
         # Success
         return 0
@@ -232,6 +635,10 @@ def main() -> int:
         # Handle unexpected errors
         logging.error(f"Unexpected error: {e}")
         return 1
+    finally:
+        logging.debug(f"Stage timings:\n{timer.format_report()}")
+        if args.timings:
+            print(timer.format_report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,11 @@
+"""Shared helpers for the test suite."""
+
+
+def make_api_response(title):
+    """Returns an API response holding one event at Brownwood Paddock Square."""
+    return {"events": [{
+        "title": title,
+        "category": "entertainment",
+        "location": {"title": "Brownwood Paddock Square", "category": "town-squares"},
+        "start": {"date": "2025-11-12T23:00:00.000Z"},
+    }]}
@@ -0,0 +1,439 @@
+"""Unit tests for api_client module."""
+
+import json
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+from urllib.parse import urlparse, parse_qs
+
+from src import api_client
+from src.api_client import (
+    SingleFlight, fetch_events, fetch_all_events, get_page_url, normalize_api_url,
+    stream_events, stream_all_events
+)
+from src.config import Config
+from src.exceptions import APIError, AuthenticationError
+from src.timing import Deadline
+
+
+def _row_window(url):
+    """Returns the (startRow, endRow) window requested by an API URL."""
+    query = parse_qs(urlparse(url).query)
+    return int(query["startRow"][0]), int(query["endRow"][0])
+
+
+def _chunks(content, size):
+    """Splits a response body into chunks as iter_content would."""
+    return iter([content[i:i + size] for i in range(0, len(content), size)])
+
+
+def _paged_session(total, page_size=25):
+    """Builds a mock session serving `total` numbered events in windows."""
+    def get(url, headers=None, timeout=None, stream=False):
+        start_row, end_row = _row_window(url)
+        end_row = min(end_row, start_row + page_size - 1, total - 1)
+        response = Mock()
+        response.status_code = 200
+        response.content = json.dumps({
+            "events": [{"id": row} for row in range(start_row, end_row + 1)],
+            "count": total,
+        }).encode()
+        response.iter_content.side_effect = lambda chunk_size: _chunks(response.content, 7)
+        return response
+
+    session = Mock()
+    session.get.side_effect = get
+    return session
+
+
+class TestFetchEvents(unittest.TestCase):
+    """Test cases for single-window event fetching."""
+
+    def test_fetch_events_success(self):
+        """Test that a successful response is returned as a dictionary."""
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+        session.get.return_value.content = json.dumps({"events": [], "count": 0}).encode()
+
+        data = fetch_events(session, Config.get_api_url(), "Basic abc")
+
+        self.assertEqual(data, {"events": [], "count": 0})
+        headers = session.get.call_args[1]["headers"]
+        self.assertEqual(headers["Authorization"], "Basic abc")
+
+    def test_fetch_events_with_deadline(self):
+        """Test that a deadline shortens the timeout and streams the body."""
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+        session.get.return_value.iter_content.return_value = [b'{"events": [', b'], "count": 0}']
+        deadline = Deadline(3)
+
+        data = fetch_events(
+            session, Config.get_api_url(), "Basic abc", timeout=(2, 10), deadline=deadline
+        )
+
+        self.assertEqual(data, {"events": [], "count": 0})
+        connect_timeout, read_timeout = session.get.call_args[1]["timeout"]
+        self.assertEqual(connect_timeout, 2)
+        self.assertLessEqual(read_timeout, 3)
+        self.assertTrue(session.get.call_args[1]["stream"])
+
+    def test_rejected_streamed_response_is_closed(self):
+        """Test that a 401 answer read under a deadline is closed before the retry."""
+        session = Mock()
+        rejected = Mock(status_code=401, text="Unauthorized")
+        accepted = Mock(status_code=200)
+        accepted.iter_content.return_value = [b'{"events": [], "count": 0}']
+        session.get.side_effect = [rejected, accepted]
+
+        data = fetch_events(
+            session, Config.get_api_url(), "Basic old",
+            refresh_token=Mock(return_value="Basic new"), deadline=Deadline(3)
+        )
+
+        self.assertEqual(data, {"events": [], "count": 0})
+        rejected.close.assert_called_once_with()
+
+    def test_fetch_events_error_status(self):
+        """Test that a non-200 status raises APIError."""
+        session = Mock()
+        session.get.return_value = Mock(status_code=500, text="Internal Server Error")
+
+        with self.assertRaises(APIError) as context:
+            fetch_events(session, Config.get_api_url(), "Basic abc")
+
+        self.assertIn("500", str(context.exception))
+
+    def test_fetch_events_unauthorized(self):
+        """Test that 401/403 answers raise AuthenticationError."""
+        session = Mock()
+        session.get.return_value = Mock(status_code=401, text="Unauthorized")
+
+        with self.assertRaises(AuthenticationError):
+            fetch_events(session, Config.get_api_url(), "Basic abc")
+
+    def test_fetch_events_refreshes_rejected_token(self):
+        """Test that a rejected token is refreshed and the request retried once."""
+        ok_response = Mock(status_code=200)
+        ok_response.content = json.dumps({"events": []}).encode()
+        session = Mock()
+        session.get.side_effect = [Mock(status_code=403, text="Forbidden"), ok_response]
+        refresh_token = Mock(return_value="Basic new")
+
+        data = fetch_events(
+            session, Config.get_api_url(), "Basic old", refresh_token=refresh_token
+        )
+
+        self.assertEqual(data, {"events": []})
+        refresh_token.assert_called_once_with()
+        self.assertEqual(session.get.call_args[1]["headers"]["Authorization"], "Basic new")
+
+
+class TestPagination(unittest.TestCase):
+    """Test cases for paginated event fetching."""
+
+    def test_get_page_url_rewrites_window(self):
+        """Test that the row window is replaced and other filters are kept."""
+        url = get_page_url(Config.get_api_url("this-month", "all"), 50, 74)
+
+        self.assertEqual(_row_window(url), (50, 74))
+        self.assertIn("dateRange=this-month", url)
+        self.assertEqual(url.count("startRow="), 1)
+
+    def test_get_page_url_adds_missing_window(self):
+        """Test that a window is appended to URLs without one."""
+        url = get_page_url("https://example.com/events/?dateRange=today", 0, 24)
+
+        self.assertEqual(_row_window(url), (0, 24))
+
+    def test_normalize_api_url_ignores_window_and_order(self):
+        """Test that URLs for the same query normalize to the same key."""
+        url = Config.get_api_url("today", "all", "Brownwood+Paddock+Square")
+        reordered = (
+            "HTTPS://API.V2.THEVILLAGES.COM/events/?subcategoriesQueryType=and"
+            "&locationCategories=Brownwood+Paddock+Square&startRow=25&endRow=49"
+            "&dateRange=today&cancelled=false"
+        )
+
+        self.assertEqual(normalize_api_url(url), normalize_api_url(reordered))
+        self.assertNotIn("startRow", normalize_api_url(url))
+        self.assertNotEqual(
+            normalize_api_url(url), normalize_api_url(Config.get_api_url("tomorrow", "all"))
+        )
+
+    def test_single_page_makes_one_request(self):
+        """Test that no further windows are requested when all rows fit."""
+        session = _paged_session(total=10)
+
+        data = fetch_all_events(session, Config.get_api_url(), "Basic abc")
+
+        self.assertEqual(len(data["events"]), 10)
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_missing_count_returns_first_page(self):
+        """Test that responses without a count are returned unchanged."""
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+        session.get.return_value.content = json.dumps({"events": [{"id": 1}]}).encode()
+
+        data = fetch_all_events(session, Config.get_api_url(), "Basic abc")
+
+        self.assertEqual(data, {"events": [{"id": 1}]})
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_fetches_all_windows_in_order(self):
+        """Test that every window is fetched and merged in row order."""
+        session = _paged_session(total=60)
+
+        data = fetch_all_events(session, Config.get_api_url(), "Basic abc", max_workers=3)
+
+        self.assertEqual([event["id"] for event in data["events"]], list(range(60)))
+        self.assertEqual(session.get.call_count, 3)
+
+    def test_follows_server_window_cap(self):
+        """Test that a smaller server-side window does not drop rows."""
+        session = _paged_session(total=30, page_size=10)
+
+        data = fetch_all_events(session, Config.get_api_url(), "Basic abc", page_size=25)
+
+        self.assertEqual([event["id"] for event in data["events"]], list(range(30)))
+
+    def test_refreshed_token_used_for_later_windows(self):
+        """Test that a token refreshed on the first window is reused afterwards."""
+        session = _paged_session(total=60)
+        paged_get = session.get.side_effect
+
+        def get(url, headers=None, timeout=None):
+            if headers["Authorization"] != "Basic new":
+                return Mock(status_code=401, text="Unauthorized")
+            return paged_get(url, headers=headers, timeout=timeout)
+
+        session.get.side_effect = get
+        refresh_token = Mock(return_value="Basic new")
+
+        data = fetch_all_events(
+            session, Config.get_api_url(), "Basic old", refresh_token=refresh_token
+        )
+
+        self.assertEqual(len(data["events"]), 60)
+        refresh_token.assert_called_once_with()
+
+    def test_output_fields_prune_every_window(self):
+        """Test that only the requested members of each event are kept."""
+        session = _paged_session(total=60)
+
+        data = fetch_all_events(
+            session, Config.get_api_url(), "Basic abc", output_fields=["title"], coalesce=False
+        )
+
+        self.assertEqual(len(data["events"]), 60)
+        self.assertTrue(all(event == {} for event in data["events"]))
+        self.assertEqual(data["count"], 60)
+
+    def test_failed_window_raises_api_error(self):
+        """Test that a failing window surfaces as APIError."""
+        session = _paged_session(total=60)
+        paged_get = session.get.side_effect
+
+        def get(url, headers=None, timeout=None):
+            if _row_window(url)[0] == 25:
+                return Mock(status_code=503, text="Service Unavailable")
+            return paged_get(url, headers=headers, timeout=timeout)
+
+        session.get.side_effect = get
+
+        with self.assertRaises(APIError):
+            fetch_all_events(session, Config.get_api_url(), "Basic abc")
+
+
+class TestStreamEvents(unittest.TestCase):
+    """Test cases for the streaming API functions."""
+
+    def _session(self, content, status_code=200):
+        """Builds a mock session answering with the given body in chunks."""
+        session = Mock()
+        session.get.return_value = Mock(status_code=status_code, text="error")
+        session.get.return_value.iter_content.return_value = _chunks(content, 5)
+        return session
+
+    def test_yields_events_before_response_completes(self):
+        """Test that events are yielded while the body is still being read."""
+        consumed = []
+
+        def iter_content(chunk_size):
+            for chunk in [b'{"events": [{"id": 1}, ', b'{"id": 2}', b'], "count": 2}']:
+                consumed.append(chunk)
+                yield chunk
+
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+        session.get.return_value.iter_content.side_effect = iter_content
+
+        events = stream_events(session, Config.get_api_url(), "Basic abc")
+
+        self.assertEqual(next(events), {"id": 1})
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(list(events), [{"id": 2}])
+        self.assertEqual(session.get.call_args[1]["stream"], True)
+        session.get.return_value.close.assert_called_once_with()
+
+    def test_collects_other_fields(self):
+        """Test that top-level members are stored in the fields dictionary."""
+        session = self._session(b'{"events": [{"id": 1}], "count": 1}')
+        fields = {}
+
+        events = list(stream_events(session, Config.get_api_url(), "Basic abc", fields=fields))
+
+        self.assertEqual(events, [{"id": 1}])
+        self.assertEqual(fields, {"count": 1})
+
+    def test_invalid_json_raises_api_error(self):
+        """Test that a malformed body raises APIError."""
+        session = self._session(b'<html>Invalid JSON</html>')
+
+        with self.assertRaises(APIError):
+            list(stream_events(session, Config.get_api_url(), "Basic abc"))
+
+    def test_missing_events_raises_api_error(self):
+        """Test that a response without an events array raises APIError."""
+        session = self._session(b'{"count": 0}')
+
+        with self.assertRaises(APIError):
+            list(stream_events(session, Config.get_api_url(), "Basic abc"))
+
+    def test_rejected_token_is_refreshed(self):
+        """Test that a 401 answer is retried once with a refreshed token."""
+        session = self._session(b'{"events": []}')
+        rejected = Mock(status_code=401, text="Unauthorized")
+        session.get.side_effect = [rejected, session.get.return_value]
+        refresh_token = Mock(return_value="Basic new")
+
+        events = list(stream_events(
+            session, Config.get_api_url(), "Basic old", refresh_token=refresh_token
+        ))
+
+        self.assertEqual(events, [])
+        self.assertEqual(session.get.call_args[1]["headers"]["Authorization"], "Basic new")
+        rejected.close.assert_called_once_with()
+
+    def test_stream_all_events_follows_windows(self):
+        """Test that every window is streamed in row order."""
+        session = _paged_session(total=60, page_size=20)
+
+        events = list(stream_all_events(session, Config.get_api_url(), "Basic abc"))
+
+        self.assertEqual([event["id"] for event in events], list(range(60)))
+        self.assertEqual(session.get.call_count, 3)
+
+    def test_stream_all_events_matches_fetch_all_events(self):
+        """Test that streaming yields the same events as fetch_all_events."""
+        url = Config.get_api_url()
+
+        fetched = fetch_all_events(_paged_session(total=30), url, "Basic abc", coalesce=False)
+        streamed = list(stream_all_events(_paged_session(total=30), url, "Basic abc"))
+
+        self.assertEqual(streamed, fetched["events"])
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for coalescing concurrent identical requests."""
+
+    def _run_concurrently(self, flight, key, request, callers=3):
+        """Starts a leader request, then waits for the other callers to join it."""
+        results = []
+        errors = []
+
+        def call():
+            try:
+                results.append(request())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        threads[0].start()
+        self.assertTrue(self.started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while flight._calls[key].followers < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def setUp(self):
+        """Create events gating the leader's call."""
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _blocking(self, outcome):
+        def func():
+            self.started.set()
+            self.release.wait(5)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return Mock(side_effect=func)
+
+    def test_concurrent_callers_share_result(self):
+        """Test that concurrent callers share one execution and its result."""
+        flight = SingleFlight()
+        result = {"events": []}
+        func = self._blocking(result)
+
+        results, errors = self._run_concurrently(flight, "key", lambda: flight.do("key", func))
+
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(errors, [])
+        self.assertTrue(all(r is result for r in results))
+        self.assertEqual(len(results), 3)
+
+    def test_concurrent_callers_share_error(self):
+        """Test that every waiting caller receives the leader's exception."""
+        flight = SingleFlight()
+        func = self._blocking(APIError("down"))
+
+        results, errors = self._run_concurrently(flight, "key", lambda: flight.do("key", func))
+
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 3)
+
+    def test_sequential_calls_run_again(self):
+        """Test that a finished call is not reused by later callers."""
+        flight = SingleFlight()
+        func = Mock(return_value=1)
+
+        flight.do("key", func)
+        flight.do("key", func)
+
+        self.assertEqual(func.call_count, 2)
+
+    def test_fetch_all_events_coalesces_same_query(self):
+        """Test that concurrent fetches of one query make one set of requests."""
+        session = _paged_session(total=10)
+        paged_get = session.get.side_effect
+
+        def get(url, headers=None, timeout=None):
+            self.started.set()
+            self.release.wait(5)
+            return paged_get(url, headers=headers, timeout=timeout)
+
+        session.get.side_effect = get
+        url = Config.get_api_url("today", "all", "all")
+
+        results, errors = self._run_concurrently(
+            api_client._EVENTS_FLIGHT,
+            normalize_api_url(url),
+            lambda: fetch_all_events(session, url, "Basic abc")
+        )
+
+        self.assertEqual(errors, [])
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(len(results), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
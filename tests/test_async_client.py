@@ -0,0 +1,147 @@
+"""Unit tests for async_client module."""
+
+import unittest
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from src import async_client
+except ImportError:
+    async_client = None
+
+from src.exceptions import APIError, AuthenticationError, SessionError, TokenFetchError
+from src.retry import is_transient
+
+
+@unittest.skipIf(async_client is None, "aiohttp is not installed")
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the asyncio client stack against a local server."""
+
+    async def asyncSetUp(self):
+        """Start a local server imitating the CDN, calendar page and API."""
+        self.total_events = 60
+        self.api_status = 200
+        self.api_calls = []
+
+        async def main_js(request):
+            return web.Response(text='var x; dp_AUTH_TOKEN = "Basic dGVzdA==";')
+
+        async def calendar(request):
+            response = web.Response(text="<html></html>")
+            response.set_cookie("sid", "abc123")
+            return response
+
+        async def events(request):
+            self.api_calls.append(request)
+            if self.api_status != 200:
+                return web.Response(status=self.api_status, text="error")
+            start_row = int(request.query["startRow"])
+            end_row = min(int(request.query["endRow"]), self.total_events - 1)
+            return web.json_response({
+                "events": [{"id": row} for row in range(start_row, end_row + 1)],
+                "count": self.total_events,
+            })
+
+        app = web.Application()
+        app.router.add_get("/main.js", main_js)
+        app.router.add_get("/calendar", calendar)
+        app.router.add_get("/events/", events)
+        self.server = TestServer(app, host="localhost")
+        await self.server.start_server()
+        self.session_manager = async_client.AsyncSessionManager()
+
+    async def asyncTearDown(self):
+        """Close the session and stop the server."""
+        await self.session_manager.close()
+        await self.server.close()
+
+    def _url(self, path):
+        return str(self.server.make_url(path))
+
+    async def test_fetch_auth_token(self):
+        """Test token extraction from the JavaScript bundle."""
+        token = await async_client.fetch_auth_token(
+            self.session_manager.get_session(), self._url("/main.js")
+        )
+        self.assertEqual(token, "Basic dGVzdA==")
+
+    async def test_fetch_auth_token_failure(self):
+        """Test that HTTP errors raise TokenFetchError chained to the aiohttp error."""
+        with self.assertRaises(TokenFetchError) as cm:
+            await async_client.fetch_auth_token(
+                self.session_manager.get_session(), self._url("/missing.js")
+            )
+
+        self.assertIsInstance(cm.exception.__cause__, async_client.aiohttp.ClientError)
+
+    async def test_start_session_captures_cookies(self):
+        """Test concurrent token fetch and session establishment."""
+        token = await async_client.start_session(
+            self.session_manager, self._url("/calendar"), js_url=self._url("/main.js")
+        )
+
+        session = self.session_manager.get_session()
+        self.assertEqual(token, "Basic dGVzdA==")
+        self.assertEqual(session.headers["Referer"], self._url("/calendar"))
+        self.assertIn("sid", {cookie.key for cookie in session.cookie_jar})
+
+    async def test_establish_session_failure(self):
+        """Test that HTTP errors raise SessionError."""
+        with self.assertRaises(SessionError):
+            await self.session_manager.establish_session(self._url("/missing"))
+
+    async def test_fetch_all_events_paginates(self):
+        """Test that every window is fetched and merged in order."""
+        data = await async_client.fetch_all_events(
+            self.session_manager.get_session(), self._url("/events/?cancelled=false"), "Basic abc"
+        )
+
+        self.assertEqual([event["id"] for event in data["events"]], list(range(60)))
+        self.assertEqual(len(self.api_calls), 3)
+        self.assertEqual(self.api_calls[0].headers["Authorization"], "Basic abc")
+
+    async def test_fetch_events_error_status(self):
+        """Test that a non-200 status raises a retryable APIError carrying the status."""
+        self.api_status = 500
+
+        with self.assertRaises(APIError) as cm:
+            await async_client.fetch_events(
+                self.session_manager.get_session(), self._url("/events/?startRow=0"), "Basic abc"
+            )
+
+        self.assertEqual(cm.exception.status_code, 500)
+        self.assertTrue(is_transient(cm.exception))
+
+    async def test_fetch_events_unauthorized(self):
+        """Test that 401 raises AuthenticationError without a refresh callback."""
+        self.api_status = 401
+
+        with self.assertRaises(AuthenticationError) as cm:
+            await async_client.fetch_events(
+                self.session_manager.get_session(), self._url("/events/?startRow=0"), "Basic abc"
+            )
+
+        self.assertEqual(cm.exception.status_code, 401)
+
+    async def test_fetch_many_runs_queries(self):
+        """Test that several queries share one session."""
+        self.total_events = 5
+        urls = [self._url("/events/?dateRange=today"), self._url("/events/?dateRange=tomorrow")]
+
+        results = await async_client.fetch_many(
+            self.session_manager.get_session(), urls, "Basic abc"
+        )
+
+        self.assertEqual([url for url, _ in results], urls)
+        self.assertEqual(len(results[1][1]["events"]), 5)
+
+    async def test_closed_session_raises(self):
+        """Test that a closed manager refuses further use."""
+        await self.session_manager.close()
+
+        with self.assertRaises(SessionError):
+            self.session_manager.get_session()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+"""Unit tests for batch module."""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from io import StringIO
+from unittest.mock import patch, Mock
+
+from src.batch import Query, parse_query_spec, load_queries, write_output, run_batch
+from src.exceptions import APIError
+from src.villages_events import main
+from tests.conftest import make_api_response
+
+
+VENUE_MAPPINGS = {"Brownwood": "Brownwood", "Sawgrass": "Sawgrass"}
+
+
+class TestQueryParsing(unittest.TestCase):
+    """Test cases for query specifications."""
+
+    def test_parse_full_spec(self):
+        """Test parsing all parts of a specification."""
+        query = parse_query_spec("this-week:sports:Brownwood+Paddock+Square:out.txt")
+
+        self.assertEqual(query.date_range, "this-week")
+        self.assertEqual(query.category, "sports")
+        self.assertEqual(query.location, "Brownwood+Paddock+Square")
+        self.assertEqual(query.output, "out.txt")
+
+    def test_empty_parts_use_defaults(self):
+        """Test that empty parts fall back to the defaults."""
+        defaults = Query(category="recreation", format="csv")
+
+        query = parse_query_spec("tomorrow::all", defaults)
+
+        self.assertEqual(query.category, "recreation")
+        self.assertEqual(query.format, "csv")
+        self.assertIsNone(query.output)
+
+    def test_malformed_spec_raises(self):
+        """Test that a specification without three parts is rejected."""
+        with self.assertRaises(ValueError):
+            parse_query_spec("today:sports")
+
+    def test_invalid_value_raises(self):
+        """Test that an unknown filter value is rejected."""
+        with self.assertRaises(ValueError) as context:
+            parse_query_spec("yesterday:sports:all")
+
+        self.assertIn("date range", str(context.exception))
+
+    def test_load_queries_from_config(self):
+        """Test loading the queries section with defaults and comma-separated fields."""
+        config = {"queries": [
+            {"date_range": "this-week", "output": "week.txt"},
+            {"category": "sports", "format": "json", "fields": "title, start.date"},
+        ]}
+
+        queries = load_queries(config, Query(location="all"))
+
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(queries[0].date_range, "this-week")
+        self.assertEqual(queries[0].location, "all")
+        self.assertEqual(queries[1].fields, ["title", "start.date"])
+
+    def test_load_queries_skips_invalid_entries(self):
+        """Test that invalid entries are skipped instead of failing the batch."""
+        config = {"queries": [{"category": "knitting"}, "today", {"date_range": "today"}]}
+
+        queries = load_queries(config)
+
+        self.assertEqual([q.date_range for q in queries], ["today"])
+
+
+class TestWriteOutput(unittest.TestCase):
+    """Test cases for writing query output."""
+
+    def test_write_to_file(self):
+        """Test that output is written to the target file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "nested", "out.txt")
+
+            write_output("Brownwood,Jazz#", target)
+
+            with open(target, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Brownwood,Jazz#")
+            self.assertEqual(os.listdir(os.path.dirname(target)), ["out.txt"])
+
+    def test_write_to_stream_adds_newline(self):
+        """Test that stream output is newline-terminated between queries."""
+        stream = StringIO()
+
+        write_output("Brownwood,Jazz#", None, stream=stream)
+        write_output("a,b\n", "-", stream=stream)
+
+        self.assertEqual(stream.getvalue(), "Brownwood,Jazz#\na,b\n")
+
+
+class TestRunBatch(unittest.TestCase):
+    """Test cases for running a batch of queries."""
+
+    def test_queries_share_session_and_run_concurrently(self):
+        """Test that queries are fetched concurrently with one session and token."""
+        barrier = threading.Barrier(2, timeout=5)
+        session = Mock()
+
+        def fetch(fetch_session, api_url, auth_token, **kwargs):
+            self.assertIs(fetch_session, session)
+            self.assertEqual(auth_token, "Basic abc")
+            barrier.wait()
+            return make_api_response("today" if "dateRange=today" in api_url else "tomorrow")
+
+        queries = [Query(date_range="today"), Query(date_range="tomorrow", format="plain")]
+        stream = StringIO()
+
+        with patch('src.batch.fetch_all_events', side_effect=fetch):
+            results = run_batch(queries, session, "Basic abc", VENUE_MAPPINGS, stream=stream)
+
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(
+            stream.getvalue(),
+            "Brownwood,today#\nlocation.title: Brownwood, title: tomorrow\n"
+        )
+
+    def test_failed_query_does_not_stop_others(self):
+        """Test that one failing query is reported while others are written."""
+        def fetch(session, api_url, auth_token, **kwargs):
+            if "categories=sports" in api_url:
+                raise APIError("boom")
+            return make_api_response("ok")
+
+        queries = [Query(category="sports"), Query(category="entertainment")]
+        stream = StringIO()
+
+        with patch('src.batch.fetch_all_events', side_effect=fetch):
+            results = run_batch(queries, Mock(), "Basic abc", VENUE_MAPPINGS, stream=stream)
+
+        self.assertIsInstance(results[0].error, APIError)
+        self.assertIsNone(results[1].error)
+        self.assertEqual(stream.getvalue(), "Brownwood,ok#\n")
+
+
+class TestBatchCommandLine(unittest.TestCase):
+    """Integration tests for the --batch option."""
+
+    @patch('src.api_client.requests.Session.get')
+    @patch('src.session_manager.requests.Session.get')
+    @patch('src.token_fetcher.requests.get')
+    def test_batch_fetches_token_once(self, mock_token_get, mock_session_get, mock_api_get):
+        """Test that a batch reuses one token and writes each query's output."""
+        mock_token_response = Mock()
+        mock_token_response.text = 'dp_AUTH_TOKEN = "Basic dGVzdHRva2VuMTIzNDU2";'
+        mock_token_response.raise_for_status = Mock()
+        mock_token_get.return_value = mock_token_response
+
+        mock_api_response = Mock()
+        mock_api_response.status_code = 200
+        mock_api_response.content = json.dumps(make_api_response("Jazz Band")).encode()
+        mock_api_get.return_value = mock_api_response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "week.csv")
+            argv = [
+                'villages_events.py', '--batch',
+                'today:entertainment:town-squares',
+                f'this-week:sports:all:{target}',
+            ]
+            captured_output = StringIO()
+            with patch('sys.argv', argv):
+                sys.stdout = captured_output
+                try:
+                    exit_code = main()
+                finally:
+                    sys.stdout = sys.__stdout__
+
+            with open(target, "r", encoding="utf-8") as f:
+                file_output = f.read()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(mock_token_get.call_count, 1)
+        self.assertEqual(captured_output.getvalue(), "Brownwood,Jazz Band#\n")
+        self.assertEqual(file_output, "Brownwood,Jazz Band#")
+
+    @patch('sys.argv', ['villages_events.py', '--batch', 'today:sports'])
+    def test_invalid_batch_query_exit_code(self):
+        """Test that a malformed query returns exit code 2."""
+        self.assertEqual(main(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Unit tests for circuit_breaker module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from src.api_client import fetch_events
+from src.circuit_breaker import CircuitBreaker
+from src.exceptions import APIError, CircuitOpenError
+from src.response_cache import ResponseCache
+
+
+def _unavailable():
+    return APIError("unavailable", status_code=503)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for opening, fast-failing and probing."""
+
+    def setUp(self):
+        """Create a breaker with a controllable clock."""
+        self.now = 1000.0
+        self.breaker = CircuitBreaker(failure_threshold=2, cooldown=30, clock=lambda: self.now)
+
+    def _fail(self, breaker=None):
+        with self.assertRaises(APIError):
+            (breaker or self.breaker).call(Mock(side_effect=_unavailable()))
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the threshold opens the circuit and requests then fail fast."""
+        self._fail()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self._fail()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        func = Mock(return_value="ok")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(func)
+        func.assert_not_called()
+
+    def test_success_resets_failure_count(self):
+        """Test that only consecutive failures count."""
+        self._fail()
+        self.breaker.call(Mock(return_value="ok"))
+        self._fail()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_permanent_errors_do_not_count(self):
+        """Test that answered requests such as 404s keep the circuit closed."""
+        for _ in range(3):
+            with self.assertRaises(APIError):
+                self.breaker.call(Mock(side_effect=APIError("missing", status_code=404)))
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_allows_single_probe(self):
+        """Test that only one probe is sent after the cool-down and closes the circuit."""
+        self._fail()
+        self._fail()
+        self.now += 30
+
+        def probe():
+            # A concurrent request is rejected while the probe is in flight
+            with self.assertRaises(CircuitOpenError):
+                self.breaker.check()
+            return "ok"
+
+        self.assertEqual(self.breaker.call(probe), "ok")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe restarts the cool-down."""
+        self._fail()
+        self._fail()
+        self.now += 30
+        self._fail()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.now += 29
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.check()
+
+    def test_state_shared_through_file(self):
+        """Test that breakers using the same state file share the circuit."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "circuit.json")
+            first = CircuitBreaker(2, 30, state_file=state_file, clock=lambda: self.now)
+            second = CircuitBreaker(2, 30, state_file=state_file, clock=lambda: self.now)
+
+            self._fail(first)
+            self._fail(second)
+
+            self.assertEqual(first.state, CircuitBreaker.OPEN)
+            with self.assertRaises(CircuitOpenError):
+                second.check()
+
+
+class TestCircuitFallback(unittest.TestCase):
+    """Test cases for serving cached responses while the circuit is open."""
+
+    def test_open_circuit_serves_stale_response_without_request(self):
+        """Test that the response cache falls back when the request fails fast."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+        breaker.record_failure()
+        session = Mock()
+        api_url = "https://api.v2.thevillages.com/events/?dateRange=today"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ResponseCache(temp_dir, ttl=1, stale_ttl=3600)
+            cache.set(api_url, {"events": ["cached"]})
+            cache.ttl = 0
+
+            response = cache.fetch(
+                api_url,
+                lambda: fetch_events(session, api_url, "Basic abc", circuit_breaker=breaker)
+            )
+
+        self.assertEqual(response, {"events": ["cached"]})
+        session.get.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Unit tests for columnar module."""
+
+import datetime
+import unittest
+
+try:
+    import numpy as np
+    from src.columnar import EventBatch, column, date_column
+except ImportError:
+    np = None
+
+from src.event_processor import EventProcessor
+
+
+FIELDS = ["location.title", "title", "start.date", "cancelled", "allDay"]
+
+
+def _event(venue, title, start, cancelled=False):
+    return {
+        "location": {"title": venue},
+        "title": title,
+        "start": {"date": start},
+        "cancelled": cancelled,
+        "allDay": False,
+        "description": "dropped",
+    }
+
+
+API_RESPONSE = {"events": [
+    _event("Brownwood Paddock Square", "Jazz", "2025-11-15T02:00:00.000Z"),
+    _event("Sawgrass Grove", "Blues", "2025-11-14T22:00:00.000Z", cancelled=True),
+    _event("Brownwood Paddock Square", "Rock", "2025-11-14T22:00:00.000Z"),
+    _event("Spanish Springs Town Square", "Folk", "2025-12-01T01:30:00.000Z"),
+]}
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestColumns(unittest.TestCase):
+    """Test cases for building typed columns."""
+
+    def test_date_column(self):
+        """Test that API timestamps become UTC datetime64 values and bad ones NaT."""
+        dates = date_column(["2025-11-15T02:00:00.000Z", "2025-11-14T17:00:00-05:00", "", None])
+
+        self.assertEqual(dates.dtype, np.dtype("datetime64[ms]"))
+        self.assertEqual(dates[0], np.datetime64("2025-11-15T02:00:00"))
+        self.assertEqual(dates[1], np.datetime64("2025-11-14T22:00:00"))
+        self.assertTrue(np.isnat(dates[2]) and np.isnat(dates[3]))
+
+    def test_column_types(self):
+        """Test the array type chosen for each kind of field."""
+        self.assertEqual(column("cancelled", [True, False, ""]).tolist(), [True, False, False])
+        self.assertEqual(column("title", ["A", None]).tolist(), ["A", ""])
+        self.assertEqual(column("id", [1, 2]).dtype, np.dtype(int))
+        self.assertEqual(column("price", [1, 2.5]).dtype, np.dtype(float))
+        mixed = column("tags", [[1, 2], "x"])
+        self.assertEqual(mixed.dtype, object)
+        self.assertEqual(mixed.tolist(), [[1, 2], "x"])
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestEventBatch(unittest.TestCase):
+    """Test cases for columnar event batches."""
+
+    def setUp(self):
+        """Process the sample response into a batch."""
+        self.processor = EventProcessor({"Brownwood": "BW"}, output_fields=FIELDS)
+        self.batch = self.processor.process_batch(API_RESPONSE)
+
+    def test_process_batch_matches_process_events(self):
+        """Test that the batch holds the processed events, one array per field."""
+        self.assertEqual(len(self.batch), 4)
+        self.assertEqual(self.batch.fields, FIELDS)
+        self.assertEqual(self.batch["location.title"].tolist(), [
+            "BW", "Sawgrass Grove", "BW", "Spanish Springs Town Square"
+        ])
+        self.assertEqual(self.batch["cancelled"].dtype, bool)
+
+        expected = self.processor.process_events(API_RESPONSE)
+        for event, expected_event in zip(self.batch.to_events(), expected):
+            self.assertEqual(
+                event["start.date"],
+                datetime.datetime.fromisoformat(expected_event["start.date"][:-1])
+            )
+            event["start.date"] = expected_event["start.date"]
+            self.assertEqual(event, expected_event)
+
+    def test_unprocessable_events_skipped(self):
+        """Test that events process_events skips are left out of the batch."""
+        api_response = {"events": API_RESPONSE["events"] + [{"location": {"title": 42}}]}
+
+        with self.assertLogs("src.event_processor", level="WARNING"):
+            batch = self.processor.process_batch(api_response)
+
+        self.assertEqual(batch["title"].tolist(), self.batch["title"].tolist())
+
+    def test_filter(self):
+        """Test selection by mask and by indexes."""
+        active = self.batch.filter(~self.batch["cancelled"])
+        november = self.batch.filter(
+            self.batch["start.date"] < np.datetime64("2025-12-01")
+        )
+
+        self.assertEqual(active["title"].tolist(), ["Jazz", "Rock", "Folk"])
+        self.assertEqual(november["title"].tolist(), ["Jazz", "Blues", "Rock"])
+        self.assertEqual(self.batch.filter([3, 0])["title"].tolist(), ["Folk", "Jazz"])
+        self.assertEqual(len(self.batch.filter([])), 0)
+
+    def test_sort_is_stable(self):
+        """Test sorting by one or more fields, keeping the order of equal keys."""
+        ascending = self.batch.sort("start.date")
+        descending = self.batch.sort("start.date", descending=True)
+        by_venue = self.batch.sort(["location.title", "start.date"])
+
+        self.assertEqual(ascending["title"].tolist(), ["Blues", "Rock", "Jazz", "Folk"])
+        self.assertEqual(descending["title"].tolist(), ["Folk", "Jazz", "Blues", "Rock"])
+        self.assertEqual(by_venue["title"].tolist(), ["Rock", "Jazz", "Blues", "Folk"])
+
+    def test_group_and_count_by(self):
+        """Test grouping and counting by a field in sorted key order."""
+        groups = self.batch.group_by("location.title")
+
+        self.assertEqual(list(groups), ["BW", "Sawgrass Grove", "Spanish Springs Town Square"])
+        self.assertEqual(groups["BW"]["title"].tolist(), ["Jazz", "Rock"])
+        self.assertEqual(self.batch.count_by("location.title"), {
+            "BW": 2, "Sawgrass Grove": 1, "Spanish Springs Town Square": 1
+        })
+        self.assertEqual(self.batch.count_by("cancelled"), {False: 3, True: 1})
+
+    def test_list_and_mixed_values(self):
+        """Test grouping, counting and sorting object columns."""
+        batch = EventBatch({
+            "subcategories": column("subcategories", [["music", "jazz"], [], ["music", "jazz"]]),
+            "price": column("price", [10, "", 2.5]),
+        })
+
+        self.assertEqual(batch.count_by("subcategories"), {(): 1, ("music", "jazz"): 2})
+        self.assertEqual(batch.group_by("subcategories")[()]["price"].tolist(), [""])
+        self.assertEqual(batch.count_by("price"), {2.5: 1, 10: 1, "": 1})
+        self.assertEqual(batch.sort("price")["price"].tolist(), [2.5, 10, ""])
+        self.assertEqual(batch.sort("subcategories")["price"].tolist(), ["", 10, 2.5])
+
+    def test_unorderable_values_rejected(self):
+        """Test that values which cannot be compared raise a clear error."""
+        batch = EventBatch({"tags": column("tags", [[1, "a"], ["b", 2]])})
+
+        with self.assertRaisesRegex(ValueError, "'tags'"):
+            batch.count_by("tags")
+
+    def test_empty_batch(self):
+        """Test a response without events."""
+        batch = self.processor.process_batch({"events": []})
+
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.fields, FIELDS)
+        self.assertEqual(batch.count_by("title"), {})
+        self.assertEqual(batch.sort("start.date").to_events(), [])
+
+    def test_columns_must_have_same_length(self):
+        """Test that arrays of different lengths are rejected."""
+        with self.assertRaises(ValueError):
+            EventBatch({"a": np.arange(2), "b": np.arange(3)})
+
+
+if __name__ == '__main__':
+    unittest.main()
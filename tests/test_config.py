@@ -199,6 +199,14 @@ class TestConfig(unittest.TestCase):
         self.assertIn("dateRange=today", url)
         self.assertIn("categories=entertainment", url)
         self.assertIn("locationCategories=town-squares", url)
+        self.assertIn("startRow=0", url)
+        self.assertIn("endRow=24", url)
+
+    def test_get_api_url_row_window(self):
+        """Test API URL generation for a later row window."""
+        url = Config.get_api_url("today", start_row=50, page_size=25)
+        self.assertIn("startRow=50", url)
+        self.assertIn("endRow=74", url)
 
 
 if __name__ == '__main__':
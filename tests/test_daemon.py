@@ -0,0 +1,223 @@
+"""Unit tests for daemon module."""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from src.batch import Query
+from src.daemon import EventDaemon
+from src.query_planner import QueryKey, QueryPlanner
+from src.response_cache import ResponseCache
+from src.exceptions import APIError
+from src.rows import Row
+from tests.conftest import make_api_response
+
+
+VENUE_MAPPINGS = {"Brownwood": "Brownwood"}
+
+
+class _Clock(datetime):
+    """datetime whose now() returns a settable instant."""
+
+    current = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current.astimezone(tz)
+
+
+class TestEventDaemon(unittest.TestCase):
+    """Test cases for the refreshing daemon."""
+
+    def setUp(self):
+        """Create an isolated output directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.target = os.path.join(self.temp_dir.name, "today.txt")
+
+    def tearDown(self):
+        """Remove the output directory."""
+        self.temp_dir.cleanup()
+
+    def _daemon(self, queries, **kwargs):
+        daemon = EventDaemon(queries, VENUE_MAPPINGS, **kwargs)
+        self.addCleanup(daemon.close)
+        # Skip the token fetch and session warm-up
+        daemon.auth_token = "Basic abc"
+        return daemon
+
+    def test_refresh_updates_snapshot_and_output(self):
+        """Test that a refresh holds the processed events and rewrites the target."""
+        query = Query(date_range="today", output=self.target)
+        daemon = self._daemon([query])
+
+        with patch('src.daemon.fetch_all_events', return_value=make_api_response("Jazz")):
+            errors = daemon.refresh([0])
+
+        snapshot = daemon.snapshot(0)
+        self.assertEqual(errors, {0: None})
+        self.assertEqual(snapshot.output, "Brownwood,Jazz#")
+        self.assertEqual(snapshot.events, [{"location.title": "Brownwood", "title": "Jazz"}])
+        self.assertEqual(daemon.get_response(query.key)[0], make_api_response("Jazz"))
+        with open(self.target, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Brownwood,Jazz#")
+
+    def test_compact_rows_in_snapshot(self):
+        """Test that compact_rows holds compact rows with the same output."""
+        daemon = self._daemon([Query(output=self.target)], compact_rows=True)
+
+        with patch('src.daemon.fetch_all_events', return_value=make_api_response("Jazz")):
+            daemon.refresh([0])
+
+        snapshot = daemon.snapshot(0)
+        self.assertIsInstance(snapshot.events[0], Row)
+        self.assertEqual(snapshot.events, [{"location.title": "Brownwood", "title": "Jazz"}])
+        self.assertEqual(snapshot.output, "Brownwood,Jazz#")
+
+    def test_planner_follows_the_date(self):
+        """Test that a derived "today" query moves to the next day after midnight."""
+        month = Query(
+            date_range="this-month", category="all", location="all",
+            output=os.path.join(self.temp_dir.name, "month.txt")
+        )
+        today = Query(date_range="today", category="all", location="all", output=self.target)
+        daemon = self._daemon([month, today], planner=QueryPlanner())
+        response = {"events": [
+            {"location": {"title": "Brownwood"}, "title": "Wed", "start": {"date": "2025-11-12"}},
+            {"location": {"title": "Brownwood"}, "title": "Thu", "start": {"date": "2025-11-13"}},
+        ]}
+
+        _Clock.current = datetime(2025, 11, 12, 17, tzinfo=timezone.utc)
+        with patch('src.query_planner.datetime', _Clock), \
+                patch('src.daemon.fetch_all_events', return_value=response) as fetch:
+            daemon.refresh([0, 1])
+            first = daemon.snapshot(1).output
+            # The next day, with the same planner
+            _Clock.current = datetime(2025, 11, 13, 17, tzinfo=timezone.utc)
+            daemon.refresh([0, 1])
+
+        self.assertEqual(first, "Brownwood,Wed#")
+        self.assertEqual(daemon.snapshot(1).output, "Brownwood,Thu#")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_refresh_replaces_expired_cache_entry(self):
+        """Test that a scheduled refresh holds the new response, not the expired one."""
+        cache = ResponseCache(self.temp_dir.name, ttl=60, stale_ttl=3600, background_refresh=True)
+        query = Query(output=self.target)
+        with patch('src.response_cache.time.time', return_value=time.time() - 600):
+            cache.set(query.api_url, make_api_response("Old"))
+        daemon = self._daemon([query], response_cache=cache)
+
+        with patch('src.daemon.fetch_all_events', return_value=make_api_response("New")):
+            daemon.refresh([0])
+
+        self.assertEqual(daemon.snapshot(0).output, "Brownwood,New#")
+        self.assertEqual(cache.get(query.api_url), make_api_response("New"))
+
+    def test_lookup_serves_expired_entry_while_refreshing(self):
+        """Test that an on-demand lookup answers from the expired entry at once."""
+        cache = ResponseCache(self.temp_dir.name, ttl=60, stale_ttl=3600)
+        key = QueryKey("tomorrow", "all", "all")
+        with patch('src.response_cache.time.time', return_value=time.time() - 600):
+            cache.set(Query(*key).api_url, make_api_response("Old"))
+        daemon = self._daemon([Query(output=self.target)], response_cache=cache)
+        fetched = threading.Event()
+
+        def fetch(*args, **kwargs):
+            fetched.set()
+            return make_api_response("New")
+
+        with patch('src.daemon.fetch_all_events', side_effect=fetch):
+            api_response, _ = daemon.lookup(key)
+            self.assertTrue(fetched.wait(5))
+            # The refreshed response lands in the cache
+            for _ in range(500):
+                if cache.get(Query(*key).api_url) is not None:
+                    break
+                time.sleep(0.01)
+
+        self.assertEqual(api_response, make_api_response("Old"))
+        self.assertEqual(cache.get(Query(*key).api_url), make_api_response("New"))
+
+    def test_concurrent_lookups_start_session_once(self):
+        """Test that lookups served before run() has started share one session start."""
+        daemon = EventDaemon([Query(output=self.target)], VENUE_MAPPINGS)
+        self.addCleanup(daemon.close)
+        keys = [QueryKey(date_range, "all", "all") for date_range in ("tomorrow", "this-week")]
+
+        def start_session(*args, **kwargs):
+            time.sleep(0.05)
+            return "Basic abc", True
+
+        with patch('src.daemon.start_session', side_effect=start_session) as mock_start, \
+                patch('src.daemon.fetch_all_events', return_value=make_api_response("Jazz")):
+            threads = [threading.Thread(target=daemon.lookup, args=(key,)) for key in keys * 2]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(mock_start.call_count, 1)
+        self.assertEqual(daemon.auth_token, "Basic abc")
+
+    def test_failed_refresh_keeps_previous_snapshot(self):
+        """Test that an API failure leaves the last good snapshot in place."""
+        daemon = self._daemon([Query(output=self.target)])
+
+        with patch('src.daemon.fetch_all_events', return_value=make_api_response("Jazz")):
+            daemon.refresh([0])
+        with patch('src.daemon.fetch_all_events', side_effect=APIError("down")):
+            errors = daemon.refresh([0])
+
+        self.assertIsInstance(errors[0], APIError)
+        self.assertEqual(daemon.snapshot(0).output, "Brownwood,Jazz#")
+
+    def test_scheduler_refreshes_on_each_interval(self):
+        """Test that each query is refreshed on its own interval until stopped."""
+        fast = Query(date_range="today", output=self.target, interval=0.01)
+        slow = Query(
+            date_range="tomorrow", output=os.path.join(self.temp_dir.name, "t.txt"), interval=60
+        )
+        daemon = self._daemon([fast, slow])
+        calls = []
+        refreshed = threading.Event()
+
+        def fetch(session, api_url, auth_token, **kwargs):
+            calls.append(api_url)
+            if sum("dateRange=today" in url for url in calls) >= 3:
+                refreshed.set()
+            return make_api_response("Jazz")
+
+        with patch('src.daemon.fetch_all_events', side_effect=fetch):
+            thread = threading.Thread(target=daemon.run)
+            thread.start()
+            self.assertTrue(refreshed.wait(5))
+            daemon.stop()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(sum("dateRange=tomorrow" in url for url in calls), 1)
+
+    def test_rejected_token_refreshed_once(self):
+        """Test that concurrent rejections of one token refresh credentials once."""
+        daemon = self._daemon([Query()])
+
+        with patch.object(daemon.session_manager, 'establish_session') as mock_establish, \
+                patch('src.daemon.fetch_auth_token', return_value="Basic new") as mock_fetch:
+            self.assertEqual(daemon._refresh_credentials("Basic abc"), "Basic new")
+            self.assertEqual(daemon._refresh_credentials("Basic abc"), "Basic new")
+
+        self.assertEqual(mock_establish.call_count, 1)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    def test_invalid_refresh_interval(self):
+        """Test that a non-positive default interval is rejected."""
+        with self.assertRaises(ValueError):
+            EventDaemon([Query()], VENUE_MAPPINGS, refresh_interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,9 @@
 """Unit tests for event_processor module."""
 
 import unittest
-from src.event_processor import EventProcessor
+from src.event_processor import EventProcessor, compile_accessor
 from src.exceptions import ProcessingError
+from src.rows import Row
 
 
 class TestEventProcessor(unittest.TestCase):
@@ -208,6 +209,125 @@ class TestEventProcessor(unittest.TestCase):
         self.assertEqual(result[0]["title"], "Brownwood Artist")
         self.assertEqual(result[0]["description"], "Event at Brownwood")
 
+    def test_process_event_single(self):
+        """Test that process_event extracts the fields of one event."""
+        processor = EventProcessor({"Brownwood": "BW"})
+
+        result = processor.process_event(
+            {"location": {"title": "Brownwood Paddock Square"}, "title": "Artist"}
+        )
+
+        self.assertEqual(result, {"location.title": "BW", "title": "Artist"})
+
+    def test_process_event_skips_invalid_event(self):
+        """Test that process_event returns None for an event it cannot process."""
+        processor = EventProcessor({"Brownwood": "BW"})
+
+        with self.assertLogs("src.event_processor", level="WARNING") as logs:
+            result = processor.process_event({"location": {"title": 42}}, index=3)
+
+        self.assertIsNone(result)
+        self.assertIn("index 3", logs.output[0])
+
+    def test_compiled_accessors_match_extract_field(self):
+        """Test that compiled accessors return what extract_field returns."""
+        processor = EventProcessor({})
+        events = [
+            {"title": "A", "location": {"title": "B", "geo": {"lat": 1.5}}, "count": 0},
+            {"title": None, "location": "Sawgrass", "cancelled": False},
+            {"location": {"title": None, "geo": None}},
+            {"location": {"geo": {"lat": None}}},
+            "not an event",
+            None,
+        ]
+        paths = ["title", "count", "cancelled", "location", "location.title",
+                 "location.geo.lat", "location.title.x", "missing", "missing.path"]
+
+        for path in paths:
+            get = compile_accessor(path)
+            for event in events:
+                self.assertEqual(
+                    get(event), processor.extract_field(event, path), (path, event)
+                )
+
+    def test_changing_output_fields_recompiles_plan(self):
+        """Test that assigning output_fields changes the extracted fields."""
+        processor = EventProcessor({"Brownwood": "BW"})
+        processor.output_fields = ["title", "location.title"]
+
+        result = processor.process_event(
+            {"location": {"title": "Brownwood Paddock Square"}, "title": "Artist"}
+        )
+
+        self.assertEqual(list(result), ["title", "location.title"])
+        self.assertEqual(result["location.title"], "BW")
+
+    def test_venue_abbreviations_are_memoized(self):
+        """Test that a repeated venue name is matched only once."""
+        processor = EventProcessor({"Brownwood": "BW"})
+        api_response = {
+            "events": [{"location": {"title": "Brownwood Paddock Square"}, "title": "A"}] * 5
+        }
+
+        result = processor.process_events(api_response)
+
+        self.assertEqual([event["location.title"] for event in result], ["BW"] * 5)
+        self.assertEqual(processor._abbreviate_cached.cache_info().misses, 1)
+
+    def test_changing_venue_mappings_recompiles_matcher(self):
+        """Test that assigning venue_mappings replaces the memoized matches."""
+        processor = EventProcessor({"Brownwood": "BW"})
+        self.assertEqual(processor.abbreviate_venue("Brownwood Paddock Square"), "BW")
+
+        processor.venue_mappings = {"Paddock": "PD"}
+
+        self.assertEqual(processor.abbreviate_venue("Brownwood Paddock Square"), "PD")
+
+    def test_iter_process_events_is_lazy(self):
+        """Test that events are processed only as rows are requested."""
+        processor = EventProcessor({"Brownwood": "BW"})
+
+        def events():
+            yield {"location": {"title": "Brownwood"}, "title": "A"}
+            yield {"location": {"title": 42}, "title": "skipped"}
+            yield {"location": {"title": "Sawgrass"}, "title": "B"}
+            raise AssertionError("events consumed past the requested rows")
+
+        rows = processor.iter_process_events(events())
+
+        self.assertEqual(next(rows), {"location.title": "BW", "title": "A"})
+        with self.assertLogs("src.event_processor", level="WARNING"):
+            self.assertEqual(next(rows), {"location.title": "Sawgrass", "title": "B"})
+
+    def test_get_events_validates_response(self):
+        """Test that get_events raises ProcessingError for invalid responses."""
+        self.assertEqual(EventProcessor.get_events({"events": []}), [])
+        with self.assertRaises(ProcessingError):
+            EventProcessor.get_events({})
+        with self.assertRaises(ProcessingError):
+            EventProcessor.get_events({"events": "none"})
+
+    def test_compact_rows_match_dictionaries(self):
+        """Test that compact rows hold the same fields and values as dictionaries."""
+        fields = ["location.title", "title", "start.date", "title", "missing.path"]
+        api_response = {"events": [
+            {"location": {"title": "Brownwood Paddock Square"}, "title": "A", "start": {}},
+            {"location": {"title": 42}, "title": "skipped"},
+            {"location": "Sawgrass", "title": None, "start": {"date": "2025-01-01"}},
+        ]}
+        processor = EventProcessor({"Brownwood": "BW"}, output_fields=fields)
+        compact = EventProcessor({"Brownwood": "BW"}, output_fields=fields, compact=True)
+
+        with self.assertLogs("src.event_processor", level="WARNING"):
+            expected = processor.process_events(api_response)
+        with self.assertLogs("src.event_processor", level="WARNING"):
+            rows = compact.process_events(api_response)
+
+        self.assertTrue(all(isinstance(row, Row) for row in rows))
+        self.assertEqual(rows, expected)
+        self.assertEqual([list(row) for row in rows], [list(event) for event in expected])
+        self.assertEqual(len({type(row) for row in rows}), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,48 @@
+"""Unit tests for files module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.files import atomic_write
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """Test cases for atomic file replacement."""
+
+    def setUp(self):
+        """Create an isolated directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the directory."""
+        self.temp_dir.cleanup()
+
+    def test_writes_and_replaces(self):
+        """Test that the file is created, including its directories, and replaced."""
+        path = os.path.join(self.temp_dir.name, "nested", "state.json")
+
+        atomic_write(path, "first")
+        atomic_write(path, "sécond")
+
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "sécond")
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["state.json"])
+
+    def test_failure_keeps_old_file_and_removes_temporary_file(self):
+        """Test that a failed replace leaves the previous content and no temporary file."""
+        path = os.path.join(self.temp_dir.name, "state.json")
+        atomic_write(path, "old")
+
+        with patch('src.files.os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                atomic_write(path, "new")
+
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.temp_dir.name), ["state.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Unit tests for http_server module."""
+
+import hashlib
+import http.client
+import json
+import threading
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from src.batch import Query
+from src.daemon import EventDaemon
+from src.exceptions import APIError
+from src.http_server import EventServer, etag_matches
+from src.query_planner import QueryPlanner
+from tests.conftest import make_api_response
+
+
+class TestEtagMatching(unittest.TestCase):
+    """Test cases for If-None-Match comparison."""
+
+    def test_matches_listed_and_weak_tags(self):
+        """Test that any listed tag, weak or strong, matches."""
+        self.assertTrue(etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(etag_matches('W/"b"', '"b"'))
+        self.assertTrue(etag_matches('*', '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+
+
+class TestEventServer(unittest.TestCase):
+    """Test cases for serving events over HTTP."""
+
+    def setUp(self):
+        """Start a server on a free port over a daemon with one refreshed query."""
+        self.daemon = EventDaemon(
+            [Query(date_range="this-week", category="all", location="town-squares")],
+            {"Brownwood": "Brownwood"},
+            planner=QueryPlanner(today=date(2025, 11, 12))
+        )
+        self.daemon.auth_token = "Basic abc"
+        self.server = EventServer(("127.0.0.1", 0), self.daemon)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        self.thread.start()
+        self._refresh("Jazz")
+
+    def tearDown(self):
+        """Stop the server and close the daemon."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.daemon.close()
+
+    def _refresh(self, title):
+        with patch('src.daemon.fetch_all_events', return_value=make_api_response(title)):
+            self.daemon.refresh([0])
+
+    def _get(self, path, headers=None):
+        connection = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        try:
+            connection.request("GET", path, headers=headers or {})
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+    def test_serves_formatted_events_with_strong_etag(self):
+        """Test that the body is formatted and tagged with its SHA-256."""
+        status, headers, body = self._get(
+            "/events?date_range=this-week&category=all&location=town-squares"
+            "&format=json&fields=title,location.title"
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], "application/json; charset=utf-8")
+        self.assertEqual(json.loads(body), [{"title": "Jazz", "location.title": "Brownwood"}])
+        self.assertEqual(headers["ETag"], f'"{hashlib.sha256(body).hexdigest()}"')
+
+    def test_matching_etag_returns_304(self):
+        """Test conditional requests before and after a refresh changes the body."""
+        path = "/events?date_range=this-week&category=all&location=town-squares"
+        _, headers, _ = self._get(path)
+
+        status, _, body = self._get(path, {"If-None-Match": headers["ETag"]})
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+
+        self._refresh("Blues")
+        status, _, body = self._get(path, {"If-None-Match": headers["ETag"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"Brownwood,Blues#")
+
+    def test_covered_query_derived_without_fetch(self):
+        """Test that narrower filters are served from the held wide response."""
+        with patch('src.daemon.fetch_all_events', side_effect=AssertionError("fetched")):
+            status, _, body = self._get(
+                "/events?date_range=today&category=sports&location=Brownwood+Paddock+Square"
+                "&format=plain"
+            )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"")
+
+    def test_repeated_derived_query_rendered_once(self):
+        """Test that a body rendered from the current response skips the derivation."""
+        path = "/events?date_range=today&category=all&location=town-squares"
+        derive = self.daemon.planner.derive
+        with patch.object(self.daemon.planner, 'derive', wraps=derive) as mock_derive:
+            first = self._get(path)
+            second = self._get(path)
+        self.assertEqual(mock_derive.call_count, 1)
+
+        self._refresh("Blues")
+        with patch.object(self.daemon.planner, 'derive', wraps=derive) as mock_derive:
+            third = self._get(path)
+        self.assertEqual(mock_derive.call_count, 1)
+
+        self.assertEqual(first[2], second[2])
+        self.assertEqual(third[2], b"Brownwood,Blues#")
+
+    def test_uncovered_query_fetch_failure_returns_502(self):
+        """Test that a failing on-demand fetch is reported as a bad gateway."""
+        with patch('src.daemon.fetch_all_events', side_effect=APIError("down")):
+            status, _, _ = self._get("/events?date_range=next-month")
+
+        self.assertEqual(status, 502)
+
+    def test_invalid_requests(self):
+        """Test that unknown paths and invalid parameters are rejected."""
+        self.assertEqual(self._get("/other")[0], 404)
+        self.assertEqual(self._get("/events?format=xml")[0], 400)
+        self.assertEqual(self._get("/events?colour=red")[0], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,12 +7,19 @@ the complete pipeline from token fetch to formatted output.
 import unittest
 from unittest.mock import patch, Mock
 import json
+import os
 import sys
+import tempfile
+import time
 from io import StringIO
 
+import requests
+
 from src.villages_events import main
 from src.config import Config
 from src.exceptions import TokenFetchError, SessionError, APIError
+from src.response_cache import ResponseCache
+from src.token_cache import TokenCache
 
 
 class TestIntegrationEndToEnd(unittest.TestCase):
@@ -58,7 +65,7 @@ class TestIntegrationEndToEnd(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -98,7 +105,7 @@ class TestIntegrationEndToEnd(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -140,7 +147,7 @@ class TestIntegrationEndToEnd(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -181,7 +188,7 @@ class TestIntegrationEndToEnd(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -221,7 +228,7 @@ class TestIntegrationEndToEnd(unittest.TestCase):
         # Mock API request with empty events
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = {"events": []}
+        mock_api_response.content = json.dumps({"events": []}).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -338,7 +345,7 @@ class TestIntegrationErrorHandling(unittest.TestCase):
         # Mock API response with invalid JSON
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.side_effect = ValueError("Invalid JSON")
+        mock_api_response.content = b"<html>Invalid JSON</html>"
         mock_api_get.return_value = mock_api_response
         
         exit_code = main()
@@ -366,7 +373,7 @@ class TestIntegrationErrorHandling(unittest.TestCase):
         # Mock API response without events field
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = {"data": []}
+        mock_api_response.content = json.dumps({"data": []}).encode()
         mock_api_get.return_value = mock_api_response
         
         exit_code = main()
@@ -394,7 +401,7 @@ class TestIntegrationErrorHandling(unittest.TestCase):
         # Mock API response with some events missing fields
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = {
+        mock_api_response.content = json.dumps({
             "events": [
                 {"title": "Missing Location"},  # Missing location field
                 {
@@ -403,7 +410,7 @@ class TestIntegrationErrorHandling(unittest.TestCase):
                 },
                 {"location": {"title": "Sawgrass Grove"}}  # Missing title field
             ]
-        }
+        }).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -473,7 +480,7 @@ class TestIntegrationDateRange(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -516,7 +523,7 @@ class TestIntegrationDateRange(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -556,7 +563,7 @@ class TestIntegrationDateRange(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -625,7 +632,7 @@ class TestIntegrationCategory(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -668,7 +675,7 @@ class TestIntegrationCategory(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -714,7 +721,7 @@ class TestIntegrationCategory(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -784,7 +791,7 @@ class TestIntegrationLocation(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -827,7 +834,7 @@ class TestIntegrationLocation(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -873,7 +880,7 @@ class TestIntegrationLocation(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -949,7 +956,7 @@ class TestIntegrationRawOutput(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -994,7 +1001,7 @@ class TestIntegrationRawOutput(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1080,7 +1087,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1120,7 +1127,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1173,7 +1180,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1219,7 +1226,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1259,7 +1266,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1307,7 +1314,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1347,7 +1354,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1391,7 +1398,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API response with some events missing description field
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = {
+        mock_api_response.content = json.dumps({
             "events": [
                 {
                     "title": "Event with description",
@@ -1402,7 +1409,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
                     # description field is missing
                 }
             ]
-        }
+        }).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1450,7 +1457,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API response with "Brownwood" in multiple fields
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = {
+        mock_api_response.content = json.dumps({
             "events": [
                 {
                     "location": {"title": "Brownwood Paddock Square"},
@@ -1458,7 +1465,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
                     "category": "Brownwood entertainment"
                 }
             ]
-        }
+        }).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1505,7 +1512,7 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -1530,3 +1537,158 @@ class TestIntegrationConfigurableFields(unittest.TestCase):
         # Check data rows contain nested field values
         self.assertIn("Jazz Band,2025-11-14T22:00:00.000Z,2025-11-14T23:30:00.000Z,entertainment", lines[1])
         self.assertIn("Rock Group,2025-11-15T20:00:00.000Z,2025-11-15T22:00:00.000Z,entertainment", lines[2])
+
+
+class TestIntegrationStreaming(unittest.TestCase):
+    """Integration tests for the streaming option."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_js_content = 'dp_AUTH_TOKEN = "Basic dGVzdHRva2VuMTIzNDU2";'
+        self.mock_api_body = json.dumps({
+            "events": [
+                {"location": {"title": "Brownwood Paddock Square"}, "title": "Jazz Band"},
+                {"location": {"title": "Sawgrass Grove"}, "title": "Country Singer"}
+            ],
+            "count": 2
+        }).encode()
+
+    def _run_main(self, mock_token_get, mock_api_get, chunks):
+        """Runs main with mocked requests, returning the exit code and stdout."""
+        mock_token_response = Mock()
+        mock_token_response.text = self.mock_js_content
+        mock_token_response.raise_for_status = Mock()
+        mock_token_get.return_value = mock_token_response
+
+        mock_api_response = Mock()
+        mock_api_response.status_code = 200
+        mock_api_response.content = self.mock_api_body
+        mock_api_response.iter_content.return_value = iter(chunks)
+        mock_api_get.return_value = mock_api_response
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        try:
+            exit_code = main()
+            output = captured_output.getvalue()
+        finally:
+            sys.stdout = sys.__stdout__
+        return exit_code, output
+
+    @patch('src.api_client.requests.Session.get')
+    @patch('src.session_manager.requests.Session.get')
+    @patch('src.token_fetcher.requests.get')
+    @patch('sys.argv', ['villages_events.py', '--stream', '-p', 'Events'])
+    def test_stream_output_matches_buffered(self, mock_token_get, mock_session_get, mock_api_get):
+        """Test that streamed output equals the buffered output."""
+        body = self.mock_api_body
+        chunks = [body[i:i + 10] for i in range(0, len(body), 10)]
+
+        exit_code, output = self._run_main(mock_token_get, mock_api_get, chunks)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "Events#Brownwood,Jazz Band#Sawgrass,Country Singer#")
+        self.assertEqual(mock_api_get.call_args[1]["stream"], True)
+
+    @patch('src.api_client.requests.Session.get')
+    @patch('src.session_manager.requests.Session.get')
+    @patch('src.token_fetcher.requests.get')
+    @patch('sys.argv', ['villages_events.py', '--stream', '--format', 'json'])
+    def test_truncated_stream_returns_error(self, mock_token_get, mock_session_get, mock_api_get):
+        """Test that a response cut off mid-stream exits with an error."""
+        exit_code, output = self._run_main(
+            mock_token_get, mock_api_get, [self.mock_api_body[:100]]
+        )
+
+        self.assertEqual(exit_code, 1)
+        self.assertTrue(output.startswith("[\n  {"))
+
+    @patch('sys.argv', ['villages_events.py', '--stream', '--raw'])
+    def test_stream_with_raw_is_rejected(self):
+        """Test that --stream cannot be combined with --raw."""
+        self.assertEqual(main(), 2)
+
+
+class TestIntegrationOffline(unittest.TestCase):
+    """Integration tests for serving cached responses when the network is down."""
+
+    def setUp(self):
+        """Create a cache directory holding a stale response for the default query."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config = {
+            "cache_dir": self.temp_dir.name,
+            "response_ttl": 60,
+            "response_stale_ttl": 3600,
+        }
+        self.api_response = {
+            "events": [{"location": {"title": "Brownwood Paddock Square"}, "title": "Jazz"}],
+            "count": 1,
+        }
+        cache = ResponseCache(self.temp_dir.name, ttl=60, stale_ttl=3600)
+        with patch('src.response_cache.time.time', return_value=time.time() - 600):
+            cache.set(Config.get_api_url(), self.api_response)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.temp_dir.cleanup()
+
+    def _run_main(self):
+        """Runs main with every request failing, returning the exit code and stdout."""
+        offline = requests.exceptions.ConnectionError("offline")
+        captured_output = StringIO()
+        with patch('src.villages_events.ConfigLoader.load_config', return_value=self.config), \
+                patch('src.token_fetcher.requests.get', side_effect=offline), \
+                patch('requests.Session.get', side_effect=offline):
+            sys.stdout = captured_output
+            try:
+                exit_code = main()
+            finally:
+                sys.stdout = sys.__stdout__
+        return exit_code, captured_output.getvalue()
+
+    @patch('sys.argv', ['villages_events.py'])
+    def test_token_fetch_failure_serves_stale_response(self):
+        """Test that a stale cached response is printed when main.js cannot be fetched."""
+        with self.assertLogs(level="WARNING"):
+            exit_code, output = self._run_main()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "Brownwood,Jazz#")
+
+    @patch('sys.argv', ['villages_events.py'])
+    def test_session_failure_serves_stale_response(self):
+        """Test that a stale cached response is printed when the session warm-up fails."""
+        TokenCache(self.temp_dir.name).set(Config.JS_URL, "Basic dGVzdA==")
+
+        with self.assertLogs(level="WARNING"):
+            exit_code, output = self._run_main()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "Brownwood,Jazz#")
+
+    @patch('sys.argv', ['villages_events.py', '--date-range', 'tomorrow'])
+    def test_no_cached_response_fails(self):
+        """Test that the run still fails offline when nothing usable is cached."""
+        exit_code, output = self._run_main()
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(output, "")
+
+    def test_batch_serves_stale_responses(self):
+        """Test that batch queries are answered from the cache and uncached ones fail."""
+        today = os.path.join(self.temp_dir.name, "today.txt")
+        tomorrow = os.path.join(self.temp_dir.name, "tomorrow.txt")
+        argv = [
+            'villages_events.py',
+            '--batch',
+            f'today:entertainment:town-squares:{today}',
+            f'tomorrow:entertainment:town-squares:{tomorrow}',
+        ]
+
+        with patch('sys.argv', argv), self.assertLogs(level="WARNING"):
+            exit_code, _ = self._run_main()
+
+        self.assertEqual(exit_code, 1)
+        with open(today, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Brownwood,Jazz#")
+        self.assertFalse(os.path.exists(tomorrow))
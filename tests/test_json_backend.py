@@ -0,0 +1,59 @@
+"""Unit tests for json_backend module."""
+
+import json
+import unittest
+from unittest.mock import patch
+
+from src import json_backend
+
+
+SAMPLE = [
+    {
+        "title": "Café “Jazz” \U0001F3B7",
+        "location": {"title": "Brownwood"},
+        "count": 3,
+        "price": 12.5,
+        "tags": [],
+        "extra": {},
+        "cancelled": False,
+        "notes": None,
+    }
+]
+
+
+class TestJsonBackend(unittest.TestCase):
+    """Test cases for encoding and decoding with either backend."""
+
+    def _backends(self):
+        """Yields once with the installed backend and once with the stdlib."""
+        yield
+        with patch.object(json_backend, "orjson", None):
+            yield
+
+    def test_pretty_output_matches_stdlib(self):
+        """Test that indented output is byte-for-byte json.dumps(indent=2)."""
+        for _ in self._backends():
+            for obj in (SAMPLE, [], {"big": 2 ** 70}, {"small": 1e-7, "large": 1e16}):
+                self.assertEqual(json_backend.dumps(obj, indent=2), json.dumps(obj, indent=2))
+
+    def test_control_characters_escaped_as_stdlib(self):
+        """Test that controls and DEL are escaped the same way by both backends."""
+        obj = {"text": "tab\there\x00\x01\x1f\x7f\u00e9\x7e"}
+        for _ in self._backends():
+            self.assertEqual(json_backend.dumps(obj, indent=2), json.dumps(obj, indent=2))
+
+    def test_round_trip_from_bytes(self):
+        """Test that compact output decodes back from UTF-8 bytes."""
+        for _ in self._backends():
+            encoded = json_backend.dumps(SAMPLE).encode("utf-8")
+            self.assertEqual(json_backend.loads(encoded), SAMPLE)
+
+    def test_invalid_document_raises_value_error(self):
+        """Test that both backends report malformed input as ValueError."""
+        for _ in self._backends():
+            with self.assertRaises(ValueError):
+                json_backend.loads(b"<html>")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Unit tests for json_stream module."""
+
+import json
+import unittest
+
+from src.event_processor import EventProcessor
+from src.json_stream import EventStreamParser, compile_projection, iter_events, project
+
+
+DOCUMENT = {
+    "events": [
+        {"title": "Jazz \"Night\" \\ Café \U0001F3B7", "location": {"title": "Brownwood"}},
+        {"title": "[brackets] {braces}", "tags": [1, 2.5, -3e2, True, False, None]},
+        "text",
+        42,
+        [],
+    ],
+    "count": 5,
+    "metadata": {"page": [1, {"next": None}]},
+}
+
+
+def _split(data, size):
+    """Splits bytes into chunks of the given size."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestEventStreamParser(unittest.TestCase):
+    """Test cases for incremental parsing of the events array."""
+
+    def test_any_chunking_yields_same_events(self):
+        """Test that every chunk size yields the events and fields of the document."""
+        for indent in (None, 2):
+            data = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False).encode()
+            for size in range(1, len(data) + 1):
+                parser = EventStreamParser()
+                events = list(iter_events(_split(data, size), parser))
+                self.assertEqual(events, DOCUMENT["events"])
+                self.assertEqual(parser.fields, {"count": 5, "metadata": DOCUMENT["metadata"]})
+                self.assertTrue(parser.found_array)
+
+    def test_numbers_split_across_chunks(self):
+        """Test that a chunk ending inside a float or exponent does not cut the number."""
+        numbers = [1, 0.0025, 2.5e-3, -12.75, 3E+2, 0, 1e10]
+        data = b'{"events": [1, 0.0025, 2.5e-3, -12.75, 3E+2, 0, 1e10], "count": 0.5}'
+
+        parser = EventStreamParser()
+        events = list(iter_events(_split(data, 1), parser))
+
+        self.assertEqual(events, numbers)
+        self.assertEqual(parser.fields, {"count": 0.5})
+
+    def test_events_yielded_as_soon_as_complete(self):
+        """Test that an element is returned by the chunk that completes it."""
+        parser = EventStreamParser()
+
+        self.assertEqual(parser.feed(b'{"events": [{"id": 1}, {"id"'), [{"id": 1}])
+        self.assertEqual(parser.feed(b': 2}, 3'), [{"id": 2}])
+        self.assertEqual(parser.feed(b']}'), [3])
+        self.assertEqual(parser.close(), [])
+
+    def test_only_partial_element_is_buffered(self):
+        """Test that consumed bytes are dropped from the buffer."""
+        parser = EventStreamParser()
+
+        parser.feed(b'{"events": [' + b'{"id": 1}, ' * 1000 + b'{"id": 2')
+
+        self.assertEqual(parser._buffer, '{"id": 2')
+
+    def test_missing_array(self):
+        """Test that a response without the array yields nothing."""
+        parser = EventStreamParser()
+
+        self.assertEqual(list(iter_events([b'{"count": 0}'], parser)), [])
+        self.assertFalse(parser.found_array)
+        self.assertEqual(parser.fields, {"count": 0})
+
+    def test_custom_array_key(self):
+        """Test that another top-level array can be streamed."""
+        parser = EventStreamParser(array_key="items")
+
+        events = list(iter_events([b'{"events": [1], "items": [2, 3]}'], parser))
+
+        self.assertEqual(events, [2, 3])
+        self.assertEqual(parser.fields, {"events": [1]})
+
+    def test_invalid_documents_raise_value_error(self):
+        """Test that malformed, truncated or non-object input raises ValueError."""
+        for data in (
+            b'<html>Invalid JSON</html>',
+            b'[{"id": 1}]',
+            b'{"events": [{"id": 1}',
+            b'{"events": [{"id": 1}]',
+            b'{"events" [1]}',
+            b'{"events": [1]} trailing',
+            b'{"events": [tru]}',
+            b'',
+        ):
+            with self.assertRaises(ValueError, msg=data):
+                list(iter_events([data]))
+
+
+class TestProjection(unittest.TestCase):
+    """Test cases for projecting events onto output fields."""
+
+    def test_compile_projection(self):
+        """Test that field paths are merged into one tree."""
+        tree = compile_projection(["location.title", "title", "location.geo.lat", "start"])
+
+        self.assertEqual(tree, {
+            "location": {"title": None, "geo": {"lat": None}},
+            "title": None,
+            "start": None,
+        })
+
+    def test_whole_member_overrides_nested_paths(self):
+        """Test that a kept member is kept whole whatever the order of paths."""
+        for paths in (["location", "location.title"], ["location.title", "location"]):
+            self.assertEqual(compile_projection(paths), {"location": None})
+
+    def test_project_keeps_only_requested_members(self):
+        """Test that unrequested members are dropped and others left unchanged."""
+        event = DOCUMENT["events"][0]
+
+        projected = project(event, compile_projection(["location.title", "missing.path"]))
+
+        self.assertEqual(projected, {"location": {"title": "Brownwood"}})
+        self.assertEqual(project("text", {"title": None}), "text")
+
+    def test_parser_projects_events(self):
+        """Test that the parser yields projected events."""
+        data = json.dumps(DOCUMENT).encode()
+        parser = EventStreamParser(output_fields=["title"])
+
+        events = list(iter_events([data], parser))
+
+        self.assertEqual(events[0], {"title": DOCUMENT["events"][0]["title"]})
+        self.assertEqual(events[1], {"title": "[brackets] {braces}"})
+        self.assertEqual(events[2:], ["text", 42, []])
+        self.assertEqual(parser.fields["count"], 5)
+
+    def test_processed_output_unchanged(self):
+        """Test that processing projected events gives the same result."""
+        fields = ["location.title", "title", "tags", "location.title.x", "missing"]
+        events = [
+            {"location": {"title": "Brownwood Paddock Square", "id": 3}, "title": "A", "x": 1},
+            {"location": "Sawgrass", "title": None, "tags": [1, 2]},
+            {"location": {"title": None}},
+        ]
+        processor = EventProcessor({"Brownwood": "BW"}, output_fields=fields)
+        tree = compile_projection(fields)
+
+        projected = {"events": [project(event, tree) for event in events]}
+
+        self.assertEqual(
+            processor.process_events(projected), processor.process_events({"events": events})
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,10 @@
 
 import unittest
 import json
+from io import StringIO
+from unittest.mock import Mock
 from src.output_formatter import OutputFormatter
+from src.rows import row_type
 
 
 class TestOutputFormatter(unittest.TestCase):
@@ -164,6 +167,98 @@ class TestOutputFormatter(unittest.TestCase):
         
         self.assertIn("Invalid format type", str(context.exception))
 
+    def test_iter_format_matches_format_events(self):
+        """Test that the concatenated chunks equal format_events output."""
+        events = self.sample_events + [{"location.title": "Café \"A\"\nB", "title": 1.5}]
+        for format_type in ("meshtastic", "json", "csv", "plain"):
+            for count in range(len(events) + 1):
+                expected = OutputFormatter.format_events(
+                    events[:count], format_type, self.default_field_names
+                )
+                chunks = OutputFormatter.iter_format(
+                    iter(events[:count]), format_type, self.default_field_names
+                )
+                self.assertEqual("".join(chunks), expected, (format_type, count))
+
+    def test_iter_format_is_incremental(self):
+        """Test that an event is formatted before the next one is consumed."""
+        def events():
+            yield self.sample_events[0]
+            raise AssertionError("second event consumed too early")
+
+        chunks = OutputFormatter.iter_format(events(), "json", self.default_field_names)
+
+        self.assertIn("Artist One", next(chunks))
+
+    def test_iter_format_invalid_format(self):
+        """Test that iter_format rejects an invalid format before consuming events."""
+        with self.assertRaises(ValueError):
+            OutputFormatter.iter_format(iter(self.sample_events), "invalid")
+
+    def test_write_events_matches_formatted_output(self):
+        """Test that write_events writes the preamble and formatted events."""
+        for format_type in ("meshtastic", "json", "csv", "plain"):
+            for events in (self.sample_events, []):
+                stream = StringIO()
+
+                OutputFormatter.write_events(
+                    stream, iter(events), format_type, self.default_field_names, "Events"
+                )
+
+                expected = OutputFormatter.add_preamble(
+                    OutputFormatter.format_events(events, format_type, self.default_field_names),
+                    "Events",
+                    format_type
+                )
+                self.assertEqual(stream.getvalue(), expected)
+
+    def test_write_events_flushes_each_event(self):
+        """Test that flush=True flushes the stream after every chunk."""
+        stream = Mock()
+
+        OutputFormatter.write_events(stream, iter(self.sample_events), "plain", flush=True)
+
+        self.assertEqual(stream.flush.call_count, len(self.sample_events))
+
+    def test_write_events_invalid_format_writes_nothing(self):
+        """Test that an invalid format is rejected before the preamble is written."""
+        stream = StringIO()
+
+        with self.assertRaises(ValueError):
+            OutputFormatter.write_events(stream, iter(self.sample_events), "invalid", preamble="P")
+
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_rows_format_like_dictionaries(self):
+        """Test that every format gives the same output for compact rows as for dictionaries."""
+        Event = row_type(("location.title", "title"))
+        rows = [Event(event["location.title"], event["title"]) for event in self.sample_events]
+        rows.append(Event(None, 'Quoted, "Artist"'))
+        events = [dict(row) for row in rows]
+
+        for format_type in ("meshtastic", "json", "csv", "plain"):
+            for field_names in (None, ["title", "start.date", "location.title"]):
+                with self.subTest(format_type=format_type, field_names=field_names):
+                    self.assertEqual(
+                        OutputFormatter.format_events(rows, format_type, field_names),
+                        OutputFormatter.format_events(events, format_type, field_names)
+                    )
+
+    def test_mixed_rows_and_dictionaries(self):
+        """Test rows of different types and dictionaries in one list."""
+        events = [
+            row_type(("title",))("A"),
+            {"title": "B", "location.title": "Brownwood"},
+            row_type(("location.title", "title"))("Sawgrass", "C"),
+        ]
+
+        self.assertEqual(
+            OutputFormatter.format_events(events, "plain"),
+            "location.title: , title: A\n"
+            "location.title: Brownwood, title: B\n"
+            "location.title: Sawgrass, title: C\n"
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+"""Unit tests for pipeline module."""
+
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+from src.pipeline import start_session
+from src.exceptions import TokenFetchError, SessionError
+from src.timing import StageTimer
+
+
+class TestStartSession(unittest.TestCase):
+    """Test cases for concurrent token fetch and session establishment."""
+
+    def test_token_and_session_run_concurrently(self):
+        """Test that both stages are in flight at the same time."""
+        # Each stage waits for the other to start; run serially this would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch_token(js_url, **kwargs):
+            barrier.wait()
+            return "Basic abc"
+
+        def ensure_session(calendar_url, timeout=None, deadline=None):
+            barrier.wait()
+            return True
+
+        session_manager = Mock()
+        session_manager.ensure_session.side_effect = ensure_session
+
+        with patch('src.pipeline.fetch_auth_token', side_effect=fetch_token):
+            auth_token, warmed_up = start_session(session_manager, "https://example.com/calendar")
+
+        self.assertEqual(auth_token, "Basic abc")
+        self.assertTrue(warmed_up)
+
+    def test_stage_timings_recorded(self):
+        """Test that token and session stages are timed."""
+        timer = StageTimer()
+        session_manager = Mock()
+        session_manager.ensure_session.return_value = False
+
+        with patch('src.pipeline.fetch_auth_token', return_value="Basic abc"):
+            start_session(session_manager, "https://example.com/calendar", timer=timer)
+
+        self.assertIn("token", timer.timings)
+        self.assertIn("session", timer.timings)
+
+    def test_token_failure_raised(self):
+        """Test that a token failure propagates."""
+        session_manager = Mock()
+        session_manager.ensure_session.return_value = True
+
+        with patch('src.pipeline.fetch_auth_token', side_effect=TokenFetchError("boom")):
+            with self.assertRaises(TokenFetchError):
+                start_session(session_manager, "https://example.com/calendar")
+
+    def test_session_failure_raised(self):
+        """Test that a session failure propagates."""
+        session_manager = Mock()
+        session_manager.ensure_session.side_effect = SessionError("boom")
+
+        with patch('src.pipeline.fetch_auth_token', return_value="Basic abc"):
+            with self.assertRaises(SessionError):
+                start_session(session_manager, "https://example.com/calendar")
+
+
+if __name__ == '__main__':
+    unittest.main()
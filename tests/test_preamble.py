@@ -1,5 +1,6 @@
 """Unit tests for preamble feature."""
 
+import json
 import unittest
 from unittest.mock import patch, Mock
 import sys
@@ -43,7 +44,7 @@ class TestPreamble(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -85,7 +86,7 @@ class TestPreamble(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -127,7 +128,7 @@ class TestPreamble(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -166,7 +167,7 @@ class TestPreamble(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -205,7 +206,7 @@ class TestPreamble(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -244,7 +245,7 @@ class TestPreamble(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -286,7 +287,7 @@ class TestPreamble(unittest.TestCase):
         # Mock API request
         mock_api_response = Mock()
         mock_api_response.status_code = 200
-        mock_api_response.json.return_value = self.mock_api_response
+        mock_api_response.content = json.dumps(self.mock_api_response).encode()
         mock_api_get.return_value = mock_api_response
         
         # Capture stdout
@@ -0,0 +1,180 @@
+"""Unit tests for query_planner module."""
+
+import unittest
+from datetime import date
+from io import StringIO
+from unittest.mock import patch, Mock
+
+from src.batch import Query, run_batch
+from src.exceptions import APIError
+from src.query_planner import QueryKey, QueryPlanner
+
+
+# A Wednesday; its Sunday-to-Saturday week is 2025-11-09 to 2025-11-15
+TODAY = date(2025, 11, 12)
+
+
+def _event(title, category="entertainment", location="Brownwood Paddock Square",
+           location_category="town-squares", start="2025-11-12T23:00:00.000Z", end=None):
+    event = {
+        "title": title,
+        "category": category,
+        "location": {"title": location, "category": location_category},
+        "start": {"date": start},
+    }
+    if end is not None:
+        event["end"] = {"date": end}
+    return event
+
+
+class TestCoverage(unittest.TestCase):
+    """Test cases for query containment."""
+
+    def setUp(self):
+        """Create a planner with a fixed date."""
+        self.planner = QueryPlanner(today=TODAY)
+
+    def test_date_bounds(self):
+        """Test calendar periods of the date ranges."""
+        self.assertEqual(self.planner.date_bounds("today"), (TODAY, date(2025, 11, 13)))
+        self.assertEqual(
+            self.planner.date_bounds("this-week"), (date(2025, 11, 9), date(2025, 11, 16))
+        )
+        self.assertEqual(
+            self.planner.date_bounds("next-month"), (date(2025, 12, 1), date(2026, 1, 1))
+        )
+        self.assertIsNone(self.planner.date_bounds("all"))
+
+    def test_wider_filters_cover_narrower(self):
+        """Test coverage along each dimension."""
+        narrow = QueryKey("today", "sports", "Brownwood+Paddock+Square")
+        week_squares = QueryKey("this-week", "sports", "town-squares")
+
+        self.assertTrue(self.planner.covers(week_squares, narrow))
+        self.assertTrue(self.planner.covers(QueryKey("all", "all", "all"), narrow))
+        self.assertFalse(self.planner.covers(narrow, QueryKey("this-week", "sports", "all")))
+        self.assertFalse(self.planner.covers(QueryKey("today", "sports", "sports"), narrow))
+
+    def test_week_does_not_cover_month_boundary(self):
+        """Test that a week spanning two months is not covered by either month."""
+        planner = QueryPlanner(today=date(2025, 11, 30))
+        week = QueryKey("this-week", "all", "all")
+
+        self.assertFalse(planner.covers(QueryKey("this-month", "all", "all"), week))
+        self.assertTrue(planner.covers(week, QueryKey("tomorrow", "all", "all")))
+
+    def test_no_date_derivation_without_zone_data(self):
+        """Test that date filters are only derived when the local zone is known."""
+        planner = QueryPlanner(today=TODAY, time_zone="Nowhere/Unknown")
+        today = QueryKey("today", "all", "all")
+
+        self.assertIsNone(planner.tzinfo)
+        self.assertFalse(planner.covers(QueryKey("all", "all", "all"), today))
+        self.assertTrue(planner.covers(today, QueryKey("today", "sports", "all")))
+
+
+class TestPlanning(unittest.TestCase):
+    """Test cases for planning and deriving queries."""
+
+    def setUp(self):
+        """Create a planner with a fixed date."""
+        self.planner = QueryPlanner(today=TODAY)
+
+    def test_plan_fetches_only_widest_queries(self):
+        """Test that covered queries are served from the widest requested ones."""
+        wide = QueryKey("this-week", "all", "town-squares")
+        narrow = QueryKey("today", "sports", "Brownwood+Paddock+Square")
+        other = QueryKey("today", "sports", "Polo+Club")
+
+        plan = self.planner.plan([narrow, wide, other, narrow])
+
+        self.assertEqual(plan.fetches, [wide, other])
+        self.assertEqual(plan.sources, {narrow: wide, wide: wide, other: other})
+
+    def test_derive_filters_events(self):
+        """Test filtering by category, location title and local start date."""
+        response = {"events": [
+            _event("match"),
+            _event("sports", category="sports"),
+            _event("other square", location="Spanish Springs Town Square"),
+            # 02:00 UTC on the 13th is still the 12th in The Villages
+            _event("late", start="2025-11-13T02:00:00.000Z"),
+            _event("tomorrow", start="2025-11-13T15:00:00.000Z"),
+            _event("multi-day", start="2025-11-10T15:00:00.000Z", end="2025-11-14T15:00:00.000Z"),
+            _event("no date", start=None),
+        ], "count": 7}
+
+        derived = self.planner.derive(
+            response,
+            QueryKey("this-week", "all", "town-squares"),
+            QueryKey("today", "entertainment", "Brownwood+Paddock+Square")
+        )
+
+        self.assertEqual([e["title"] for e in derived["events"]], ["match", "late", "multi-day"])
+        self.assertEqual(derived["count"], 3)
+        self.assertEqual(len(response["events"]), 7)
+
+    def test_derive_by_location_category(self):
+        """Test filtering an all-locations response down to a location category."""
+        response = {"events": [
+            _event("square"),
+            _event("golf", location="Polo Club", location_category="sports"),
+        ]}
+
+        derived = self.planner.derive(
+            response, QueryKey("today", "all", "all"), QueryKey("today", "all", "town-squares")
+        )
+
+        self.assertEqual([e["title"] for e in derived["events"]], ["square"])
+
+    def test_execute_propagates_fetch_errors(self):
+        """Test that derived queries share the error of their source fetch."""
+        wide = QueryKey("this-week", "all", "all")
+        narrow = QueryKey("today", "all", "all")
+        error = APIError("boom")
+        fetch = Mock(return_value={wide: error})
+
+        results = self.planner.execute([narrow, wide], fetch)
+
+        fetch.assert_called_once_with([wide])
+        self.assertIs(results[narrow], error)
+        self.assertIs(results[wide], error)
+
+
+class TestPlannedBatch(unittest.TestCase):
+    """Test cases for batch mode with a planner."""
+
+    def test_batch_issues_one_call_for_covered_queries(self):
+        """Test that covered queries in a batch are derived without API calls."""
+        fetched_urls = []
+
+        def fetch(session, api_url, auth_token, **kwargs):
+            fetched_urls.append(api_url)
+            return {"events": [
+                _event("Jazz"),
+                _event("Polo", category="sports", location="Polo Club", location_category="sports"),
+            ]}
+
+        queries = [
+            Query(date_range="today", category="all", location="all", format="plain"),
+            Query(date_range="today", category="entertainment", location="town-squares"),
+            Query(date_range="today", category="sports", location="Polo+Club"),
+        ]
+        stream = StringIO()
+
+        with patch('src.batch.fetch_all_events', side_effect=fetch):
+            results = run_batch(
+                queries, Mock(), "Basic abc", {"Brownwood": "Brownwood"},
+                stream=stream, planner=QueryPlanner(today=TODAY)
+            )
+
+        self.assertEqual(len(fetched_urls), 1)
+        self.assertIn("dateRange=today", fetched_urls[0])
+        self.assertEqual(
+            [result.output for result in results[1:]], ["Brownwood,Jazz#", "Polo Club,Polo#"]
+        )
+        self.assertTrue(stream.getvalue().startswith("location.title: Brownwood, title: Jazz\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Unit tests for response_cache module."""
+
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from src.config import Config
+from src.exceptions import APIError
+from src.response_cache import ResponseCache
+
+
+API_URL = Config.get_api_url("today", "all", "all")
+RESPONSE = {"events": [{"title": "Jazz"}], "count": 1}
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the on-disk response cache."""
+
+    def setUp(self):
+        """Create an isolated cache directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.temp_dir.name, ttl=60, stale_ttl=600)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.temp_dir.cleanup()
+
+    def _later(self, seconds):
+        return patch('src.response_cache.time.time', return_value=time.time() + seconds)
+
+    def test_set_then_get_any_row_window(self):
+        """Test that a stored response is found for the same query in any window."""
+        self.cache.set(API_URL, RESPONSE)
+
+        self.assertEqual(self.cache.get(API_URL), RESPONSE)
+        self.assertEqual(self.cache.get(API_URL.replace("endRow=24", "endRow=99")), RESPONSE)
+        self.assertIsNone(self.cache.get(Config.get_api_url("tomorrow", "all", "all")))
+
+    def test_fresh_entry_skips_fetch(self):
+        """Test that a fresh entry is served without calling the API."""
+        self.cache.set(API_URL, RESPONSE)
+        fetch = Mock()
+
+        self.assertEqual(self.cache.fetch(API_URL, fetch), RESPONSE)
+        fetch.assert_not_called()
+
+    def test_miss_fetches_and_stores(self):
+        """Test that a miss fetches the response and caches it."""
+        fetch = Mock(return_value=RESPONSE)
+
+        self.assertEqual(self.cache.fetch(API_URL, fetch), RESPONSE)
+        self.assertEqual(self.cache.get(API_URL), RESPONSE)
+
+    def test_stale_entry_served_on_error(self):
+        """Test that a stale entry is the fallback when the API fails."""
+        self.cache.set(API_URL, RESPONSE)
+        fetch = Mock(side_effect=APIError("upstream down"))
+
+        with self._later(120):
+            self.assertEqual(self.cache.fetch(API_URL, fetch), RESPONSE)
+        fetch.assert_called_once_with()
+
+    def test_entry_past_stale_window_not_served(self):
+        """Test that errors propagate once the entry is too old to serve."""
+        self.cache.set(API_URL, RESPONSE)
+
+        with self._later(1000), self.assertRaises(APIError):
+            self.cache.fetch(API_URL, Mock(side_effect=APIError("upstream down")))
+
+    def test_stale_entry_refreshed_synchronously(self):
+        """Test that without background refresh a stale entry is refetched."""
+        self.cache.set(API_URL, RESPONSE)
+        fresh = {"events": [], "count": 0}
+
+        with self._later(120):
+            self.assertEqual(self.cache.fetch(API_URL, Mock(return_value=fresh)), fresh)
+
+    def test_stale_entry_refreshed_in_background(self):
+        """Test that stale-while-revalidate serves stale and refreshes once."""
+        cache = ResponseCache(self.temp_dir.name, ttl=60, stale_ttl=600, background_refresh=True)
+        cache.set(API_URL, RESPONSE)
+        release = threading.Event()
+        done = threading.Event()
+        fresh = {"events": [], "count": 0}
+
+        def fetch():
+            release.wait(5)
+            done.set()
+            return fresh
+
+        with self._later(120):
+            self.assertEqual(cache.fetch(API_URL, fetch), RESPONSE)
+            self.assertEqual(cache.fetch(API_URL, Mock(side_effect=AssertionError)), RESPONSE)
+        release.set()
+        self.assertTrue(done.wait(5))
+        for _ in range(100):
+            if cache.get(API_URL) == fresh:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(cache.get(API_URL), fresh)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Unit tests for retry module."""
+
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from src.api_client import fetch_events
+from src.exceptions import APIError, AuthenticationError, TokenFetchError
+from src.pipeline import start_session
+from src.retry import RetryPolicy, is_transient
+
+
+def _raised_from(error, cause):
+    """Returns error with cause chained, as `raise error from cause` would."""
+    error.__cause__ = cause
+    return error
+
+
+def _http_error(status_code):
+    return requests.exceptions.HTTPError(response=Mock(status_code=status_code))
+
+
+class TestIsTransient(unittest.TestCase):
+    """Test cases for classifying failures."""
+
+    def test_transient_failures(self):
+        """Test that timeouts, connection errors and 5xx/429 are retried."""
+        self.assertTrue(is_transient(APIError("busy", status_code=503)))
+        self.assertTrue(is_transient(APIError("slow down", status_code=429)))
+        self.assertTrue(is_transient(
+            _raised_from(APIError("timeout"), requests.exceptions.ReadTimeout())
+        ))
+        self.assertTrue(is_transient(
+            _raised_from(TokenFetchError("refused"), requests.exceptions.ConnectionError())
+        ))
+        self.assertTrue(is_transient(_raised_from(TokenFetchError("bad"), _http_error(502))))
+
+    def test_permanent_failures(self):
+        """Test that client errors and parse failures are not retried."""
+        self.assertFalse(is_transient(APIError("missing", status_code=404)))
+        self.assertFalse(is_transient(AuthenticationError("denied", status_code=401)))
+        self.assertFalse(is_transient(APIError("Failed to parse JSON response")))
+        self.assertFalse(is_transient(_raised_from(TokenFetchError("gone"), _http_error(404))))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for backoff, attempts and budget."""
+
+    def setUp(self):
+        """Create a policy that does not actually sleep."""
+        self.sleep = Mock()
+        self.policy = RetryPolicy(
+            max_attempts=3, base_delay=1.0, max_delay=1.5, budget=3, sleep=self.sleep
+        )
+
+    def test_retries_until_success(self):
+        """Test that transient failures are retried with backoff."""
+        func = Mock(side_effect=[APIError("busy", status_code=503), "ok"])
+
+        self.assertEqual(self.policy.call("api", func, 1, key="value"), "ok")
+
+        func.assert_called_with(1, key="value")
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(self.sleep.call_count, 1)
+        self.assertEqual(self.policy.remaining_budget, 2)
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay below the doubling, capped ceiling."""
+        with patch('src.retry.random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual(
+                [self.policy.backoff(n) for n in (1, 2, 3)], [1.0, 1.5, 1.5]
+            )
+
+    def test_permanent_failure_not_retried(self):
+        """Test that non-transient failures are raised immediately."""
+        func = Mock(side_effect=APIError("missing", status_code=404))
+
+        with self.assertRaises(APIError):
+            self.policy.call("api", func)
+
+        self.assertEqual(func.call_count, 1)
+
+    def test_attempts_exhausted(self):
+        """Test that the last failure is raised after max_attempts."""
+        func = Mock(side_effect=APIError("busy", status_code=503))
+
+        with self.assertRaises(APIError):
+            self.policy.call("api", func)
+
+        self.assertEqual(func.call_count, 3)
+
+    def test_budget_shared_across_calls(self):
+        """Test that the budget limits retries across calls until reset."""
+        func = Mock(side_effect=APIError("busy", status_code=503))
+
+        for _ in range(2):
+            with self.assertRaises(APIError):
+                self.policy.call("api", func)
+
+        self.assertEqual(func.call_count, 3 + 2)
+        self.assertEqual(self.policy.remaining_budget, 0)
+        self.policy.reset_budget()
+        self.assertEqual(self.policy.remaining_budget, 3)
+
+    def test_retry_skipped_when_deadline_too_close(self):
+        """Test that a retry whose backoff would reach the deadline is not attempted."""
+        func = Mock(side_effect=APIError("busy", status_code=503))
+        deadline = Mock()
+        deadline.remaining.return_value = 0.5
+
+        with patch('src.retry.random.uniform', return_value=1.0):
+            with self.assertRaises(APIError):
+                self.policy.wrap("api", func, deadline=deadline)()
+
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(self.policy.remaining_budget, 3)
+
+    def test_from_config(self):
+        """Test building a policy from the retry section."""
+        policy = RetryPolicy.from_config({"retry": {"max_attempts": 5, "budget": 2}})
+
+        self.assertEqual(policy.max_attempts, 5)
+        self.assertEqual(policy.remaining_budget, 2)
+        self.assertIsNone(RetryPolicy.from_config({}))
+        self.assertIsNone(RetryPolicy.from_config({"retry": "yes"}))
+        self.assertIsNone(RetryPolicy.from_config({"retry": {"budget": "many"}}))
+
+
+class TestStageRetries(unittest.TestCase):
+    """Test cases for retrying individual pipeline stages."""
+
+    def setUp(self):
+        """Create a policy that does not actually sleep."""
+        self.policy = RetryPolicy(max_attempts=3, budget=5, sleep=Mock())
+
+    def test_fetch_events_retries_server_error(self):
+        """Test that a 503 answer is retried and the next answer used."""
+        session = Mock()
+        ok = Mock(status_code=200)
+        ok.content = json.dumps({"events": []}).encode()
+        session.get.side_effect = [Mock(status_code=503, text="busy"), ok]
+
+        data = fetch_events(
+            session, "https://example.com/events/", "Basic abc", retry_policy=self.policy
+        )
+
+        self.assertEqual(data, {"events": []})
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_only_failed_stage_is_retried(self):
+        """Test that a token timeout is retried without revisiting the calendar."""
+        timeout = _raised_from(TokenFetchError("timeout"), requests.exceptions.Timeout())
+        session_manager = Mock()
+        session_manager.ensure_session.return_value = True
+
+        with patch('src.pipeline.fetch_auth_token', side_effect=[timeout, "Basic abc"]) as fetch:
+            auth_token, _ = start_session(
+                session_manager, "https://example.com/calendar", retry_policy=self.policy
+            )
+
+        self.assertEqual(auth_token, "Basic abc")
+        self.assertEqual(fetch.call_count, 2)
+        session_manager.ensure_session.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
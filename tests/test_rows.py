@@ -0,0 +1,82 @@
+"""Unit tests for rows module."""
+
+import pickle
+import sys
+import unittest
+
+from src.rows import Row, row_type
+
+
+class TestRowType(unittest.TestCase):
+    """Test cases for compact row types."""
+
+    def test_row_is_read_only_mapping(self):
+        """Test that a row behaves like the dictionary of its fields."""
+        Event = row_type(("location.title", "title"))
+        row = Event("Brownwood", "Jazz")
+
+        self.assertIsInstance(row, Row)
+        self.assertEqual(row["title"], "Jazz")
+        self.assertEqual(row.get("location.title"), "Brownwood")
+        self.assertEqual(row.get("missing", ""), "")
+        self.assertEqual(list(row), ["location.title", "title"])
+        self.assertEqual(len(row), 2)
+        self.assertEqual(row, {"location.title": "Brownwood", "title": "Jazz"})
+        self.assertEqual(row.to_dict(), {"location.title": "Brownwood", "title": "Jazz"})
+        with self.assertRaises(KeyError):
+            row["missing"]
+        with self.assertRaises(TypeError):
+            row["title"] = "Blues"
+        with self.assertRaises(AttributeError):
+            row.title = "Blues"
+
+    def test_row_type_shared_per_fields(self):
+        """Test that the same fields give the same class."""
+        self.assertIs(row_type(("a", "b")), row_type(("a", "b")))
+        self.assertIsNot(row_type(("a", "b")), row_type(("b", "a")))
+
+    def test_wrong_number_of_values(self):
+        """Test that a row needs exactly one value per field."""
+        Event = row_type(("a", "b"))
+
+        with self.assertRaises(TypeError):
+            Event("only one")
+
+    def test_cells(self):
+        """Test that cells returns values in the requested order, "" for missing fields."""
+        row = row_type(("a", "b", "c"))(1, None, 3)
+
+        self.assertEqual(row.cells(("c", "a")), (3, 1))
+        self.assertEqual(row.cells(("b",)), (None,))
+        self.assertEqual(row.cells(("a", "x")), (1, ""))
+        self.assertEqual(row.cells(()), ())
+        self.assertIs(type(row).cell_getter(("c", "a")), type(row).cell_getter(("c", "a")))
+
+    def test_empty_row(self):
+        """Test a row without fields."""
+        row = row_type(())()
+
+        self.assertEqual(row, {})
+        self.assertEqual(row.cells(("a",)), ("",))
+
+    def test_pickle_round_trip(self):
+        """Test that rows can be pickled, e.g. to be sent to another process."""
+        row = row_type(("a", "b"))(1, [2])
+
+        copy = pickle.loads(pickle.dumps(row))
+
+        self.assertIs(type(copy), type(row))
+        self.assertEqual(copy, row)
+
+    def test_smaller_than_dictionary(self):
+        """Test that a row takes less than half the memory of the dictionary."""
+        fields = ("location.title", "title", "start.date", "end.date", "category", "url")
+        values = tuple(range(len(fields)))
+
+        row = row_type(fields)(*values)
+
+        self.assertLess(sys.getsizeof(row) * 2, sys.getsizeof(dict(zip(fields, values))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
 """Unit tests for session_manager module."""
 
+import json
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import patch, Mock
 from src.session_manager import SessionManager
@@ -17,6 +21,17 @@ class TestSessionManager(unittest.TestCase):
         self.assertIsNotNone(session)
         self.assertIn('User-Agent', session.headers)
 
+    def test_pooled_adapter_mounted(self):
+        """Test that the configured pool sizes and keep-alive are applied."""
+        manager = SessionManager(pool_connections=3, pool_maxsize=24, keep_alive=False)
+        session = manager.get_session()
+        
+        adapter = session.get_adapter("https://api.v2.thevillages.com/events/")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 24)
+        self.assertIs(session.get_adapter("https://cdn.thevillages.com/main.js"), adapter)
+        self.assertEqual(session.headers['Connection'], 'close')
+
     def test_establish_session_success(self):
         """Test successful session establishment."""
         manager = SessionManager()
@@ -99,5 +114,91 @@ class TestSessionManager(unittest.TestCase):
         self.assertIn("closed", str(context.exception))
 
 
+class TestSessionManagerCookiePersistence(unittest.TestCase):
+    """Test cases for persisting the cookie jar between runs."""
+
+    def setUp(self):
+        """Create an isolated cookie file location."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cookie_file = os.path.join(self.temp_dir.name, "cookies.json")
+
+    def tearDown(self):
+        """Remove the cookie file location."""
+        self.temp_dir.cleanup()
+
+    def _establish(self, manager):
+        """Establish a session whose calendar page sets one cookie."""
+        def get(url, timeout=None):
+            manager._session.cookies.set("sid", "abc123", domain=".thevillages.com")
+            return Mock(raise_for_status=Mock())
+
+        with patch.object(manager._session, 'get', side_effect=get) as mock_get:
+            warmed_up = manager.ensure_session("https://example.com/calendar")
+        return warmed_up, mock_get
+
+    def test_establish_session_saves_cookies(self):
+        """Test that establishing a session writes the cookie jar to disk."""
+        with SessionManager(cookie_file=self.cookie_file) as manager:
+            self._establish(manager)
+
+        with open(self.cookie_file, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["cookies"][0]["name"], "sid")
+        self.assertEqual(saved["cookies"][0]["value"], "abc123")
+
+    def test_saved_cookies_skip_warm_up(self):
+        """Test that a later manager reuses saved cookies without a page visit."""
+        with SessionManager(cookie_file=self.cookie_file) as manager:
+            warmed_up, _ = self._establish(manager)
+            self.assertTrue(warmed_up)
+
+        with SessionManager(cookie_file=self.cookie_file) as manager:
+            warmed_up, mock_get = self._establish(manager)
+
+            self.assertFalse(warmed_up)
+            mock_get.assert_not_called()
+            self.assertEqual(manager.get_session().cookies.get("sid"), "abc123")
+            referer = manager.get_session().headers["Referer"]
+            self.assertEqual(referer, "https://example.com/calendar")
+
+    def test_expired_jar_triggers_warm_up(self):
+        """Test that a jar older than the cookie TTL is not reused."""
+        with SessionManager(cookie_file=self.cookie_file) as manager:
+            self._establish(manager)
+
+        with patch('src.session_manager.time.time', return_value=time.time() + 7200):
+            with SessionManager(cookie_file=self.cookie_file, cookie_ttl=3600) as manager:
+                self.assertFalse(manager.has_valid_cookies())
+
+    def test_expired_cookie_triggers_warm_up(self):
+        """Test that an expired cookie invalidates the saved jar."""
+        with open(self.cookie_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "saved_at": time.time(),
+                "cookies": [{"name": "sid", "value": "old", "expires": int(time.time()) - 10}],
+            }, f)
+
+        with SessionManager(cookie_file=self.cookie_file) as manager:
+            self.assertFalse(manager.has_valid_cookies())
+
+    def test_corrupt_cookie_file_is_ignored(self):
+        """Test that an unreadable cookie file falls back to a warm-up."""
+        with open(self.cookie_file, "w", encoding="utf-8") as f:
+            f.write("not json")
+
+        with SessionManager(cookie_file=self.cookie_file) as manager:
+            self.assertFalse(manager.has_valid_cookies())
+
+    def test_invalidate_cookies_removes_file(self):
+        """Test that invalidating clears the jar and the cookie file."""
+        with SessionManager(cookie_file=self.cookie_file) as manager:
+            self._establish(manager)
+            manager.invalidate_cookies()
+
+            self.assertFalse(manager.has_valid_cookies())
+            self.assertEqual(len(manager.get_session().cookies), 0)
+        self.assertFalse(os.path.exists(self.cookie_file))
+
+
 if __name__ == '__main__':
     unittest.main()
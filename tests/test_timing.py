@@ -0,0 +1,97 @@
+"""Unit tests for timing module."""
+
+import unittest
+from unittest.mock import Mock
+
+from src.exceptions import DeadlineExceededError
+from src.timing import Deadline, StageTimer
+
+
+class TestStageTimer(unittest.TestCase):
+    """Test cases for stage timing."""
+
+    def test_stage_records_duration(self):
+        """Test that a timed block is recorded under its name."""
+        timer = StageTimer()
+
+        with timer.stage("token"):
+            pass
+
+        self.assertIn("token", timer.timings)
+        self.assertGreaterEqual(timer.timings["token"], 0.0)
+
+    def test_stage_records_on_exception(self):
+        """Test that a failing block is still recorded."""
+        timer = StageTimer()
+
+        with self.assertRaises(ValueError):
+            with timer.stage("api"):
+                raise ValueError("boom")
+
+        self.assertIn("api", timer.timings)
+
+    def test_timed_wraps_callable(self):
+        """Test that timed() returns the wrapped callable's result."""
+        timer = StageTimer()
+
+        result = timer.timed("session", lambda a, b=0: a + b)(1, b=2)
+
+        self.assertEqual(result, 3)
+        self.assertIn("session", timer.timings)
+
+    def test_format_report_in_recording_order(self):
+        """Test that the report lists stages in the order they ran."""
+        timer = StageTimer()
+        with timer.stage("token"):
+            pass
+        with timer.stage("api"):
+            pass
+
+        lines = timer.format_report().splitlines()
+
+        self.assertTrue(lines[0].startswith("token: "))
+        self.assertTrue(lines[1].startswith("api: "))
+        self.assertTrue(lines[1].endswith("s"))
+
+
+class TestDeadline(unittest.TestCase):
+    """Test cases for the run deadline."""
+
+    def setUp(self):
+        """Create a ten-second deadline with a controllable clock."""
+        self.now = 100.0
+        self.deadline = Deadline(10, clock=lambda: self.now)
+
+    def test_timeout_shortened_to_remaining_time(self):
+        """Test that scalar and (connect, read) timeouts are capped by the time left."""
+        self.now += 7
+
+        self.assertEqual(self.deadline.remaining(), 3)
+        self.assertEqual(self.deadline.timeout(10, "api"), 3)
+        self.assertEqual(self.deadline.timeout((2, 10), "api"), (2, 3))
+
+    def test_expired_deadline_raises(self):
+        """Test that no request is started once the deadline has passed."""
+        self.now += 10
+
+        self.assertTrue(self.deadline.expired)
+        with self.assertRaises(DeadlineExceededError):
+            self.deadline.timeout(10, "token")
+
+    def test_slow_body_abandoned(self):
+        """Test that a trickling body is abandoned at the deadline and closed."""
+        def trickle(chunk_size):
+            for _ in range(5):
+                self.now += 4
+                yield b"x"
+
+        response = Mock()
+        response.iter_content.side_effect = trickle
+
+        with self.assertRaises(DeadlineExceededError):
+            self.deadline.read(response, "api")
+        response.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
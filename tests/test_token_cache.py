@@ -0,0 +1,84 @@
+"""Unit tests for token_cache module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.token_cache import TokenCache
+
+
+JS_URL = "https://example.com/main.js"
+
+
+class TestTokenCache(unittest.TestCase):
+    """Test cases for the on-disk token cache."""
+
+    def setUp(self):
+        """Create an isolated cache directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(self.temp_dir.name, ttl=60)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.temp_dir.cleanup()
+
+    def test_get_missing_returns_none(self):
+        """Test that an empty cache has no token."""
+        self.assertIsNone(self.cache.get(JS_URL))
+
+    def test_set_then_get(self):
+        """Test that a stored token is returned while fresh."""
+        self.cache.set(JS_URL, "Basic abc")
+        self.assertEqual(self.cache.get(JS_URL), "Basic abc")
+
+    def test_entries_keyed_on_url(self):
+        """Test that tokens for different URLs do not collide."""
+        self.cache.set(JS_URL, "Basic abc")
+        self.assertIsNone(self.cache.get("https://example.com/other.js"))
+
+    def test_expired_entry_returns_none(self):
+        """Test that a token older than the TTL is not returned."""
+        self.cache.set(JS_URL, "Basic abc")
+
+        with patch('src.token_cache.time.time', return_value=__import__('time').time() + 120):
+            self.assertIsNone(self.cache.get(JS_URL))
+
+    def test_conditional_headers_from_validators(self):
+        """Test that stored validators become conditional request headers."""
+        self.cache.set(JS_URL, "Basic abc", etag='"v1"', last_modified="Wed, 01 Oct 2025")
+
+        headers = TokenCache.conditional_headers(self.cache.load(JS_URL))
+
+        self.assertEqual(
+            headers, {"If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Oct 2025"}
+        )
+
+    def test_conditional_headers_without_validators(self):
+        """Test that entries without validators produce no headers."""
+        self.cache.set(JS_URL, "Basic abc")
+        self.assertEqual(TokenCache.conditional_headers(self.cache.load(JS_URL)), {})
+
+    def test_invalidate_removes_entry(self):
+        """Test that invalidate drops the cached token."""
+        self.cache.set(JS_URL, "Basic abc")
+        self.cache.invalidate(JS_URL)
+        self.assertIsNone(self.cache.get(JS_URL))
+
+    def test_corrupt_entry_is_ignored(self):
+        """Test that an unreadable cache file is treated as a miss."""
+        self.cache.set(JS_URL, "Basic abc")
+        with open(self.cache._path(JS_URL), "w", encoding="utf-8") as f:
+            f.write("not json")
+
+        self.assertIsNone(self.cache.get(JS_URL))
+
+    def test_no_temporary_files_left_behind(self):
+        """Test that writes leave only the final cache file."""
+        self.cache.set(JS_URL, "Basic abc")
+        cache_file = os.path.basename(self.cache._path(JS_URL))
+        self.assertEqual(os.listdir(self.cache.cache_dir), [cache_file])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,10 @@
 """Unit tests for token_fetcher module."""
 
+import tempfile
 import unittest
 from unittest.mock import patch, Mock
-from src.token_fetcher import fetch_auth_token
+from src.token_fetcher import fetch_auth_token, extract_auth_token_streaming, STREAM_OVERLAP
+from src.token_cache import TokenCache
 from src.exceptions import TokenFetchError
 
 
@@ -28,6 +30,18 @@ class TestTokenFetcher(unittest.TestCase):
             self.assertEqual(token, "Basic YWJjZGVmZ2hpamtsbW5vcHFyc3R1dnd4eXo=")
             mock_get.assert_called_once_with("https://example.com/main.js", timeout=10)
 
+    def test_fetch_auth_token_over_session(self):
+        """Test that a given session's pooled connections are used instead of requests.get."""
+        session = Mock()
+        session.get.return_value = Mock(text='dp_AUTH_TOKEN = "Basic c2Vzc2lvbg==";')
+        
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            token = fetch_auth_token("https://example.com/main.js", session=session)
+        
+        self.assertEqual(token, "Basic c2Vzc2lvbg==")
+        session.get.assert_called_once_with("https://example.com/main.js", timeout=10)
+        mock_get.assert_not_called()
+
     def test_fetch_auth_token_with_single_quotes(self):
         """Test token extraction with single quotes."""
         mock_js_content = "dp_AUTH_TOKEN = 'Basic dGVzdHRva2VuMTIzNDU2Nzg5MA==';"
@@ -78,5 +92,164 @@ class TestTokenFetcher(unittest.TestCase):
             self.assertIn("Failed to fetch", str(context.exception))
 
 
+class TestTokenFetcherStreaming(unittest.TestCase):
+    """Test cases for streaming token extraction."""
+
+    def _streamed_response(self, chunks):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.raise_for_status = Mock()
+        mock_response.iter_content.return_value = iter(chunks)
+        return mock_response
+
+    def test_stream_stops_at_first_match(self):
+        """Test that reading stops and the response closes once the token is found."""
+        chunks = [b"var a = 1;", b'dp_AUTH_TOKEN = "Basic dGVzdA==";', b"var b = 2;"]
+        consumed = []
+
+        def iter_chunks(chunk_size):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        mock_response = self._streamed_response([])
+        mock_response.iter_content.side_effect = iter_chunks
+
+        token = extract_auth_token_streaming(mock_response)
+
+        self.assertEqual(token, "Basic dGVzdA==")
+        self.assertEqual(len(consumed), 2)
+        mock_response.close.assert_called_once_with()
+
+    def test_stream_finds_match_split_across_chunks(self):
+        """Test that a token split across chunk boundaries is found."""
+        content = b"x" * (STREAM_OVERLAP * 3) + b'dp_AUTH_TOKEN="Basic c3BsaXQ=";'
+        chunks = [content[i:i + 7] for i in range(0, len(content), 7)]
+
+        token = extract_auth_token_streaming(self._streamed_response(chunks))
+
+        self.assertEqual(token, "Basic c3BsaXQ=")
+
+    def test_stream_pattern_not_found(self):
+        """Test error when the streamed bundle has no token."""
+        mock_response = self._streamed_response([b"var someCode = 'no token here';"])
+
+        with self.assertRaises(TokenFetchError) as context:
+            extract_auth_token_streaming(mock_response)
+
+        self.assertIn("Pattern not found", str(context.exception))
+        mock_response.close.assert_called_once_with()
+
+    def test_fetch_auth_token_stream_mode(self):
+        """Test that stream mode requests a streamed response."""
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            mock_get.return_value = self._streamed_response([b'dp_AUTH_TOKEN = "Basic dGVzdA==";'])
+
+            token = fetch_auth_token("https://example.com/main.js", stream=True)
+
+        self.assertEqual(token, "Basic dGVzdA==")
+        mock_get.assert_called_once_with("https://example.com/main.js", timeout=10, stream=True)
+
+
+class TestTokenFetcherCache(unittest.TestCase):
+    """Test cases for token fetching with a token cache."""
+
+    def setUp(self):
+        """Create an isolated token cache."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(self.temp_dir.name, ttl=60)
+
+    def tearDown(self):
+        """Remove the token cache."""
+        self.temp_dir.cleanup()
+
+    def _mock_response(self, token="dGVzdHRva2Vu"):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = f'dp_AUTH_TOKEN = "Basic {token}";'
+        mock_response.headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Oct 2025 00:00:00 GMT"}
+        mock_response.raise_for_status = Mock()
+        return mock_response
+
+    def test_cached_token_skips_download(self):
+        """Test that a fresh cached token avoids fetching main.js."""
+        self.cache.set("https://example.com/main.js", "Basic Y2FjaGVk")
+
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            token = fetch_auth_token("https://example.com/main.js", cache=self.cache)
+
+        self.assertEqual(token, "Basic Y2FjaGVk")
+        mock_get.assert_not_called()
+
+    def test_fetched_token_is_cached(self):
+        """Test that a downloaded token is stored in the cache."""
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            mock_get.return_value = self._mock_response()
+            fetch_auth_token("https://example.com/main.js", cache=self.cache)
+
+        self.assertEqual(self.cache.get("https://example.com/main.js"), "Basic dGVzdHRva2Vu")
+
+    def test_force_refresh_replaces_cached_token(self):
+        """Test that force_refresh refetches and overwrites the cached token."""
+        self.cache.set("https://example.com/main.js", "Basic b2xk")
+
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            mock_get.return_value = self._mock_response("bmV3")
+            token = fetch_auth_token(
+                "https://example.com/main.js", cache=self.cache, force_refresh=True
+            )
+
+        self.assertEqual(token, "Basic bmV3")
+        self.assertEqual(self.cache.get("https://example.com/main.js"), "Basic bmV3")
+
+    def test_expired_token_revalidated_with_validators(self):
+        """Test that an expired entry sends If-None-Match and If-Modified-Since."""
+        self.cache.set(
+            "https://example.com/main.js",
+            "Basic Y2FjaGVk",
+            etag='"v1"',
+            last_modified="Wed, 01 Oct 2025 00:00:00 GMT"
+        )
+        self.cache.ttl = 0
+
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            mock_get.return_value = self._mock_response()
+            fetch_auth_token("https://example.com/main.js", cache=self.cache)
+
+        headers = mock_get.call_args[1]["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Wed, 01 Oct 2025 00:00:00 GMT")
+
+    def test_not_modified_reuses_cached_token(self):
+        """Test that a 304 answer reuses and renews the cached token."""
+        self.cache.set("https://example.com/main.js", "Basic Y2FjaGVk", etag='"v1"')
+        self.cache.ttl = 0
+
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            mock_response = Mock()
+            mock_response.status_code = 304
+            mock_response.headers = {}
+            mock_get.return_value = mock_response
+            token = fetch_auth_token("https://example.com/main.js", cache=self.cache)
+
+        self.assertEqual(token, "Basic Y2FjaGVk")
+        entry = self.cache.load("https://example.com/main.js")
+        self.assertEqual(entry["etag"], '"v1"')
+        self.cache.ttl = 60
+        self.assertTrue(self.cache.is_fresh(entry))
+
+    def test_changed_bundle_replaces_token_and_validators(self):
+        """Test that a 200 answer to revalidation stores the new token."""
+        self.cache.set("https://example.com/main.js", "Basic b2xk", etag='"v0"')
+        self.cache.ttl = 0
+
+        with patch('src.token_fetcher.requests.get') as mock_get:
+            mock_get.return_value = self._mock_response("bmV3")
+            token = fetch_auth_token("https://example.com/main.js", cache=self.cache)
+
+        self.assertEqual(token, "Basic bmV3")
+        self.assertEqual(self.cache.load("https://example.com/main.js")["etag"], '"v1"')
+
+
 if __name__ == '__main__':
     unittest.main()
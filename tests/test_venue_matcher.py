@@ -0,0 +1,65 @@
+"""Unit tests for venue_matcher module."""
+
+import random
+import unittest
+
+from src.config import Config
+from src.venue_matcher import VenueMatcher
+
+
+def _scan(venue_mappings, venue):
+    """Abbreviates a venue by scanning the mappings in order."""
+    for keyword, abbreviation in venue_mappings.items():
+        if keyword in venue:
+            return abbreviation
+    return venue
+
+
+class TestVenueMatcher(unittest.TestCase):
+    """Test cases for compiled venue keyword matching."""
+
+    def test_default_mappings(self):
+        """Test abbreviation with the default venue mappings."""
+        matcher = VenueMatcher(Config.DEFAULT_VENUE_MAPPINGS)
+
+        self.assertEqual(matcher.abbreviate("Brownwood Paddock Square"), "Brownwood")
+        self.assertEqual(matcher.abbreviate("Spanish Springs Town Square"), "Spanish Springs")
+        self.assertEqual(matcher.abbreviate("Savannah Center"), "Savannah Center")
+
+    def test_mapping_order_wins_over_position(self):
+        """Test that the first keyword in the mappings wins, wherever it occurs."""
+        matcher = VenueMatcher({"Square": "SQ", "Brownwood": "BW"})
+
+        self.assertEqual(matcher.abbreviate("Brownwood Paddock Square"), "SQ")
+
+    def test_overlapping_keywords(self):
+        """Test keywords that are suffixes or infixes of each other."""
+        mappings = {"Lake Sumter Landing": "LSL", "Sumter": "S", "ake": "A"}
+        matcher = VenueMatcher(mappings)
+
+        for venue in ("Lake Sumter Landing", "Lake Sumter", "Sumter", "Lake", "Landing"):
+            self.assertEqual(matcher.abbreviate(venue), _scan(mappings, venue), venue)
+
+    def test_empty_mappings(self):
+        """Test that no mappings leave every venue unchanged."""
+        self.assertEqual(VenueMatcher({}).abbreviate("Sawgrass Grove"), "Sawgrass Grove")
+
+    def test_matches_linear_scan(self):
+        """Test random mappings and venues against a scan of the mappings."""
+        rng = random.Random(7)
+        for _ in range(2000):
+            keywords = [
+                "".join(rng.choice("abc") for _ in range(rng.randint(0, 4)))
+                for _ in range(rng.randint(1, 8))
+            ]
+            mappings = {keyword: index for index, keyword in enumerate(keywords)}
+            matcher = VenueMatcher(mappings)
+            for _ in range(5):
+                venue = "".join(rng.choice("abcd") for _ in range(rng.randint(1, 10)))
+                self.assertEqual(
+                    matcher.abbreviate(venue), _scan(mappings, venue), (mappings, venue)
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()